@@ -1,16 +1,26 @@
 #!/usr/bin/env python3
 """
 Convert Heureka XML product feed to optimized JSON for photo-post-generator.
-Usage: python3 scripts/heureka-to-json.py [input_xml] [output_json]
+Usage: python3 scripts/heureka-to-json.py [input_xml] [output_json] [--stream | --incremental] [--compact]
 Defaults: fetches from hellocomp.cz, outputs to public/data/heureka-products.json
+--stream: iterparse-based conversion with bounded memory for large feeds
+--incremental: only re-derive new/changed items (hourly sync), skip no-op writes
+--compact: no indentation/whitespace (smaller file; encoded with orjson if installed)
 """
 
 import xml.etree.ElementTree as ET
+import argparse
+import hashlib
 import json
-import sys
+import tempfile
 import urllib.request
 import os
 
+try:  # Optional fast encoder for --compact
+    import orjson
+except ImportError:
+    orjson = None
+
 FEED_URL = "https://www.hellocomp.cz/heureka/export/products.xml"
 DEFAULT_OUTPUT = os.path.join(os.path.dirname(__file__), "..", "public", "data", "heureka-products.json")
 
@@ -145,88 +155,355 @@ def build_specs_summary(params: dict) -> dict:
     return specs
 
 
-def convert(input_path: str, output_path: str):
+def build_product(item) -> dict:
+    """Turn one SHOPITEM element into the output product dict."""
+    item_id = (item.findtext("ITEM_ID") or "").strip()
+    name = (item.findtext("PRODUCTNAME") or "").strip()
+    url = (item.findtext("URL") or "").strip()
+    img = (item.findtext("IMGURL") or "").strip()
+    price_str = (item.findtext("PRICE_VAT") or "").strip()
+    manufacturer = (item.findtext("MANUFACTURER") or "").strip()
+    cat_text = (item.findtext("CATEGORYTEXT") or "").strip()
+    ean = (item.findtext("EAN") or "").strip()
+    delivery_date = (item.findtext("DELIVERY_DATE") or "").strip()
+    
+    # Alternative images
+    alt_imgs = [el.text.strip() for el in item.findall("IMGURL_ALTERNATIVE") if el.text]
+    
+    # Description (strip HTML)
+    desc_raw = (item.findtext("DESCRIPTION") or "").strip()
+    # Just keep it raw - the generator can use it or not
+    
+    params = extract_params(item)
+    price = parse_price(price_str)
+    category = parse_category(cat_text)
+    lineup = detect_lineup(name, params)
+    specs = build_specs_summary(params)
+    
+    product = {
+        "id": item_id,
+        "name": name,
+        "url": url,
+        "img": img,
+        "price": price,
+        "priceFormatted": f"{int(price):,} Kč".replace(",", " ") if price else "",
+        "manufacturer": manufacturer,
+        "category": category,
+        "lineup": lineup,
+        "specs": specs,
+        "ean": ean,
+        "inStock": delivery_date == "0",
+    }
+    
+    if alt_imgs:
+        product["altImgs"] = alt_imgs
+    
+    return product
+
+
+# Sort: PCs first, then by price descending
+CAT_ORDER = {"pc": 0, "gpu": 1, "notebook": 2, "cpu": 3, "monitor": 4, "phone": 5}
+
+
+def sort_key(product: dict):
+    return (CAT_ORDER.get(product["category"]["slug"], 99), -product["price"])
+
+
+def build_meta(total: int, cats: dict) -> dict:
+    return {
+        "source": "heureka",
+        "feedUrl": FEED_URL,
+        "totalProducts": total,
+        "categories": cats,
+    }
+
+
+def report(output_path: str, total: int, cats: dict):
+    size_kb = os.path.getsize(output_path) / 1024
+    print(f"✅ Wrote {total} products to {output_path} ({size_kb:.0f} KB)")
+    print(f"   Categories: {cats}")
+
+
+def dump_json(obj, compact: bool = False) -> str:
+    """Serialise the output document: ``indent=1`` or, with *compact*, no whitespace."""
+    if not compact:
+        return json.dumps(obj, ensure_ascii=False, indent=1)
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def convert(input_path: str, output_path: str, compact: bool = False):
     print(f"Parsing XML: {input_path}")
     tree = ET.parse(input_path)
     root = tree.getroot()
     
-    products = []
-    for item in root.findall("SHOPITEM"):
-        item_id = (item.findtext("ITEM_ID") or "").strip()
-        name = (item.findtext("PRODUCTNAME") or "").strip()
-        url = (item.findtext("URL") or "").strip()
-        img = (item.findtext("IMGURL") or "").strip()
-        price_str = (item.findtext("PRICE_VAT") or "").strip()
-        manufacturer = (item.findtext("MANUFACTURER") or "").strip()
-        cat_text = (item.findtext("CATEGORYTEXT") or "").strip()
-        ean = (item.findtext("EAN") or "").strip()
-        delivery_date = (item.findtext("DELIVERY_DATE") or "").strip()
-        
-        # Alternative images
-        alt_imgs = [el.text.strip() for el in item.findall("IMGURL_ALTERNATIVE") if el.text]
-        
-        # Description (strip HTML)
-        desc_raw = (item.findtext("DESCRIPTION") or "").strip()
-        # Just keep it raw - the generator can use it or not
-        
-        params = extract_params(item)
-        price = parse_price(price_str)
-        category = parse_category(cat_text)
-        lineup = detect_lineup(name, params)
-        specs = build_specs_summary(params)
-        
-        product = {
-            "id": item_id,
-            "name": name,
-            "url": url,
-            "img": img,
-            "price": price,
-            "priceFormatted": f"{int(price):,} Kč".replace(",", " ") if price else "",
-            "manufacturer": manufacturer,
-            "category": category,
-            "lineup": lineup,
-            "specs": specs,
-            "ean": ean,
-            "inStock": delivery_date == "0",
-        }
-        
-        if alt_imgs:
-            product["altImgs"] = alt_imgs
-        
-        products.append(product)
-    
-    # Sort: PCs first, then by price descending
-    cat_order = {"pc": 0, "gpu": 1, "notebook": 2, "cpu": 3, "monitor": 4, "phone": 5}
-    products.sort(key=lambda p: (cat_order.get(p["category"]["slug"], 99), -p["price"]))
+    products = [build_product(item) for item in root.findall("SHOPITEM")]
+    products.sort(key=sort_key)
     
-    # Stats
+    cats = category_stats(products)
+    write_output(output_path, products, cats, compact)
+    report(output_path, len(products), cats)
+
+
+def category_stats(products: list) -> dict:
     cats = {}
     for p in products:
         s = p["category"]["slug"]
         cats[s] = cats.get(s, 0) + 1
-    
+    return cats
+
+
+def write_output(output_path: str, products: list, cats: dict, compact: bool = False):
     output = {
-        "meta": {
-            "source": "heureka",
-            "feedUrl": FEED_URL,
-            "totalProducts": len(products),
-            "categories": cats,
-        },
+        "meta": build_meta(len(products), cats),
         "products": products,
     }
     
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    discard_fingerprints(output_path)
     with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(output, f, ensure_ascii=False, indent=1)
+        if compact:
+            f.write(dump_json(output, compact=True))
+        else:
+            json.dump(output, f, ensure_ascii=False, indent=1)  # streamed, no full-text copy
+
+
+# ---------------------------------------------------------------------------
+# Streaming mode
+# ---------------------------------------------------------------------------
+def iter_shop_items(input_path: str):
+    """Yield SHOPITEM elements one at a time, freeing each after use.
+
+    Built on ``iterparse``: once the caller is done with an item the root
+    is cleared, so the parsed tree never holds more than one SHOPITEM.
+    """
+    context = ET.iterparse(input_path, events=("start", "end"))
+    root = None
+    for event, elem in context:
+        if event == "start":
+            if root is None:
+                root = elem
+            continue
+        if elem.tag == "SHOPITEM":
+            yield elem
+            elem.clear()
+            root.clear()
+
+
+def _indent_block(text: str, prefix: str) -> str:
+    return "\n".join(prefix + line for line in text.split("\n"))
+
+
+def convert_streaming(input_path: str, output_path: str, compact: bool = False):
+    """Memory-bounded variant of :func:`convert` with identical output.
+
+    Products are spilled as compact JSON lines into one temporary file per
+    category bucket (the primary sort key).  Only a small
+    ``(-price, seq, offset, slug)`` key per product stays in memory; each
+    bucket is sorted by key and its records are read back by offset while
+    the output is written item by item.
+    """
+    print(f"Parsing XML (streaming): {input_path}")
     
-    size_kb = os.path.getsize(output_path) / 1024
-    print(f"✅ Wrote {len(products)} products to {output_path} ({size_kb:.0f} KB)")
-    print(f"   Categories: {cats}")
+    with tempfile.TemporaryDirectory(prefix="heureka-") as tmp:
+        buckets = {}  # rank -> (file, [keys])
+        seq = 0
+        for item in iter_shop_items(input_path):
+            product = build_product(item)
+            rank, neg_price = sort_key(product)
+            if rank not in buckets:
+                fh = open(os.path.join(tmp, f"bucket-{rank}.jsonl"), "w+b")
+                buckets[rank] = (fh, [])
+            fh, keys = buckets[rank]
+            line = json.dumps(product, ensure_ascii=False).encode("utf-8") + b"\n"
+            keys.append((neg_price, seq, fh.tell(), product["category"]["slug"]))
+            fh.write(line)
+            seq += 1
+        
+        # Category stats in output order (matches dict insertion order of convert())
+        cats = {}
+        for rank in sorted(buckets):
+            keys = buckets[rank][1]
+            keys.sort()
+            for key in keys:
+                cats[key[3]] = cats.get(key[3], 0) + 1
+        
+        header = dump_json({"meta": build_meta(seq, cats), "products": []}, compact)
+        empty = '"products":[]' if compact else '"products": []'
+        head, tail = header.rsplit(empty, 1)
+        
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        discard_fingerprints(output_path)
+        with open(output_path, "w", encoding="utf-8") as out:
+            out.write(head)
+            if not seq:
+                out.write(empty)
+            elif compact:
+                out.write('"products":[')
+                first = True
+                for rank in sorted(buckets):
+                    fh, keys = buckets[rank]
+                    fh.flush()
+                    for key in keys:
+                        fh.seek(key[2])
+                        if not first:
+                            out.write(",")
+                        first = False
+                        out.write(dump_json(json.loads(fh.readline()), compact=True))
+                    fh.close()
+                out.write("]")
+            else:
+                out.write('"products": [\n')
+                first = True
+                for rank in sorted(buckets):
+                    fh, keys = buckets[rank]
+                    fh.flush()
+                    for key in keys:
+                        fh.seek(key[2])
+                        product = json.loads(fh.readline())
+                        if not first:
+                            out.write(",\n")
+                        first = False
+                        out.write(_indent_block(
+                            json.dumps(product, ensure_ascii=False, indent=1), "  "))
+                    fh.close()
+                out.write("\n ]")
+            out.write(tail)
+    
+    report(output_path, seq, cats)
+
+
+# ---------------------------------------------------------------------------
+# Incremental mode
+# ---------------------------------------------------------------------------
+def fingerprints_path(output_path: str) -> str:
+    """Sidecar with per-item content hashes from the previous run."""
+    return output_path + ".fingerprints.json"
+
+
+def discard_fingerprints(output_path: str):
+    """Drop the sidecar before *output_path* is rewritten.
+
+    Its positions describe the old output; only :func:`convert_incremental`
+    writes a fresh one, after the output is complete.
+    """
+    try:
+        os.remove(fingerprints_path(output_path))
+    except FileNotFoundError:
+        pass
+
+
+def item_fingerprint(item) -> str:
+    # iterparse may or may not have read the tail yet, so leave it out
+    tail, item.tail = item.tail, None
+    try:
+        return hashlib.sha1(ET.tostring(item, encoding="utf-8")).hexdigest()
+    finally:
+        item.tail = tail
+
+
+def load_previous(output_path: str):
+    """Return (products, fingerprints) from the previous run, or empty ones."""
+    try:
+        with open(output_path, encoding="utf-8") as f:
+            products = json.load(f)["products"]
+        with open(fingerprints_path(output_path), encoding="utf-8") as f:
+            fingerprints = json.load(f)
+    except (OSError, ValueError, KeyError):
+        return [], {}
+    return products, fingerprints
+
+
+def convert_incremental(input_path: str, output_path: str, compact: bool = False) -> dict:
+    """Re-derive only new or changed SHOPITEMs and skip no-op writes.
+
+    Each item is keyed by ``ITEM_ID`` (plus an occurrence counter for
+    duplicate IDs) and fingerprinted by a hash of its raw XML.  Items whose
+    fingerprint matches the previous run reuse the product dict from the
+    previous output (when the product at the recorded position still has
+    that ID); only the rest go through :func:`build_product`.  When
+    the resulting output equals the previous one, nothing is written.
+    """
+    print(f"Parsing XML (incremental): {input_path}")
+    prev_products, prev_fingerprints = load_previous(output_path)
+    
+    products = []
+    fingerprints = {}
+    seen_ids = {}
+    added, changed = [], []
+    for item in iter_shop_items(input_path):
+        item_id = (item.findtext("ITEM_ID") or "").strip()
+        n = seen_ids.get(item_id, 0)
+        seen_ids[item_id] = n + 1
+        key = f"{item_id}#{n}" if n else item_id
+        digest = item_fingerprint(item)
+        
+        prev = prev_fingerprints.get(key)
+        if (
+            prev
+            and prev[0] == digest
+            and prev[1] < len(prev_products)
+            and prev_products[prev[1]].get("id") == item_id
+        ):
+            product = prev_products[prev[1]]
+        else:
+            product = build_product(item)
+            (changed if prev else added).append(key)
+        fingerprints[key] = [digest, len(products)]
+        products.append(product)
+    
+    # Record each product's position in the sorted output for the next run
+    order = sorted(range(len(products)), key=lambda i: sort_key(products[i]))
+    position = {i: pos for pos, i in enumerate(order)}
+    for entry in fingerprints.values():
+        entry[1] = position[entry[1]]
+    products = [products[i] for i in order]
+    
+    removed = [key for key in prev_fingerprints if key not in fingerprints]
+    summary = {
+        "total": len(products),
+        "added": len(added),
+        "changed": len(changed),
+        "removed": len(removed),
+        "unchanged": len(products) - len(added) - len(changed),
+    }
+    print(f"   Changes: {summary}")
+    for label, keys in (("+", added), ("~", changed), ("-", removed)):
+        for key in keys[:20]:
+            print(f"     {label} {key}")
+        if len(keys) > 20:
+            print(f"     {label} … and {len(keys) - 20} more")
+    
+    if products == prev_products and fingerprints == prev_fingerprints:
+        print(f"⏭️  No changes — {output_path} left untouched")
+        summary["written"] = False
+        return summary
+    
+    cats = category_stats(products)
+    if products != prev_products:
+        write_output(output_path, products, cats, compact)
+        report(output_path, len(products), cats)
+    with open(fingerprints_path(output_path), "w", encoding="utf-8") as f:
+        json.dump(fingerprints, f, separators=(",", ":"))
+    summary["written"] = products != prev_products
+    return summary
 
 
 if __name__ == "__main__":
-    input_path = sys.argv[1] if len(sys.argv) > 1 else "/tmp/heureka-products.xml"
-    output_path = sys.argv[2] if len(sys.argv) > 2 else os.path.abspath(DEFAULT_OUTPUT)
+    parser = argparse.ArgumentParser(description="Convert Heureka XML feed to JSON.")
+    parser.add_argument("input_xml", nargs="?", default="/tmp/heureka-products.xml")
+    parser.add_argument("output_json", nargs="?", default=os.path.abspath(DEFAULT_OUTPUT))
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--stream", action="store_true",
+                      help="iterparse + bucketed on-disk sort (bounded memory for large feeds)")
+    mode.add_argument("--incremental", action="store_true",
+                      help="re-derive only new/changed items; skip the write when nothing changed")
+    parser.add_argument("--compact", action="store_true",
+                        help="write JSON without indentation (orjson when installed)")
+    args = parser.parse_args()
+    input_path = args.input_xml
+    output_path = args.output_json
     
     # If no local file, download first
     if not os.path.exists(input_path):
@@ -234,4 +511,9 @@ if __name__ == "__main__":
         urllib.request.urlretrieve(FEED_URL, input_path)
         print(f"Downloaded to {input_path}")
     
-    convert(input_path, output_path)
+    if args.stream:
+        convert_streaming(input_path, output_path, args.compact)
+    elif args.incremental:
+        convert_incremental(input_path, output_path, args.compact)
+    else:
+        convert(input_path, output_path, args.compact)
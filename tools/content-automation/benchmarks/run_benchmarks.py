@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""Benchmark suite for the HelloComp content-automation hot paths.
+
+Generates deterministic synthetic catalogues (1k / 100k / 1M rows by
+default), times every hot stage and measures its peak traced memory:
+
+* ``load_products``          — semicolon CSV parsing
+* ``load_products_parallel`` — the same on a pool of ``PARALLEL_WORKERS``
+  processes, with the file-size threshold lifted so every size takes it
+* ``product_attributes``     — ``Product.gpu`` / ``.tier`` / ``.platform``
+* ``build_comparison_table`` — Loot-Box filtering + family dedup
+* ``table_to_html``          — ``SEOComparisonTable.to_html``
+* ``content_item_to_dict``   — ``ContentItem`` creation + ``to_dict``
+* ``resolver_build``         — ``ProductResolver`` index construction
+* ``resolver_lookup``        — exact / token / fuzzy ``ProductResolver.search``
+* ``fallback_render``        — every built-in template for every row, batched
+* ``heureka_convert``        — ``scripts/heureka-to-json.py`` ``convert()``
+
+Results can be stored as a JSON baseline; later runs compare against it
+and exit non-zero when a stage's throughput drops, or its peak memory
+grows, by more than ``--threshold``.  Everything runs offline.
+
+Usage::
+
+    python benchmarks/run_benchmarks.py --sizes 1000 100000 --save-baseline
+    python benchmarks/run_benchmarks.py --sizes 1000 100000 --threshold 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import gc
+import importlib.util
+import io
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+from xml.sax.saxutils import escape
+
+_HERE = Path(__file__).resolve().parent
+_REPO_ROOT = _HERE.parents[2]
+sys.path.insert(0, str(_HERE.parent))
+
+from content_automation import csv_loader, families, models, templates  # noqa: E402
+from content_automation.csv_loader import filter_gaming_pcs, load_products  # noqa: E402
+from content_automation.lootbox_seo import build_comparison_table  # noqa: E402
+from content_automation.models import ContentItem, ContentType  # noqa: E402
+from content_automation.resolver import ProductResolver  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+DEFAULT_BASELINE = _HERE / "baseline.json"
+SEED = 20260101
+
+#: Processes used by ``load_products_parallel`` — fixed rather than the CPU
+#: count so baselines recorded on different machines time the same work.
+PARALLEL_WORKERS = 4
+
+_GPUS = ["3050", "3060 Ti", "4060", "4070 SUPER", "5060", "5070", "5070 Ti", "5080", "5090", "RX 9070 XT"]
+_TIERS = ["SE", "SE8", "Pro", "Max", "Extreme", "Ultra9", "Individual"]
+_EXTRAS = ["", "DDR5 ", "White ", "RGB "]
+_PERIPHERALS = ["Motospeed SK62 White", 'Koorui GN06 27" 165Hz', "SVEN KB-C7150EL", "Dárkový poukaz 1000 Kč"]
+_CATEGORIES = [
+    "Heureka.cz | Elektronika | Počítače a notebooky | Stolní počítače",
+    "Heureka.cz | Elektronika | Počítače a notebooky | Komponenty | Grafické karty",
+    "Heureka.cz | Elektronika | Počítače a notebooky | Notebooky",
+    "Heureka.cz | Elektronika | Počítače a notebooky | Monitory",
+    "Heureka.cz | Elektronika | Sluchátka",
+    "Heureka.cz | Elektronika | Příslušenství | Klávesnice",
+]
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data
+# ---------------------------------------------------------------------------
+def _product(rng: random.Random) -> tuple[str, str]:
+    """Random product name and the pairCode shared by its machine's variants."""
+    if rng.random() < 0.2:
+        return rng.choice(_PERIPHERALS), ""
+    platform, tier = rng.choice(["AMD", "Intel"]), rng.choice(_TIERS)
+    extra, gpu = rng.choice(_EXTRAS), rng.choice(_GPUS)
+    return f"HelloComp {platform} GAMER {tier} {extra}{gpu}", f"{platform}-{tier}-{gpu}"
+
+
+def _product_name(rng: random.Random) -> str:
+    return _product(rng)[0]
+
+
+def write_catalogue_csv(path: Path, rows: int) -> None:
+    """Write a deterministic catalogue in the ``products (1).csv`` format."""
+    rng = random.Random(SEED)
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        fh.write("﻿code;pairCode;name;xmlFeedName;\n")
+        writer = csv.writer(fh, delimiter=";", quoting=csv.QUOTE_ALL, lineterminator=";\n")
+        for i in range(rows):
+            name, machine = _product(rng)
+            # Like the real feed, a pairCode only ever ties variants of one machine.
+            pair = machine if rng.random() < 0.5 else ""
+            writer.writerow([f"{i:07d}", pair, name, name if rng.random() < 0.5 else ""])
+
+
+def write_heureka_xml(path: Path, items: int) -> None:
+    """Write a deterministic Heureka feed with *items* SHOPITEMs."""
+    rng = random.Random(SEED)
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="utf-8"?>\n<SHOP>\n')
+        for i in range(items):
+            name = _product_name(rng)
+            price = f"{rng.randint(500, 150_000)} {rng.randint(0, 999):03d},00"
+            fh.write(
+                f"<SHOPITEM><ITEM_ID>ID{i}</ITEM_ID>"
+                f"<PRODUCTNAME>{escape(name)}</PRODUCTNAME>"
+                f"<URL>https://www.hellocomp.cz/p/{i}/</URL>"
+                f"<IMGURL>https://cdn.example.invalid/{i}.png</IMGURL>"
+                f"<PRICE_VAT>{price}</PRICE_VAT>"
+                f"<MANUFACTURER>HelloComp</MANUFACTURER>"
+                f"<CATEGORYTEXT>{escape(rng.choice(_CATEGORIES))}</CATEGORYTEXT>"
+                f"<EAN>{rng.randint(10**12, 10**13 - 1)}</EAN>"
+                f"<DELIVERY_DATE>{rng.choice(['0', '3'])}</DELIVERY_DATE>"
+                f"<PARAM><PARAM_NAME>Typ procesoru</PARAM_NAME><VAL>AMD Ryzen 7 9800X3D</VAL></PARAM>"
+                f"<PARAM><PARAM_NAME>Model grafické karty</PARAM_NAME><VAL>NVIDIA RTX {rng.choice(_GPUS)}</VAL></PARAM>"
+                f"<PARAM><PARAM_NAME>Velikost operační paměti</PARAM_NAME><VAL>32GB</VAL></PARAM>"
+                "</SHOPITEM>\n"
+            )
+        fh.write("</SHOP>\n")
+
+
+@contextlib.contextmanager
+def _parallel_load_for_any_size():
+    """Let ``load_products`` take its process-pool path for small catalogues too.
+
+    The synthetic 1k and 100k catalogues are below
+    ``csv_loader.PARALLEL_MIN_BYTES``, so without this the parallel stage
+    would time the serial parser.
+    """
+    saved = csv_loader.PARALLEL_MIN_BYTES, csv_loader.MIN_CHUNK_BYTES
+    csv_loader.PARALLEL_MIN_BYTES = csv_loader.MIN_CHUNK_BYTES = 1
+    try:
+        yield
+    finally:
+        csv_loader.PARALLEL_MIN_BYTES, csv_loader.MIN_CHUNK_BYTES = saved
+
+
+def _load_heureka_module():
+    path = _REPO_ROOT / "scripts" / "heureka-to-json.py"
+    spec = importlib.util.spec_from_file_location("heureka_to_json", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+def _build_stages(workdir: Path, rows: int) -> list[tuple[str, Callable[[dict], int]]]:
+    """Return ``(name, fn)`` stages; each fn returns the number of items processed."""
+    csv_path = workdir / f"catalogue-{rows}.csv"
+    xml_path = workdir / f"heureka-{rows}.xml"
+    heureka_items = max(100, rows // 10)
+    heureka = _load_heureka_module()
+
+    def stage_load(ctx: dict) -> int:
+        ctx["products"] = load_products(csv_path)
+        return len(ctx["products"])
+
+    def stage_load_parallel(ctx: dict) -> int:
+        with _parallel_load_for_any_size():
+            return len(load_products(csv_path, workers=PARALLEL_WORKERS))
+
+    def stage_attributes(ctx: dict) -> int:
+        for p in ctx["products"]:
+            p.gpu, p.tier, p.platform
+        return len(ctx["products"])
+
+    def stage_table(ctx: dict) -> int:
+        gaming = filter_gaming_pcs(ctx["products"])
+        ctx["table"] = build_comparison_table(gaming, gpu_filter="50")
+        return len(gaming)
+
+    def stage_html(ctx: dict) -> int:
+        ctx["html"] = ctx["table"].to_html()
+        return len(ctx["table"].rows)
+
+    def stage_content_items(ctx: dict) -> int:
+        n = len(ctx["products"])
+        dicts = [
+            ContentItem(title="t", body=p.name, content_type=ContentType.SEO_META).to_dict()
+            for p in ctx["products"]
+        ]
+        del dicts
+        return n
+
+    def stage_resolver_build(ctx: dict) -> int:
+        ctx["resolver"] = ProductResolver(ctx["products"])
+        return len(ctx["products"])
+
+    def stage_resolver_lookup(ctx: dict) -> int:
+        queries = ["0000123", "amd gamer extreme 5080", "intel pro 5070 ti", "extrme 5080", "darkovy poukaz"]
+        resolver = ctx["resolver"]
+        for _ in range(200):
+            for query in queries:
+                resolver.search(query)
+        return 200 * len(queries)
+
+    def stage_fallback_render(ctx: dict) -> int:
+        registry = templates.builtin()
+        products = ctx["products"]
+        # Chunked so the rendered copy of a 1M-row catalogue is never held at once.
+        for start in range(0, len(products), 10_000):
+            rows = [(p.gpu or p.name, "hráč", "GTA 6") for p in products[start : start + 10_000]]
+            registry.render_batch(rows)
+        return len(products)
+
+    def stage_heureka(ctx: dict) -> int:
+        with contextlib.redirect_stdout(io.StringIO()):
+            heureka.convert(str(xml_path), str(workdir / "heureka-out.json"))
+        return heureka_items
+
+    write_catalogue_csv(csv_path, rows)
+    write_heureka_xml(xml_path, heureka_items)
+    return [
+        ("load_products", stage_load),
+        ("load_products_parallel", stage_load_parallel),
+        ("product_attributes", stage_attributes),
+        ("build_comparison_table", stage_table),
+        ("table_to_html", stage_html),
+        ("content_item_to_dict", stage_content_items),
+        ("resolver_build", stage_resolver_build),
+        ("resolver_lookup", stage_resolver_lookup),
+        ("fallback_render", stage_fallback_render),
+        ("heureka_convert", stage_heureka),
+    ]
+
+
+def _fresh_caches() -> None:
+    models._extract_attributes_cached.cache_clear()
+    families.variant_stem.cache_clear()
+    gc.collect()
+
+
+def run_size(rows: int, measure_memory: bool = True) -> dict[str, dict]:
+    """Benchmark every stage on a catalogue of *rows* rows."""
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory(prefix="ca-bench-") as tmp:
+        stages = _build_stages(Path(tmp), rows)
+
+        # Timing pass (no tracing overhead)
+        _fresh_caches()
+        ctx: dict = {}
+        for name, fn in stages:
+            start = time.perf_counter()
+            items = fn(ctx)
+            elapsed = time.perf_counter() - start
+            results[name] = {
+                "items": items,
+                "seconds": round(elapsed, 6),
+                "throughput": round(items / elapsed, 1) if elapsed > 0 else None,
+            }
+        del ctx
+
+        # Memory pass: peak traced allocation per stage
+        if measure_memory:
+            _fresh_caches()
+            ctx = {}
+            tracemalloc.start()
+            try:
+                for name, fn in stages:
+                    tracemalloc.reset_peak()
+                    before, _ = tracemalloc.get_traced_memory()
+                    fn(ctx)
+                    _, peak = tracemalloc.get_traced_memory()
+                    results[name]["peak_kb"] = round(max(0, peak - before) / 1024, 1)
+            finally:
+                tracemalloc.stop()
+            del ctx
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Baselines
+# ---------------------------------------------------------------------------
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return human-readable regressions of *results* against *baseline*."""
+    regressions = []
+    for size, stages in results.items():
+        for stage, current in stages.items():
+            base = baseline.get(size, {}).get(stage)
+            if not base:
+                continue
+            if base.get("throughput") and current.get("throughput"):
+                floor = base["throughput"] * (1 - threshold)
+                if current["throughput"] < floor:
+                    regressions.append(
+                        f"{size} rows / {stage}: throughput {current['throughput']:.0f}/s "
+                        f"< {floor:.0f}/s (baseline {base['throughput']:.0f}/s)"
+                    )
+            if base.get("peak_kb") and current.get("peak_kb") is not None:
+                ceiling = base["peak_kb"] * (1 + threshold)
+                if current["peak_kb"] > ceiling:
+                    regressions.append(
+                        f"{size} rows / {stage}: peak {current['peak_kb']:.0f} KB "
+                        f"> {ceiling:.0f} KB (baseline {base['peak_kb']:.0f} KB)"
+                    )
+    return regressions
+
+
+def _print_table(size: int, stages: dict) -> None:
+    print(f"\n  {size:,} rows")
+    print(f"  {'stage':<24}{'items':>10}{'seconds':>10}{'items/s':>14}{'peak KB':>12}")
+    for name, r in stages.items():
+        throughput = f"{r['throughput']:,.0f}" if r["throughput"] else "—"
+        peak = f"{r['peak_kb']:,.0f}" if "peak_kb" in r else "—"
+        print(f"  {name:<24}{r['items']:>10,}{r['seconds']:>10.3f}{throughput:>14}{peak:>12}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write the results as the new baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative regression (default: 0.25 = 25 %%)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", type=Path, default=None, help="also write results JSON here")
+    args = parser.parse_args(argv)
+    if not 0 <= args.threshold < 1:
+        parser.error("--threshold must be between 0 and 1")
+
+    results = {}
+    for size in args.sizes:
+        results[str(size)] = run_size(size, measure_memory=not args.no_memory)
+        _print_table(size, results[str(size)])
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\n  💾 Baseline saved to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"\n  ℹ️  No baseline at {args.baseline} — run with --save-baseline first.")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["results"]
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n  ❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"     {line}")
+        return 1
+    print(f"\n  ✅ No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Batch helpers shared by the bulk generation modes.
+
+Reads ``(gpu, audience)`` pairs from CSV/JSONL files or derives them from
+the GAMER PCs in the product catalogue, runs a generator over them with
+bounded parallelism and streams results as NDJSON.  Everything here is
+lazy: pairs are read on demand and at most a fixed window of jobs is in
+flight, so memory stays flat however many pairs there are.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, TextIO, TypeVar
+
+from . import serialise
+from .csv_loader import iter_gaming_pcs, iter_products
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+#: Personas used when pairs are derived from the catalogue.
+DEFAULT_AUDIENCES: tuple[str, ...] = ("hráč CS2", "hráč Warzone", "casual gamer")
+
+
+# ---------------------------------------------------------------------------
+# Pair sources
+# ---------------------------------------------------------------------------
+def _iter_csv_pairs(fh: TextIO) -> Iterator[tuple[str, str]]:
+    sample = fh.read(4096)
+    fh.seek(0)
+    try:
+        delimiter = csv.Sniffer().sniff(sample, delimiters=",;\t").delimiter
+    except csv.Error:
+        delimiter = ","
+    for lineno, row in enumerate(csv.reader(fh, delimiter=delimiter), 1):
+        cells = [c.strip() for c in row]
+        if not any(cells):
+            continue
+        if lineno == 1 and [c.lower() for c in cells[:2]] == ["gpu", "audience"]:
+            continue
+        if len(cells) < 2 or not cells[0] or not cells[1]:
+            raise ValueError(f"line {lineno}: expected 'gpu,audience', got {row!r}")
+        yield cells[0], cells[1]
+
+
+def _iter_jsonl_pairs(fh: TextIO) -> Iterator[tuple[str, str]]:
+    for lineno, line in enumerate(fh, 1):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        gpu = record.get("gpu")
+        audience = record.get("audience") or record.get("targetAudience")
+        if not gpu or not audience:
+            raise ValueError(f"line {lineno}: expected 'gpu' and 'audience' keys")
+        yield str(gpu), str(audience)
+
+
+def read_pairs(path: Path) -> Iterator[tuple[str, str]]:
+    """Stream ``(gpu, audience)`` pairs from a ``.csv`` or ``.jsonl`` file.
+
+    CSV files may use ``,``, ``;`` or tab delimiters and an optional
+    ``gpu,audience`` header.  JSONL records need ``gpu`` and ``audience``
+    keys.
+    """
+    path = Path(path)
+    with open(path, encoding="utf-8-sig", newline="") as fh:
+        if path.suffix.lower() in (".jsonl", ".ndjson", ".json"):
+            yield from _iter_jsonl_pairs(fh)
+        else:
+            yield from _iter_csv_pairs(fh)
+
+
+def iter_catalog_gpus(csv_path: Optional[Path] = None) -> Iterator[str]:
+    """Stream the distinct GPUs of the catalogue's GAMER PCs, in catalogue order."""
+    seen: set[str] = set()
+    for product in iter_gaming_pcs(iter_products(csv_path)):
+        gpu = product.gpu
+        if gpu and gpu.upper() not in seen:
+            seen.add(gpu.upper())
+            yield gpu
+
+
+def catalog_pairs(
+    csv_path: Optional[Path] = None,
+    audiences: Iterable[str] = DEFAULT_AUDIENCES,
+) -> Iterator[tuple[str, str]]:
+    """Derive ``(gpu, audience)`` pairs from the catalogue's GAMER PCs."""
+    audiences = tuple(audiences)
+    for gpu in iter_catalog_gpus(csv_path):
+        for audience in audiences:
+            yield gpu, audience
+
+
+# ---------------------------------------------------------------------------
+# Execution & output
+# ---------------------------------------------------------------------------
+def run_bounded(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int = 8,
+) -> Iterator[tuple[int, R]]:
+    """Apply *fn* to *items* on a thread pool, yielding ``(index, result)``.
+
+    Results are yielded in completion order as soon as they are ready.
+    Only ``2 * max_workers`` items are pulled from *items* ahead of the
+    consumer, so arbitrarily long (lazy) inputs run in constant memory.
+    """
+    max_workers = max(1, max_workers)
+    window = 2 * max_workers
+    source = enumerate(items)
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="content-batch"
+    ) as pool:
+        pending: dict[Future, int] = {}
+
+        def _fill() -> None:
+            for index, item in islice(source, window - len(pending)):
+                pending[pool.submit(fn, item)] = index
+
+        _fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                yield index, future.result()
+            _fill()
+
+
+def write_ndjson(records: Iterable[dict], out: TextIO) -> int:
+    """Write *records* as compact NDJSON, flushing each line; return the line count."""
+    count = 0
+    for record in records:
+        out.write(serialise.dumps(record, indent=None))
+        out.write("\n")
+        out.flush()
+        count += 1
+    return count
@@ -0,0 +1,324 @@
+"""Indexed in-memory product catalogue for HelloComp inventory data.
+
+:class:`ProductCatalog` is built once from :func:`csv_loader.load_products`
+(or any product list) and keeps hash indexes by normalised GPU, tier and
+platform, a token index over product names, product families (colour and
+variant rows of one machine, see :mod:`families`) and a precomputed view
+of distinct names.  Filter lookups touch only the matching records instead
+of re-scanning the whole catalogue, so the Loot-Box generators can be
+called many times against the same catalogue cheaply.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence
+
+from .csv_loader import iter_gaming_pcs, iter_products, load_products
+from .families import ProductFamily, family_ids
+from .models import Product
+from .resolver import ProductResolver
+
+_GPU_PREFIX_RE = re.compile(r"^(?:RTX|GTX)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+#: Name fragments whose matches are memoised per catalogue; the memo is
+#: cleared when it fills up (fragments come straight from user input).
+NAME_CACHE_SIZE = 1024
+
+
+def normalise_gpu(gpu: str) -> str:
+    """Normalise a GPU label for index lookups.
+
+    ``"RTX 5070 Ti"``, ``"5070ti"`` and ``"5070 TI"`` all map to
+    ``"5070TI"``.  AMD ``RX`` prefixes are kept so ``RX 9070`` and an
+    NVIDIA ``9070`` never collide.
+    """
+    return _GPU_PREFIX_RE.sub("", _WHITESPACE_RE.sub("", gpu.upper()))
+
+
+class ProductCatalog:
+    """Immutable, indexed view over a list of :class:`Product` records.
+
+    The catalogue behaves like a read-only sequence (``len``, iteration,
+    indexing) so it can be passed anywhere a product list is accepted.
+
+    Parameters
+    ----------
+    products:
+        Product records in catalogue order.
+    families:
+        Family number of every product, numbered by first appearance as
+        :func:`families.family_ids` does.  Linked over *products* when
+        *None*; pass it when *products* are a selection from a larger
+        catalogue whose families were linked in full.
+
+    Raises
+    ------
+    ValueError
+        *families* does not have one entry per product.
+    """
+
+    __slots__ = (
+        "_products",
+        "_names_lower",
+        "_by_gpu",
+        "_by_tier",
+        "_by_platform",
+        "_by_token",
+        "_unique_order",
+        "_unique_ids",
+        "_family",
+        "_families",
+        "_name_cache",
+        "_resolver",
+    )
+
+    def __init__(
+        self, products: Iterable[Product], families: Optional[Sequence[int]] = None
+    ) -> None:
+        self._products: tuple[Product, ...] = tuple(products)
+        if families is not None and len(families) != len(self._products):
+            raise ValueError(
+                f"expected {len(self._products)} family numbers, got {len(families)}"
+            )
+        self._names_lower: tuple[str, ...] = tuple(
+            p.name.lower() for p in self._products
+        )
+        self._by_gpu: dict[str, list[int]] = defaultdict(list)
+        self._by_tier: dict[str, list[int]] = defaultdict(list)
+        self._by_platform: dict[str, list[int]] = defaultdict(list)
+        self._by_token: dict[str, list[int]] = defaultdict(list)
+        self._name_cache: dict[str, tuple[int, ...]] = {}
+        self._resolver: Optional[ProductResolver] = None
+
+        seen: set[str] = set()
+        unique_ids: list[int] = []
+        for i, p in enumerate(self._products):
+            if p.gpu:
+                self._by_gpu[normalise_gpu(p.gpu)].append(i)
+            if p.tier:
+                self._by_tier[p.tier.lower()].append(i)
+            if p.platform:
+                self._by_platform[p.platform.lower()].append(i)
+            for token in set(self._names_lower[i].split()):
+                self._by_token[token].append(i)
+            if p.name not in seen:
+                seen.add(p.name)
+                unique_ids.append(i)
+        self._unique_order: tuple[int, ...] = tuple(unique_ids)
+        self._unique_ids: frozenset[int] = frozenset(unique_ids)
+        self._family: tuple[int, ...] = tuple(
+            family_ids(self._products) if families is None else families
+        )
+        self._families: Optional[list[ProductFamily]] = None
+
+    # ------------------------------------------------------------------
+    # Construction helpers
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_csv(
+        cls,
+        csv_path: Optional[Path] = None,
+        gaming_only: bool = False,
+        use_snapshot: bool = False,
+        workers: int = 1,
+    ) -> "ProductCatalog":
+        """Build a catalogue straight from the products CSV.
+
+        Parameters
+        ----------
+        csv_path:
+            Path to the CSV.  Falls back to the repository's
+            ``products (1).csv`` when *None*.
+        gaming_only:
+            Keep only HelloComp GAMER PCs.
+        use_snapshot:
+            Load through the on-disk parsed snapshot
+            (see :func:`csv_loader.load_products`).
+        workers:
+            Parse large CSVs in this many processes
+            (see :func:`csv_loader.load_products`).
+        """
+        stream: Iterable[Product] = (
+            load_products(csv_path, use_snapshot=use_snapshot, workers=workers)
+            if use_snapshot or workers != 1
+            else iter_products(csv_path)
+        )
+        if gaming_only:
+            stream = iter_gaming_pcs(stream)
+        return cls(stream)
+
+    # ------------------------------------------------------------------
+    # Sequence protocol
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def __iter__(self) -> Iterator[Product]:
+        return iter(self._products)
+
+    def __getitem__(self, index: int) -> Product:
+        return self._products[index]
+
+    # ------------------------------------------------------------------
+    # Index lookups
+    # ------------------------------------------------------------------
+    def _ids_matching_name(self, fragment: str) -> tuple[int, ...]:
+        """Ids of products whose lower-cased name contains *fragment*."""
+        fragment = fragment.lower()
+        cached = self._name_cache.get(fragment)
+        if cached is not None:
+            return cached
+
+        parts = fragment.split()
+        if not parts:
+            ids: tuple[int, ...] = tuple(range(len(self._products)))
+        else:
+            # Each whitespace-free part must sit inside a single name token,
+            # so only the (small) token vocabulary is scanned; the final
+            # substring check keeps the exact ``fragment in name`` semantics.
+            candidates: Optional[set[int]] = None
+            for part in parts:
+                part_ids: set[int] = set()
+                for token, postings in self._by_token.items():
+                    if part in token:
+                        part_ids.update(postings)
+                candidates = part_ids if candidates is None else candidates & part_ids
+                if not candidates:
+                    break
+            ids = tuple(
+                i for i in sorted(candidates or ()) if fragment in self._names_lower[i]
+            )
+        if len(self._name_cache) >= NAME_CACHE_SIZE:
+            self._name_cache.clear()
+        self._name_cache[fragment] = ids
+        return ids
+
+    def filter_ids(
+        self,
+        gpu: Optional[str] = None,
+        tier: Optional[str] = None,
+        platform: Optional[str] = None,
+        name: Optional[str] = None,
+        unique: bool = False,
+        per_family: bool = False,
+    ) -> list[int]:
+        """Return catalogue positions matching every given criterion.
+
+        Parameters
+        ----------
+        gpu:
+            Exact GPU model (normalised, e.g. ``"RTX 5070 Ti"``).
+        tier:
+            Product tier, case-insensitive (``"Pro"``, ``"Extreme"`` …).
+        platform:
+            ``"AMD"`` or ``"Intel"``, case-insensitive.
+        name:
+            Case-insensitive substring of the product name (the semantics
+            of the Loot-Box ``gpu_filter``).
+        unique:
+            Keep only the first record for each distinct product name.
+        per_family:
+            Keep only the first matching record of each product family.
+        """
+        selections: list[Sequence[int]] = []
+        if gpu:
+            selections.append(self._by_gpu.get(normalise_gpu(gpu), ()))
+        if tier:
+            selections.append(self._by_tier.get(tier.lower(), ()))
+        if platform:
+            selections.append(self._by_platform.get(platform.lower(), ()))
+        if name:
+            selections.append(self._ids_matching_name(name))
+
+        if not selections:
+            ids = list(self._unique_order) if unique else list(range(len(self._products)))
+        else:
+            selections.sort(key=len)
+            result = set(selections[0])
+            for other in selections[1:]:
+                if not result:
+                    break
+                result.intersection_update(other)
+            if unique:
+                result &= self._unique_ids
+            ids = sorted(result)
+        if per_family:
+            family = self._family
+            seen: set[int] = set()
+            first_ids = []
+            for i in ids:
+                if family[i] not in seen:
+                    seen.add(family[i])
+                    first_ids.append(i)
+            ids = first_ids
+        return ids
+
+    def filter(
+        self,
+        gpu: Optional[str] = None,
+        tier: Optional[str] = None,
+        platform: Optional[str] = None,
+        name: Optional[str] = None,
+        unique: bool = False,
+        per_family: bool = False,
+    ) -> list[Product]:
+        """Return products matching every given criterion, in catalogue order.
+
+        See :meth:`filter_ids` for the meaning of the parameters.
+        """
+        products = self._products
+        return [
+            products[i]
+            for i in self.filter_ids(
+                gpu=gpu,
+                tier=tier,
+                platform=platform,
+                name=name,
+                unique=unique,
+                per_family=per_family,
+            )
+        ]
+
+    # ------------------------------------------------------------------
+    # Precomputed views
+    # ------------------------------------------------------------------
+    def unique_products(self) -> list[Product]:
+        """Return the first product for each distinct name, in catalogue order."""
+        return self.filter(unique=True)
+
+    def families(self) -> list[ProductFamily]:
+        """Return the product families, ordered by first appearance."""
+        if self._families is None:
+            families: list[ProductFamily] = []
+            for product, fid in zip(self._products, self._family):
+                if fid == len(families):
+                    families.append(ProductFamily(products=[]))
+                families[fid].products.append(product)
+            self._families = families
+        return self._families
+
+    def family_of(self, index: int) -> int:
+        """Return the family number of the product at *index*."""
+        return self._family[index]
+
+    def unique_names(self) -> list[str]:
+        """Return deduplicated product names, preserving order."""
+        return [p.name for p in self.unique_products()]
+
+    def gpus(self) -> list[str]:
+        """Return the normalised GPU keys present in the catalogue."""
+        return sorted(self._by_gpu)
+
+    def tiers(self) -> list[str]:
+        """Return the (lower-cased) tier keys present in the catalogue."""
+        return sorted(self._by_tier)
+
+    def resolver(self) -> ProductResolver:
+        """Return the fuzzy code / name :class:`ProductResolver` (built on first use)."""
+        if self._resolver is None:
+            self._resolver = ProductResolver(self._products)
+        return self._resolver
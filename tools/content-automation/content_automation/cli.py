@@ -6,15 +6,114 @@ Four entry-points:
 * ``lootbox-seo``     — Loot-Box SEO Dynamic Content Generator
 * ``omnichannel``     — Omnichannel Distributor (TikTok / Instagram / Facebook)
 * ``trending-socials`` — Trending Social Post Generator (AI-powered, multi-platform)
+
+plus ``content-automation-server``, the warm resident server the JSON
+modes forward to when ``CONTENT_AUTOMATION_SERVER`` is set.
 """
 
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 
 
+# ---------------------------------------------------------------------------
+# Shared Gemini options
+# ---------------------------------------------------------------------------
+def _add_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(
+        "--no-cache",
+        dest="cache_mode",
+        action="store_const",
+        const="off",
+        help="Nepoužívat cache Gemini odpovědí",
+    )
+    group.add_argument(
+        "--refresh-cache",
+        dest="cache_mode",
+        action="store_const",
+        const="refresh",
+        help="Vždy zavolat Gemini API a uložit novou odpověď do cache",
+    )
+
+
+def _apply_cache_arguments(args: argparse.Namespace) -> None:
+    from .gemini import set_cache_mode
+
+    set_cache_mode(args.cache_mode)
+
+
+# ---------------------------------------------------------------------------
+# Shared metrics export
+# ---------------------------------------------------------------------------
+def _add_metrics_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--metrics",
+        metavar="FILE",
+        default=None,
+        help="Zapsat časy fází a čítače do souboru (.prom = Prometheus, jinak JSON)",
+    )
+
+
+def _write_metrics(args: argparse.Namespace, metrics) -> None:
+    if args.metrics:
+        from pathlib import Path
+
+        metrics.write(Path(args.metrics))
+
+
+# ---------------------------------------------------------------------------
+# Forwarding to a running server
+# ---------------------------------------------------------------------------
+def _forward(args: argparse.Namespace, tool: str, payload: dict) -> bool:
+    """Print a running server's answer for a JSON request.
+
+    Returns *False* (and prints nothing) when no server is configured or
+    reachable, or when the request needs in-process state (cache flags,
+    ``--metrics``), so the caller generates locally.
+    """
+    if args.metrics or getattr(args, "cache_mode", None):
+        return False
+    from .server import forward
+
+    body = forward(tool, {k: v for k, v in payload.items() if v is not None})
+    if body is None:
+        return False
+    print(body)
+    return True
+
+
+def _add_stream_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--stream",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Vypisovat výstup průběžně, jak ho model generuje (výchozí: zapnuto v terminálu)",
+    )
+
+
+def _use_stream(args: argparse.Namespace) -> bool:
+    if args.output_json:
+        return False
+    return args.stream if args.stream is not None else sys.stdout.isatty()
+
+
+# ---------------------------------------------------------------------------
+# Shared JSON layout
+# ---------------------------------------------------------------------------
+def _add_compact_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Kompaktní JSON bez odsazení a mezer (menší a rychlejší strojový výstup)",
+    )
+
+
+def _indent(args: argparse.Namespace) -> int | None:
+    return None if args.compact else 2
+
+
 # ---------------------------------------------------------------------------
 # Hook-Master CLI
 # ---------------------------------------------------------------------------
@@ -26,8 +125,10 @@ def hookmaster_main(argv: list[str] | None = None) -> None:
             "Generuje TikTok hooky, 9:16 video scénáře a SEO popisky."
         ),
     )
-    parser.add_argument("gpu", help='Název GPU, např. "RTX 5080"')
-    parser.add_argument("audience", help='Cílová skupina, např. "hráč Warzone"')
+    parser.add_argument("gpu", nargs="?", help='Název GPU, např. "RTX 5080"')
+    parser.add_argument(
+        "audience", nargs="?", help='Cílová skupina, např. "hráč Warzone"'
+    )
     parser.add_argument(
         "--api-key",
         default=None,
@@ -39,32 +140,151 @@ def hookmaster_main(argv: list[str] | None = None) -> None:
         action="store_true",
         help="Výstup jako JSON (kompatibilní s dashboardem)",
     )
+    _add_stream_argument(parser)
+    _add_compact_argument(parser)
+    batch = parser.add_argument_group("dávkový režim (NDJSON výstup)")
+    source = batch.add_mutually_exclusive_group()
+    source.add_argument(
+        "--batch",
+        metavar="FILE",
+        default=None,
+        help="Soubor s dvojicemi GPU + cílovka (.csv se sloupci gpu,audience nebo .jsonl)",
+    )
+    source.add_argument(
+        "--from-catalog",
+        action="store_true",
+        help="Odvodit dvojice z GAMER PC v CSV katalogu",
+    )
+    batch.add_argument(
+        "--csv",
+        default=None,
+        help="Cesta k CSV katalogu pro --from-catalog (výchozí: products (1).csv)",
+    )
+    batch.add_argument(
+        "--audience",
+        dest="audiences",
+        action="append",
+        default=None,
+        help="Cílovka pro --from-catalog (lze opakovat)",
+    )
+    batch.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Max. počet souběžných generování (výchozí: 8)",
+    )
+    _add_cache_arguments(parser)
+    _add_metrics_argument(parser)
 
     args = parser.parse_args(argv)
+    _apply_cache_arguments(args)
+
+    if args.batch or args.from_catalog:
+        _hookmaster_batch(args)
+        return
+    if not args.gpu or not args.audience:
+        parser.error("zadej GPU a cílovou skupinu, nebo použij --batch / --from-catalog")
+
+    if args.output_json and _forward(
+        args,
+        "hookmaster",
+        {
+            "gpu": args.gpu,
+            "audience": args.audience,
+            "apiKey": args.api_key,
+            "compact": args.compact or None,
+        },
+    ):
+        return
+
+    if _use_stream(args):
+        from .hookmaster import generate_stream
+
+        _print_header("HOOK-MASTER", args.gpu, args.audience)
+        result = generate_stream(
+            args.gpu, args.audience, api_key=args.api_key, on_field=_HookmasterPrinter()
+        )
+        print("=" * 60)
+        _write_metrics(args, result.metrics)
+        return
 
     from .hookmaster import generate
 
     result = generate(args.gpu, args.audience, api_key=args.api_key)
 
     if args.output_json:
-        print(result.to_json())
+        result.write_json(sys.stdout, indent=_indent(args))
     else:
+        _print_header("HOOK-MASTER", result.gpu, result.target_audience)
+        printer = _HookmasterPrinter()
+        for hook in result.hooks:
+            printer("hooks", hook)
+        printer("script", result.script)
+        printer("seo_description", result.seo_description)
         print("=" * 60)
-        print(f"  HOOK-MASTER — {result.gpu} | {result.target_audience}")
-        print("=" * 60)
-        print()
-        for i, hook in enumerate(result.hooks, 1):
-            print(f"  🎣 Hook #{i}: {hook}")
-        print()
-        print("  🎬 Scénář (9:16 vertical):")
-        print("  " + "-" * 40)
-        for line in result.script.strip().splitlines():
-            print(f"    {line}")
-        print()
-        print("  🔍 SEO popisek:")
-        print(f"    {result.seo_description}")
-        print()
-        print("=" * 60)
+    _write_metrics(args, result.metrics)
+
+
+def _print_header(tool: str, gpu: str, audience: str) -> None:
+    print("=" * 60)
+    print(f"  {tool} — {gpu} | {audience}")
+    print("=" * 60)
+    print()
+
+
+class _HookmasterPrinter:
+    """Print Hook-Master fields one by one (``on_field`` callback)."""
+
+    def __init__(self) -> None:
+        self.hooks = 0
+        self._in_hooks = False
+
+    def __call__(self, name: str, value: str) -> None:
+        if name == "hooks":
+            self.hooks += 1
+            self._in_hooks = True
+            print(f"  🎣 Hook #{self.hooks}: {value}", flush=True)
+            return
+        if self._in_hooks:
+            print()
+            self._in_hooks = False
+        if name == "script":
+            print("  🎬 Scénář (9:16 vertical):")
+            print("  " + "-" * 40)
+            for line in value.strip().splitlines():
+                print(f"    {line}")
+        else:
+            print("  🔍 SEO popisek:")
+            print(f"    {value}")
+        print(flush=True)
+
+
+def _hookmaster_batch(args: argparse.Namespace) -> None:
+    from pathlib import Path
+
+    from .batch import DEFAULT_AUDIENCES, catalog_pairs, read_pairs, write_ndjson
+    from .hookmaster import generate_batch
+    from .metrics import Metrics
+
+    if args.batch:
+        pairs = read_pairs(Path(args.batch))
+    else:
+        pairs = catalog_pairs(
+            Path(args.csv) if args.csv else None,
+            audiences=args.audiences or DEFAULT_AUDIENCES,
+        )
+
+    total = Metrics("hookmaster")
+
+    def _records():
+        for index, result in generate_batch(
+            pairs, api_key=args.api_key, max_workers=args.workers
+        ):
+            yield {"index": index, **result.to_dict()}
+            total.merge(result.metrics)
+
+    write_ndjson(_records(), sys.stdout)
+    _write_metrics(args, total)
 
 
 # ---------------------------------------------------------------------------
@@ -104,22 +324,88 @@ def lootbox_main(argv: list[str] | None = None) -> None:
         action="store_true",
         help="Zobrazit doporučená klíčová slova pro content planning",
     )
+    parser.add_argument(
+        "--all-groups",
+        metavar="OUTPUT_DIR",
+        default=None,
+        help="Vygenerovat stránky pro všechny kombinace GPU × řada do adresáře (+ manifest.json)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Počet procesů pro parsování CSV a vykreslování stránek v režimu --all-groups (výchozí: 1)",
+    )
+    _add_compact_argument(parser)
+    parser.add_argument(
+        "--no-snapshot",
+        dest="use_snapshot",
+        action="store_false",
+        help="Nepoužívat binární snapshot rozparsovaného CSV (vždy parsovat znovu)",
+    )
+    _add_metrics_argument(parser)
 
     args = parser.parse_args(argv)
 
     from pathlib import Path
 
-    from .lootbox_seo import generate_full_seo_content, get_keyword_suggestions
+    from .lootbox_seo import (
+        generate_all_seo_content,
+        generate_full_seo_content,
+        get_keyword_suggestions,
+    )
+    from .metrics import SERIALISE, Metrics
+    from .serialise import dumps
 
     csv_path = Path(args.csv) if args.csv else None
+    metrics = Metrics("lootbox_seo")
+
+    if args.all_groups:
+        manifest = generate_all_seo_content(
+            Path(args.all_groups),
+            csv_path=csv_path,
+            use_snapshot=args.use_snapshot,
+            workers=args.workers,
+            metrics=metrics,
+        )
+        if args.format == "json":
+            print(dumps(manifest, indent=_indent(args)))
+        else:
+            print(
+                f"  ✅ {manifest['totalGroups']} skupin GPU × řada "
+                f"({manifest['totalProducts']} produktů) → {args.all_groups}"
+            )
+        _write_metrics(args, metrics)
+        return
+
+    if (
+        args.format == "json"
+        and not args.keywords
+        and args.use_snapshot
+        and _forward(
+            args,
+            "lootbox-seo",
+            {
+                "gpu": args.gpu,
+                "tier": args.tier,
+                "csv": str(csv_path.resolve()) if csv_path else None,
+                "compact": args.compact or None,
+            },
+        )
+    ):
+        return
+
     data = generate_full_seo_content(
         gpu_filter=args.gpu,
         tier_filter=args.tier,
         csv_path=csv_path,
+        use_snapshot=args.use_snapshot,
+        metrics=metrics,
     )
 
     if args.format == "json":
-        print(json.dumps(data, ensure_ascii=False, indent=2))
+        with metrics.span(SERIALISE):
+            print(dumps(data, indent=_indent(args)))
     elif args.format == "markdown":
         print(data["table_md"])
         print()
@@ -149,12 +435,15 @@ def lootbox_main(argv: list[str] | None = None) -> None:
         for kw in get_keyword_suggestions():
             print(f"    • {kw['keyword']} → {kw['tip']}")
         print()
+    _write_metrics(args, metrics)
 
 
 # ---------------------------------------------------------------------------
 # Trending Socials CLI
 # ---------------------------------------------------------------------------
 def trending_socials_main(argv: list[str] | None = None) -> None:
+    from pathlib import Path
+
     parser = argparse.ArgumentParser(
         prog="trending-socials",
         description=(
@@ -177,7 +466,23 @@ def trending_socials_main(argv: list[str] | None = None) -> None:
     )
     parser.add_argument(
         "--product",
-        help="Product code or name (optional, for contextual posts)",
+        help="Product code or name (optional, for contextual posts; fuzzy match)",
+    )
+    parser.add_argument(
+        "--csv",
+        default=None,
+        help="Cesta k CSV souboru pro --product (výchozí: products (1).csv z repozitáře)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Max parallel Gemini calls (default: 8, 1 = serial)",
+    )
+    parser.add_argument(
+        "--batched",
+        action="store_true",
+        help="One Gemini request per topic for all platforms and tones",
     )
     parser.add_argument(
         "--api-key",
@@ -190,23 +495,63 @@ def trending_socials_main(argv: list[str] | None = None) -> None:
         action="store_true",
         help="Výstup jako JSON (kompatibilní s dashboardem)",
     )
+    _add_compact_argument(parser)
+    _add_cache_arguments(parser)
+    _add_metrics_argument(parser)
 
     args = parser.parse_args(argv)
+    _apply_cache_arguments(args)
+
+    if args.output_json and _forward(
+        args,
+        "trending-socials",
+        {
+            "platforms": args.platforms,
+            "numTopics": args.num_topics,
+            "concurrency": args.concurrency,
+            "batched": args.batched,
+            "product": args.product,
+            "csv": str(Path(args.csv).resolve()) if args.csv else None,
+            "apiKey": args.api_key,
+            "compact": args.compact or None,
+        },
+    ):
+        return
 
     from .trending_socials import generate_trending_posts
 
+    product = None
+    if args.product:
+        from .catalog import ProductCatalog
+
+        catalog = ProductCatalog.from_csv(
+            Path(args.csv) if args.csv else None, use_snapshot=True
+        )
+        product = catalog.resolver().resolve(args.product)
+        if product is None:
+            suggestions = [p.name for _, p in catalog.resolver().search(args.product, limit=3)]
+            parser.error(
+                f"produkt {args.product!r} nebyl nalezen"
+                + (f" (podobné: {'; '.join(suggestions)})" if suggestions else "")
+            )
+
     result = generate_trending_posts(
         api_key=args.api_key,
         platforms=args.platforms,
         num_topics=args.num_topics,
+        max_concurrency=args.concurrency,
+        batched=args.batched,
+        product=product,
     )
 
     if args.output_json:
-        print(result.to_json())
+        result.write_json(sys.stdout, indent=_indent(args))
     else:
         print("=" * 70)
         print(f"  🚀 TRENDING SOCIALS — {len(result.posts)} posts generated")
         print(f"  Topics: {', '.join(t.keyword for t in result.trending_topics)}")
+        if result.product_context:
+            print(f"  Product: {result.product_context.name} ({result.product_context.code})")
         print(f"  ⏱️  Generation time: {result.generation_time_ms}ms")
         print("=" * 70)
         print()
@@ -219,6 +564,7 @@ def trending_socials_main(argv: list[str] | None = None) -> None:
             print()
 
         print("=" * 70)
+    _write_metrics(args, result.metrics)
 
 
 
@@ -230,8 +576,10 @@ def omnichannel_main(argv: list[str] | None = None) -> None:
             "pro TikTok, Instagram a Facebook pro HelloComp."
         ),
     )
-    parser.add_argument("gpu", help='Název GPU, např. "RTX 5080"')
-    parser.add_argument("audience", help='Cílová skupina, např. "hráč Warzone"')
+    parser.add_argument("gpu", nargs="?", help='Název GPU, např. "RTX 5080"')
+    parser.add_argument(
+        "audience", nargs="?", help='Cílová skupina, např. "hráč Warzone"'
+    )
     parser.add_argument(
         "--api-key",
         default=None,
@@ -243,29 +591,181 @@ def omnichannel_main(argv: list[str] | None = None) -> None:
         action="store_true",
         help="Výstup jako JSON (kompatibilní s dashboardem)",
     )
+    _add_stream_argument(parser)
+    _add_compact_argument(parser)
+    catalog = parser.add_argument_group("celý katalog (JSONL výstup)")
+    catalog.add_argument(
+        "--from-catalog",
+        action="store_true",
+        help="Posty pro každé GPU GAMER PC z katalogu × každou cílovku",
+    )
+    catalog.add_argument(
+        "--csv",
+        default=None,
+        help="Cesta k CSV katalogu pro --from-catalog (výchozí: products (1).csv)",
+    )
+    catalog.add_argument(
+        "--audience",
+        dest="audiences",
+        action="append",
+        default=None,
+        help="Cílovka pro --from-catalog (lze opakovat)",
+    )
+    catalog.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Max. počet souběžných generování (výchozí: 8)",
+    )
+    catalog.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        help="Soubor pro JSONL výstup (výchozí: stdout)",
+    )
+    _add_cache_arguments(parser)
+    _add_metrics_argument(parser)
 
     args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers musí být alespoň 1")
+    _apply_cache_arguments(args)
+
+    if args.from_catalog:
+        _omnichannel_catalog(args)
+        return
+    if not args.gpu or not args.audience:
+        parser.error("zadej GPU a cílovou skupinu, nebo použij --from-catalog")
+
+    if args.output_json and _forward(
+        args,
+        "omnichannel",
+        {
+            "gpu": args.gpu,
+            "audience": args.audience,
+            "apiKey": args.api_key,
+            "compact": args.compact or None,
+        },
+    ):
+        return
+
+    if _use_stream(args):
+        from .omnichannel import distribute_stream
+
+        _print_header("OMNICHANNEL", args.gpu, args.audience)
+        result = distribute_stream(
+            args.gpu, args.audience, api_key=args.api_key, on_field=_print_omnichannel_post
+        )
+        print("=" * 60)
+        _write_metrics(args, result.metrics)
+        return
 
     from .omnichannel import distribute
 
     result = distribute(args.gpu, args.audience, api_key=args.api_key)
 
     if args.output_json:
-        print(result.to_json())
+        result.write_json(sys.stdout, indent=_indent(args))
     else:
+        _print_header("OMNICHANNEL", result.gpu, result.target_audience)
+        _print_omnichannel_post("tiktok", result.tiktok)
+        _print_omnichannel_post("instagram", result.instagram)
+        _print_omnichannel_post("facebook", result.facebook)
         print("=" * 60)
-        print(f"  OMNICHANNEL — {result.gpu} | {result.target_audience}")
-        print("=" * 60)
-        print()
-        print("  🎵 TikTok:")
-        print(f"    {result.tiktok}")
-        print()
-        print("  📸 Instagram:")
-        for line in result.instagram.strip().splitlines():
-            print(f"    {line}")
-        print()
-        print("  👍 Facebook:")
-        for line in result.facebook.strip().splitlines():
-            print(f"    {line}")
-        print()
-        print("=" * 60)
+    _write_metrics(args, result.metrics)
+
+
+def _omnichannel_catalog(args: argparse.Namespace) -> None:
+    from pathlib import Path
+
+    from .batch import DEFAULT_AUDIENCES
+    from .metrics import FALLBACKS
+    from .omnichannel import distribute_catalog
+
+    # Progress and the report go to stderr so stdout stays pure JSONL.
+    interactive = sys.stderr.isatty()
+
+    def _progress(done: int, total: int) -> None:
+        if interactive:
+            print(f"\r  ⏳ {done}/{total} dvojic GPU × cílovka", end="", file=sys.stderr, flush=True)
+
+    kwargs = dict(
+        csv_path=Path(args.csv) if args.csv else None,
+        audiences=args.audiences or DEFAULT_AUDIENCES,
+        api_key=args.api_key,
+        max_workers=args.workers,
+        on_progress=_progress,
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            report = distribute_catalog(out, **kwargs)
+    else:
+        report = distribute_catalog(sys.stdout, **kwargs)
+
+    if interactive and report.pairs:
+        print(file=sys.stderr)
+    fallbacks = report.metrics.counter(FALLBACKS)
+    print(
+        f"  ✅ {report.pairs} dvojic, {report.items} položek za {report.seconds:.2f} s "
+        f"({report.pairs_per_second:,.1f} dvojic/s, {report.items_per_second:,.1f} položek/s, "
+        f"šablony: {fallbacks})",
+        file=sys.stderr,
+    )
+    _write_metrics(args, report.metrics)
+
+
+_OMNICHANNEL_LABELS = {
+    "tiktok": "🎵 TikTok",
+    "instagram": "📸 Instagram",
+    "facebook": "👍 Facebook",
+}
+
+
+def _print_omnichannel_post(platform: str, text: str) -> None:
+    print(f"  {_OMNICHANNEL_LABELS[platform]}:")
+    for line in text.strip().splitlines():
+        print(f"    {line}")
+    print(flush=True)
+
+
+# ---------------------------------------------------------------------------
+# Resident server
+# ---------------------------------------------------------------------------
+def server_main(argv: list[str] | None = None) -> None:
+    from .server import DEFAULT_HOST, DEFAULT_PORT, SERVER_ENV
+
+    parser = argparse.ArgumentParser(
+        prog="content-automation-server",
+        description=(
+            "Rezidentní HTTP server, který drží katalog, šablony a Gemini klienta "
+            "v paměti a odpovídá stejným JSON jako --json režimy CLI. "
+            f"CLI na něj přesměrují požadavky, když je nastaveno {SERVER_ENV}."
+        ),
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Adresa (výchozí: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (výchozí: {DEFAULT_PORT})")
+    parser.add_argument(
+        "--csv",
+        default=None,
+        help="Cesta k CSV katalogu (výchozí: products (1).csv z repozitáře)",
+    )
+    parser.add_argument(
+        "--api-key",
+        default=None,
+        help="Google Gemini API klíč (fallback: env GEMINI_API_KEY, jinak template režim)",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Logovat každý požadavek")
+
+    args = parser.parse_args(argv)
+
+    from pathlib import Path
+
+    from .server import serve
+
+    serve(
+        host=args.host,
+        port=args.port,
+        csv_path=Path(args.csv).resolve() if args.csv else None,
+        api_key=args.api_key,
+        verbose=args.verbose,
+    )
@@ -1,23 +1,42 @@
 """CSV product loader for HelloComp inventory data.
 
 Reads the semicolon-delimited ``products (1).csv`` shipped with the
-repository and returns a list of :class:`Product` objects.
+repository and yields or returns :class:`Product` objects.
+
+:func:`load_products` can optionally keep a binary snapshot of the parsed
+catalogue next to the CSV (``<name>.csv.snapshot``).  The snapshot stores
+the source path, size, mtime and SHA-256 of the CSV it was built from and
+is rebuilt automatically whenever the CSV content changes.
+
+With ``workers > 1`` large CSVs are parsed in parallel chunks
+(see :func:`record_spans`).
 """
 
 from __future__ import annotations
 
 import csv
+import hashlib
+import os
+import pickle
+import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 from .models import Product
 
 _REPO_ROOT = Path(__file__).resolve().parents[3]  # content_automation/ -> content-automation/ -> tools/ -> repo root
 _DEFAULT_CSV = _REPO_ROOT / "products (1).csv"
 
+_SNAPSHOT_SUFFIX = ".snapshot"
+_SNAPSHOT_VERSION = 1
 
-def load_products(csv_path: Optional[Path] = None) -> list[Product]:
-    """Load products from a semicolon-delimited CSV file.
+
+def iter_products(csv_path: Optional[Path] = None) -> Iterator[Product]:
+    """Stream products from a semicolon-delimited CSV file.
+
+    Records are yielded as soon as their row is parsed, so callers can
+    chain :func:`iter_gaming_pcs` / :func:`iter_unique_products` and
+    process catalogues of any size in constant memory.
 
     Parameters
     ----------
@@ -25,51 +44,397 @@ def load_products(csv_path: Optional[Path] = None) -> list[Product]:
         Path to the CSV.  Falls back to the repository's
         ``products (1).csv`` when *None*.
 
-    Returns
-    -------
-    list[Product]
+    Yields
+    ------
+    Product
         Parsed product records with empty strings normalised to *None*.
     """
     path = csv_path or _DEFAULT_CSV
 
-    products: list[Product] = []
     with open(path, encoding="utf-8") as fh:
         reader = csv.reader(fh, delimiter=";")
         header = next(reader, None)
         if header is None:
-            return products
+            return
 
         for row in reader:
-            if len(row) < 3:
-                continue
-            code = row[0].strip().strip('"')
-            pair_code = row[1].strip().strip('"') or None
-            name = row[2].strip().strip('"')
-            xml_feed = row[3].strip().strip('"') if len(row) > 3 else None
-            if not code or not name:
+            fields = _row_fields(row)
+            if fields is not None:
+                code, name, pair_code, xml_feed = fields
+                yield Product(
+                    code=code, name=name, pair_code=pair_code, xml_feed_name=xml_feed
+                )
+
+
+def _row_fields(
+    row: list[str],
+) -> Optional[tuple[str, str, Optional[str], Optional[str]]]:
+    """Normalise one CSV row to ``(code, name, pair_code, xml_feed_name)``.
+
+    Returns *None* for rows the loader skips (fewer than three columns,
+    empty code or name).  Empty optional fields become *None*.
+    """
+    if len(row) < 3:
+        return None
+    code = row[0].strip().strip('"')
+    pair_code = row[1].strip().strip('"') or None
+    name = row[2].strip().strip('"')
+    xml_feed = row[3].strip().strip('"') if len(row) > 3 else None
+    if not code or not name:
+        return None
+    return code, name, pair_code, xml_feed or None
+
+
+def iter_gaming_pcs(products: Iterable[Product]) -> Iterator[Product]:
+    """Stream only HelloComp GAMER PCs (excludes peripherals, vouchers, etc.)."""
+    for p in products:
+        if "GAMER" in p.name and "HelloComp" in p.name:
+            yield p
+
+
+def iter_unique_products(products: Iterable[Product]) -> Iterator[Product]:
+    """Stream the first product seen for each distinct name.
+
+    Memory grows with the number of distinct names, not with the number
+    of rows.
+    """
+    seen: set[str] = set()
+    for p in products:
+        if p.name not in seen:
+            seen.add(p.name)
+            yield p
+
+
+# ---------------------------------------------------------------------------
+# Parallel chunked parsing
+# ---------------------------------------------------------------------------
+#: Files smaller than this are parsed serially even when workers are requested.
+PARALLEL_MIN_BYTES = 8 << 20
+
+#: Lower bound on the bytes handed to one worker task.
+MIN_CHUNK_BYTES = 1 << 20
+
+
+def record_spans(
+    buf, chunk_bytes: int
+) -> tuple[int, list[tuple[int, int]]]:
+    """Split a CSV buffer into byte ranges that end on candidate record boundaries.
+
+    A newline is taken as the end of a record when it is preceded by an
+    even number of ``"`` characters (escaped quotes come in pairs), so
+    quoted fields that contain newlines are not split.  This is a fast
+    heuristic: a stray ``"`` inside an unquoted field (``27" monitor``) is
+    an ordinary character to :mod:`csv` but flips the parity, so the
+    workers check every range (see :func:`_parse_span`).  *buf* may be
+    ``bytes`` or an ``mmap``; quotes are counted once over the whole buffer.
+
+    Returns
+    -------
+    tuple[int, list[tuple[int, int]]]
+        Offset just past the header record, and ``(start, end)`` ranges of
+        roughly *chunk_bytes* each covering the rest of *buf* in order.
+    """
+    size = len(buf)
+    scanned = 0
+    quotes = 0
+
+    def boundary(target: int) -> int:
+        nonlocal scanned, quotes
+        target = min(target, size)
+        quotes += buf[scanned:target].count(b'"')  # mmap has no count()
+        scanned = target
+        while True:
+            newline = buf.find(b"\n", scanned)
+            if newline == -1:
+                scanned = size
+                return size
+            quotes += buf[scanned:newline].count(b'"')
+            scanned = newline + 1
+            if quotes % 2 == 0:
+                return scanned
+
+    header_end = boundary(0)
+    spans: list[tuple[int, int]] = []
+    start = header_end
+    while start < size:
+        end = boundary(start + chunk_bytes)
+        spans.append((start, end))
+        start = end
+    return header_end, spans
+
+
+#: Separates fields in a worker's packed result.
+_FIELD_SEP = "\x00"
+
+
+def _parse_span(path: str, start: int, end: int) -> Optional[str]:
+    """Worker: parse the records in ``[start, end)`` of *path*.
+
+    Returns the normalised ``(code, name, pair_code, xml_feed_name)``
+    fields of every kept row joined by :data:`_FIELD_SEP` (*None* as an
+    empty string).  One string pickles far faster than a list of tuples,
+    which keeps the parent's share of the work small.
+
+    The range is parsed strictly.  If it starts on a record boundary, a
+    strict parse succeeds only when it also ends on one, so a range split
+    inside a quoted field is detected.  Returns *None* in that case (and
+    when the chunk contains a NUL byte and so cannot be packed); the
+    caller then parses the whole file serially.
+    """
+    import io
+    import mmap
+
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = mm[start:end].decode("utf-8")
+    if _FIELD_SEP in text:
+        return None
+    # newline=None translates line endings exactly like iter_products' open().
+    reader = csv.reader(io.StringIO(text, newline=None), delimiter=";", strict=True)
+    try:
+        return _FIELD_SEP.join(
+            value or ""
+            for fields in map(_row_fields, reader)
+            if fields is not None
+            for value in fields
+        )
+    except csv.Error:
+        return None
+
+
+def _is_single_record(data: bytes) -> bool:
+    """Whether *data* parses strictly as exactly one CSV record."""
+    import io
+
+    try:
+        text = data.decode("utf-8")
+        rows = list(csv.reader(io.StringIO(text, newline=None), delimiter=";", strict=True))
+    except (UnicodeDecodeError, csv.Error):
+        return False
+    return len(rows) == 1
+
+
+def _load_parallel(path: Path, workers: int) -> Optional[list[Product]]:
+    """Parse *path* in a process pool; *None* when a serial parse is better."""
+    import mmap
+
+    size = path.stat().st_size
+    if workers <= 1 or size == 0 or size < PARALLEL_MIN_BYTES:
+        return None
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        chunk_bytes = max(MIN_CHUNK_BYTES, size // (workers * 4))
+        header_end, spans = record_spans(mm, chunk_bytes)
+        # Each chunk is validated assuming it starts on a record boundary;
+        # the first one does once the header is a single record.
+        if len(spans) <= 1 or not _is_single_record(mm[:header_end]):
+            return None
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    products: list[Product] = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(spans))) as pool:
+        # map() yields in submission order, so records keep their file order.
+        for packed in pool.map(
+            _parse_span,
+            [str(path)] * len(spans),
+            [s for s, _ in spans],
+            [e for _, e in spans],
+        ):
+            if packed is None:
+                return None
+            if not packed:
                 continue
-            products.append(
+            values = iter(packed.split(_FIELD_SEP))
+            products.extend(
                 Product(
                     code=code,
                     name=name,
-                    pair_code=pair_code,
+                    pair_code=pair_code or None,
                     xml_feed_name=xml_feed or None,
                 )
+                for code, name, pair_code, xml_feed in zip(values, values, values, values)
+            )
+    return products
+
+
+def _parse(path: Optional[Path], workers: int) -> list[Product]:
+    if workers > 1:
+        products = _load_parallel(Path(path or _DEFAULT_CSV), workers)
+        if products is not None:
+            return products
+    return list(iter_products(path))
+
+
+# ---------------------------------------------------------------------------
+# Parsed-catalogue snapshot
+# ---------------------------------------------------------------------------
+def resolve_csv_path(csv_path: Optional[Path] = None) -> Path:
+    """Return *csv_path*, or the repository's ``products (1).csv`` when *None*."""
+    return Path(csv_path or _DEFAULT_CSV)
+
+
+def snapshot_path(csv_path: Optional[Path] = None) -> Path:
+    """Return where the parsed snapshot of *csv_path* is stored."""
+    path = resolve_csv_path(csv_path)
+    return path.with_name(path.name + _SNAPSHOT_SUFFIX)
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_snapshot(
+    path: Path, stat: os.stat_result
+) -> tuple[Optional[list[Product]], Optional[str]]:
+    """Load the snapshot for *path* if it still matches the source.
+
+    Returns ``(products, digest)``.  *products* is *None* when the snapshot
+    is missing, unreadable, malformed or stale — a snapshot never fails a
+    load; *digest* is the source content hash whenever it had to be
+    computed, so the caller can reuse it.
+    """
+    digest: Optional[str] = None
+    try:
+        with open(snapshot_path(path), "rb") as fh:
+            header = pickle.load(fh)
+            if (
+                not isinstance(header, dict)
+                or header.get("version") != _SNAPSHOT_VERSION
+                or header.get("source") != str(path.resolve())
+                or header.get("size") != stat.st_size
+            ):
+                return None, None
+
+            if header.get("mtime_ns") != stat.st_mtime_ns:
+                # Touched but possibly unchanged (e.g. git checkout) — the
+                # content hash decides.
+                digest = _file_sha256(path)
+                if header.get("sha256") != digest:
+                    return None, digest
+
+            rows = pickle.load(fh)
+
+        products: list[Product] = []
+        for code, pair_code, name, xml_feed, gpu, tier, platform in rows:
+            if not isinstance(name, str):
+                raise TypeError(f"snapshot row with a non-string name: {name!r}")
+            product = Product(
+                code=code, name=name, pair_code=pair_code, xml_feed_name=xml_feed
+            )
+            product._derived = (name, gpu, tier, platform)
+            products.append(product)
+    except Exception:  # Any damage to the snapshot means a cache miss.
+        return None, digest
+
+    if digest is not None:
+        # Refresh the fingerprint so later loads take the fast path again.
+        _write_snapshot(path, stat, digest, products)
+    return products, digest
+
+
+def _write_snapshot(
+    path: Path, stat: os.stat_result, digest: str, products: list[Product]
+) -> None:
+    """Atomically write the snapshot for *path*; failures are ignored."""
+    header = {
+        "version": _SNAPSHOT_VERSION,
+        "source": str(path.resolve()),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest,
+    }
+    # Share repeated strings (variant rows of one machine carry the same
+    # name) so pickle's memo writes each of them once.
+    interned: dict[Optional[str], Optional[str]] = {}
+    rows = [
+        tuple(
+            interned.setdefault(value, value)
+            for value in (
+                p.code,
+                p.pair_code,
+                p.name,
+                p.xml_feed_name,
+                p.gpu,
+                p.tier,
+                p.platform,
             )
+        )
+        for p in products
+    ]
+
+    target = snapshot_path(path)
+    try:
+        fd, tmp_name = tempfile.mkstemp(
+            prefix=target.name + ".", suffix=".tmp", dir=target.parent
+        )
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            pickle.dump(header, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(rows, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, target)
+    except OSError:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+
+
+def load_products(
+    csv_path: Optional[Path] = None, use_snapshot: bool = False, workers: int = 1
+) -> list[Product]:
+    """Load products from a semicolon-delimited CSV file.
+
+    Parameters
+    ----------
+    csv_path:
+        Path to the CSV.  Falls back to the repository's
+        ``products (1).csv`` when *None*.
+    use_snapshot:
+        Read the parsed catalogue from its on-disk snapshot when it still
+        matches the CSV, and (re)write the snapshot after a fresh parse.
+    workers:
+        Processes used to parse large files.  The file is memory-mapped,
+        split on quote-aware record boundaries (:func:`record_spans`) and
+        the chunks parsed in a process pool.  Every chunk is checked to end
+        on a real record boundary; when one does not, the file is parsed
+        serially instead, so results are always identical to the serial
+        parse.  Files under :data:`PARALLEL_MIN_BYTES` are always
+        parsed serially.  ``0`` uses every CPU.
+
+    Returns
+    -------
+    list[Product]
+        Parsed product records with empty strings normalised to *None*.
+    """
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    if not use_snapshot:
+        return _parse(csv_path, workers)
+
+    path = resolve_csv_path(csv_path)
+    stat = path.stat()
+    products, digest = _read_snapshot(path, stat)
+    if products is not None:
+        return products
+
+    # Hash before parsing so a CSV rewritten mid-parse leaves a snapshot
+    # that fails validation instead of one that silently mixes versions.
+    digest = digest or _file_sha256(path)
+    products = _parse(path, workers)
+    _write_snapshot(path, stat, digest, products)
     return products
 
 
-def filter_gaming_pcs(products: list[Product]) -> list[Product]:
+def filter_gaming_pcs(products: Iterable[Product]) -> list[Product]:
     """Return only HelloComp GAMER PCs (excludes peripherals, vouchers, etc.)."""
-    return [p for p in products if "GAMER" in p.name and "HelloComp" in p.name]
+    return list(iter_gaming_pcs(products))
 
 
-def unique_product_names(products: list[Product]) -> list[str]:
+def unique_product_names(products: Iterable[Product]) -> list[str]:
     """Return deduplicated product names, preserving order."""
-    seen: set[str] = set()
-    names: list[str] = []
-    for p in products:
-        if p.name not in seen:
-            seen.add(p.name)
-            names.append(p.name)
-    return names
+    return [p.name for p in iter_unique_products(products)]
@@ -0,0 +1,178 @@
+"""Group colour and variant rows of the same machine into product families.
+
+The catalogue lists many rows per machine — colour variants
+(``"… 4080"`` / ``"… 4080 White"``, ``"(Black)"`` / ``"(White)"``) and
+repeated rows that only :attr:`Product.pair_code` or
+:attr:`Product.xml_feed_name` tie together.  :func:`family_ids` links rows
+in a single pass over the catalogue through keys kept in one hash map:
+
+* rows with the same ``pairCode`` are one family;
+* rows with the same *variant stem* — the diacritic-folded name without
+  colour words — are one family;
+* a row whose feed name stems to another row's name stem joins that row's
+  family (``"Motospeed SK62 Red bílá"`` → ``"Motospeed SK62 White"``).
+  Feed names are not linked to each other: the feed reuses copy-pasted
+  names for unrelated products.
+
+When a row joins two families they are merged (union-find), so the result
+does not depend on row order.  Families are numbered by first appearance
+and every family is represented by its first row.  :class:`FamilyLinker`
+links a stream row by row, keeping only the key map, for callers that
+must not hold the whole catalogue.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence
+
+from .models import Product
+from .resolver import fold
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+#: Folded colour words dropped from variant stems (English and Czech).
+COLOUR_WORDS = frozenset(
+    {
+        "black", "white", "red", "blue", "green", "pink", "purple", "grey",
+        "gray", "yellow", "orange", "cerna", "cerny", "cerne", "bila", "bily",
+        "bile", "cervena", "cerveny", "modra", "modry", "seda", "sedy",
+        "ruzova", "zelena", "zluta", "oranzova",
+    }
+)
+
+
+@lru_cache(maxsize=16384)
+def variant_stem(name: Optional[str]) -> str:
+    """Folded name without colour words (``"Mouse (Black)"`` → ``"mouse"``)."""
+    if not name:
+        return ""
+    tokens = _TOKEN_RE.findall(fold(name))
+    if COLOUR_WORDS.isdisjoint(tokens):
+        return " ".join(tokens)
+    return " ".join(t for t in tokens if t not in COLOUR_WORDS)
+
+
+def _family_keys(product: Product) -> tuple[list[str], list[str]]:
+    """Return ``(keys to look up, keys to register)`` for *product*."""
+    lookup, register = [], []
+    if product.pair_code:
+        lookup.append("p:" + product.pair_code)
+        register.append("p:" + product.pair_code)
+    stem = variant_stem(product.name)
+    if stem:
+        lookup += ("n:" + stem, "f:" + stem)
+        register.append("n:" + stem)
+    feed = variant_stem(product.xml_feed_name)
+    if feed and feed != stem:
+        lookup.append("n:" + feed)
+        register.append("f:" + feed)
+    return lookup, register
+
+
+class FamilyLinker:
+    """Link rows into families one at a time (the engine of :func:`family_ids`).
+
+    Only the key map and the union-find array are kept, not the rows.  A
+    caller streaming a catalogue keeps just the rows it needs with the
+    provisional number :meth:`add` returned for each, and turns those into
+    family numbers with :meth:`resolve` once every row has been linked.
+    """
+
+    __slots__ = ("_parent", "_by_key")
+
+    def __init__(self) -> None:
+        self._parent: list[int] = []  # Union-find over provisional family numbers.
+        self._by_key: dict[str, int] = {}
+
+    def _find(self, fid: int) -> int:
+        parent = self._parent
+        while parent[fid] != fid:
+            parent[fid] = parent[parent[fid]]
+            fid = parent[fid]
+        return fid
+
+    def add(self, product: Product) -> int:
+        """Link *product* and return its provisional family number."""
+        parent, by_key = self._parent, self._by_key
+        lookup, register = _family_keys(product)
+        roots = {self._find(by_key[k]) for k in lookup if k in by_key}
+        if not roots:
+            fid = len(parent)
+            parent.append(fid)
+        else:
+            # Merge into the earliest family so numbering follows first appearance.
+            fid = min(roots)
+            for root in roots:
+                parent[root] = fid
+        for key in register:
+            if key not in by_key:
+                by_key[key] = fid
+        return fid
+
+    def resolve(self, provisional: Iterable[int]) -> list[int]:
+        """Final family numbers of *provisional* ones returned by :meth:`add`.
+
+        Families are numbered ``0, 1, …`` by first appearance in *provisional*.
+        """
+        dense: dict[int, int] = {}
+        return [dense.setdefault(self._find(fid), len(dense)) for fid in provisional]
+
+
+def family_ids(products: Iterable[Product]) -> list[int]:
+    """Return the family number of every product, in input order.
+
+    Families are numbered ``0, 1, …`` by the position of their first row.
+    """
+    linker = FamilyLinker()
+    return linker.resolve([linker.add(product) for product in products])
+
+
+def family_representatives(products: Iterable[Product]) -> list[Product]:
+    """Return the first row of every family, in catalogue order."""
+    products = products if isinstance(products, Sequence) else list(products)
+    seen: set[int] = set()
+    result = []
+    for product, fid in zip(products, family_ids(products)):
+        if fid not in seen:
+            seen.add(fid)
+            result.append(product)
+    return result
+
+
+@dataclass
+class ProductFamily:
+    """All catalogue rows of one machine."""
+
+    products: list[Product]
+
+    @property
+    def representative(self) -> Product:
+        """The family's first row, used wherever one product stands for all."""
+        return self.products[0]
+
+    @property
+    def name(self) -> str:
+        return self.products[0].name
+
+    @property
+    def key(self) -> str:
+        """Variant stem of the representative name."""
+        return variant_stem(self.products[0].name)
+
+    def variant_names(self) -> list[str]:
+        """Distinct names of the rows, in catalogue order."""
+        return list(dict.fromkeys(p.name for p in self.products))
+
+
+def group_families(products: Iterable[Product]) -> list[ProductFamily]:
+    """Group *products* into families ordered by first appearance."""
+    products = products if isinstance(products, Sequence) else list(products)
+    families: list[ProductFamily] = []
+    for product, fid in zip(products, family_ids(products)):
+        if fid == len(families):
+            families.append(ProductFamily(products=[]))
+        families[fid].products.append(product)
+    return families
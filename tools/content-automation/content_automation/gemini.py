@@ -0,0 +1,382 @@
+"""Shared Google Gemini backend for HelloComp content automation.
+
+Hook-Master, the Omnichannel Distributor and the Trending Socials
+generator all talk to Gemini through this module.  It keeps one
+process-wide ``google.genai.Client`` per API key, so batch runs and
+thread-pool fan-outs reuse the client's pooled HTTP connections and pay
+the connection / TLS setup cost once instead of on every call.
+
+Responses are answered from the persistent :mod:`response_cache` when the
+same model, system instruction, prompt and config were seen before.  The
+cache mode is ``"use"`` by default and can be switched to ``"refresh"``
+(always call the API, then store) or ``"off"`` with :func:`set_cache_mode`
+or the ``GEMINI_CACHE`` environment variable.
+
+:func:`stream_content` is the streaming counterpart used by the
+interactive CLIs: it yields the response text chunk by chunk as the model
+produces it.
+
+Calls that do reach the API are paced by the shared
+:class:`~content_automation.rate_limit.RateLimiter` (per-model RPM/TPM
+budgets, adaptive concurrency, jittered exponential-backoff retries on
+429 and transient 5xx errors).
+
+The ``google-genai`` SDK is imported lazily, so template-only runs never
+pay for the import.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Iterator, Optional
+
+from . import metrics as m
+from .rate_limit import RateLimiter, estimate_tokens
+from .response_cache import ResponseCache, cache_key
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+#: Request timeout shared by every client (milliseconds, SDK convention).
+DEFAULT_TIMEOUT_MS = 60_000
+
+#: Output tokens budgeted against TPM when a call sets no ``max_output_tokens``.
+DEFAULT_OUTPUT_TOKENS = 1024
+
+CACHE_USE = "use"
+CACHE_REFRESH = "refresh"
+CACHE_OFF = "off"
+_CACHE_MODES = (CACHE_USE, CACHE_REFRESH, CACHE_OFF)
+
+_clients: dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+_cache_mode: Optional[str] = None
+
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def _create_client(api_key: str) -> Any:
+    from google import genai
+    from google.genai import types
+
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(timeout=DEFAULT_TIMEOUT_MS),
+    )
+
+
+def get_client(api_key: str) -> Any:
+    """Return the shared ``genai.Client`` for *api_key*, creating it once.
+
+    Safe to call from several threads at once.
+    """
+    client = _clients.get(api_key)
+    if client is not None:
+        return client
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            client = _create_client(api_key)
+            _clients[api_key] = client
+    return client
+
+
+def reset_clients() -> None:
+    """Drop all cached clients (e.g. after rotating API keys)."""
+    with _clients_lock:
+        _clients.clear()
+
+
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+def set_cache_mode(mode: Optional[str]) -> None:
+    """Set the process-wide cache mode (``"use"``, ``"refresh"``, ``"off"``).
+
+    *None* restores the default from the ``GEMINI_CACHE`` env variable.
+    """
+    global _cache_mode
+    if mode is not None and mode not in _CACHE_MODES:
+        raise ValueError(f"Unknown cache mode {mode!r}; expected one of {_CACHE_MODES}")
+    _cache_mode = mode
+
+
+def get_cache_mode() -> str:
+    """Return the effective cache mode."""
+    mode = _cache_mode or os.environ.get("GEMINI_CACHE", CACHE_USE)
+    return mode if mode in _CACHE_MODES else CACHE_USE
+
+
+def set_cache(cache: Optional[ResponseCache]) -> None:
+    """Replace the shared response cache (*None* re-opens the default lazily)."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """Return the shared response cache, or *None* when it cannot be opened."""
+    global _cache
+    if _cache is not None:
+        return _cache
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = ResponseCache()
+            except (OSError, sqlite3.Error):
+                return None
+    return _cache
+
+
+def _cacheable(text: str, response_mime_type: Optional[str]) -> bool:
+    """Only keep responses a caller can use again (non-empty, valid JSON if asked)."""
+    if not text:
+        return False
+    if response_mime_type == "application/json":
+        try:
+            json.loads(text)
+        except ValueError:
+            return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """Replace the shared rate limiter (*None* re-creates the default lazily)."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        _rate_limiter = limiter
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the shared rate limiter, creating it on first use."""
+    global _rate_limiter
+    if _rate_limiter is not None:
+        return _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter()
+    return _rate_limiter
+
+
+# ---------------------------------------------------------------------------
+# Generation
+# ---------------------------------------------------------------------------
+def build_config(
+    system_instruction: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_output_tokens: Optional[int] = None,
+    response_mime_type: Optional[str] = None,
+    response_schema: Optional[dict] = None,
+) -> Any:
+    """Build a ``GenerateContentConfig`` from the non-*None* settings."""
+    from google.genai import types
+
+    settings = {
+        "system_instruction": system_instruction,
+        "temperature": temperature,
+        "max_output_tokens": max_output_tokens,
+        "response_mime_type": response_mime_type,
+        "response_schema": response_schema,
+    }
+    return types.GenerateContentConfig(
+        **{k: v for k, v in settings.items() if v is not None}
+    )
+
+
+def generate_content(
+    prompt: str,
+    api_key: str,
+    model: str = DEFAULT_MODEL,
+    system_instruction: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_output_tokens: Optional[int] = None,
+    response_mime_type: Optional[str] = None,
+    response_schema: Optional[dict] = None,
+    cache_mode: Optional[str] = None,
+    metrics: Optional[m.Metrics] = None,
+) -> str:
+    """Run a single Gemini generation and return the response text.
+
+    Parameters
+    ----------
+    prompt:
+        User prompt.
+    api_key:
+        Google Gemini API key.
+    model:
+        Gemini model name.
+    system_instruction, temperature, max_output_tokens, response_mime_type:
+        Optional ``GenerateContentConfig`` settings.
+    response_schema:
+        OpenAPI-style schema dict for structured JSON output.
+    cache_mode:
+        Override the process-wide cache mode for this call.
+    metrics:
+        When given, records cache hits/misses, the API call count,
+        ``retries`` / ``throttled`` counters and the ``api`` latency span.
+
+    Returns
+    -------
+    str
+        The response text (empty string when the model returned none).
+        SDK errors propagate — after the rate limiter's retries for quota
+        and transient errors — so callers can decide on their fallback.
+    """
+    mode = cache_mode or get_cache_mode()
+    cache = get_cache() if mode != CACHE_OFF else None
+    key_config: dict[str, Any] = {
+        "temperature": temperature,
+        "max_output_tokens": max_output_tokens,
+        "response_mime_type": response_mime_type,
+    }
+    if response_schema is not None:
+        # Only keyed when set, so entries cached without a schema stay valid.
+        key_config["response_schema"] = response_schema
+    key = cache_key(model, system_instruction, prompt, key_config)
+    if cache is not None and mode == CACHE_USE:
+        try:
+            cached = cache.get(key)
+        except sqlite3.Error:
+            cached = None
+        if metrics is not None:
+            metrics.incr(m.CACHE_HITS if cached is not None else m.CACHE_MISSES)
+        if cached is not None:
+            return cached
+
+    client = get_client(api_key)
+    config = build_config(
+        system_instruction=system_instruction,
+        temperature=temperature,
+        max_output_tokens=max_output_tokens,
+        response_mime_type=response_mime_type,
+        response_schema=response_schema,
+    )
+
+    def _call() -> Any:
+        if metrics is not None:
+            metrics.incr(m.API_CALLS)
+        with m.optional_span(metrics, m.API):
+            return client.models.generate_content(
+                model=model, contents=prompt, config=config
+            )
+
+    def _on_retry(exc: BaseException, status: Optional[int]) -> None:
+        if metrics is not None:
+            metrics.incr(m.RETRIES)
+            if status == 429:
+                metrics.incr(m.THROTTLED)
+
+    response = get_rate_limiter().call(
+        model,
+        _call,
+        estimate_tokens(system_instruction, prompt) + (max_output_tokens or DEFAULT_OUTPUT_TOKENS),
+        on_retry=_on_retry,
+    )
+    text = response.text or ""
+
+    if cache is not None and _cacheable(text, response_mime_type):
+        try:
+            cache.put(key, text)
+        except sqlite3.Error:
+            pass  # A busy or read-only cache must never fail a generation.
+    return text
+
+
+def stream_content(
+    prompt: str,
+    api_key: str,
+    model: str = DEFAULT_MODEL,
+    system_instruction: Optional[str] = None,
+    temperature: Optional[float] = None,
+    max_output_tokens: Optional[int] = None,
+    response_mime_type: Optional[str] = None,
+    cache_mode: Optional[str] = None,
+    metrics: Optional[m.Metrics] = None,
+) -> Iterator[str]:
+    """Stream a Gemini generation, yielding text chunks as they arrive.
+
+    Takes the same settings as :func:`generate_content` and shares its
+    response cache: a cached response is yielded as one chunk, and a
+    completed stream is stored under the same key.  The rate limiter
+    covers opening the stream up to the first chunk, so quota errors are
+    retried before anything is yielded; errors after that propagate to
+    the caller mid-stream.  The ``api`` span measures time to first chunk.
+    """
+    mode = cache_mode or get_cache_mode()
+    cache = get_cache() if mode != CACHE_OFF else None
+    key = cache_key(
+        model,
+        system_instruction,
+        prompt,
+        {
+            "temperature": temperature,
+            "max_output_tokens": max_output_tokens,
+            "response_mime_type": response_mime_type,
+        },
+    )
+    if cache is not None and mode == CACHE_USE:
+        try:
+            cached = cache.get(key)
+        except sqlite3.Error:
+            cached = None
+        if metrics is not None:
+            metrics.incr(m.CACHE_HITS if cached is not None else m.CACHE_MISSES)
+        if cached is not None:
+            yield cached
+            return
+
+    client = get_client(api_key)
+    config = build_config(
+        system_instruction=system_instruction,
+        temperature=temperature,
+        max_output_tokens=max_output_tokens,
+        response_mime_type=response_mime_type,
+    )
+
+    def _open() -> tuple[Any, Iterator[Any]]:
+        if metrics is not None:
+            metrics.incr(m.API_CALLS)
+        with m.optional_span(metrics, m.API):
+            stream = iter(
+                client.models.generate_content_stream(
+                    model=model, contents=prompt, config=config
+                )
+            )
+            return next(stream, None), stream
+
+    def _on_retry(exc: BaseException, status: Optional[int]) -> None:
+        if metrics is not None:
+            metrics.incr(m.RETRIES)
+            if status == 429:
+                metrics.incr(m.THROTTLED)
+
+    first, rest = get_rate_limiter().call(
+        model,
+        _open,
+        estimate_tokens(system_instruction, prompt) + (max_output_tokens or DEFAULT_OUTPUT_TOKENS),
+        on_retry=_on_retry,
+    )
+    parts: list[str] = []
+    if first is not None:
+        for chunk in itertools.chain((first,), rest):
+            text = chunk.text or ""
+            if text:
+                parts.append(text)
+                yield text
+
+    text = "".join(parts)
+    if cache is not None and _cacheable(text, response_mime_type):
+        try:
+            cache.put(key, text)
+        except sqlite3.Error:
+            pass  # A busy or read-only cache must never fail a generation.
@@ -9,11 +9,26 @@ the tool is always usable offline.
 from __future__ import annotations
 
 import json
+import logging
 import os
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional, TextIO
 
-from .models import ContentItem, ContentStatus, ContentType
+from . import gemini
+from . import metrics as m
+from . import templates
+from .batch import run_bounded
+from .json_stream import iter_values
+from .models import (
+    ContentItem,
+    ContentStatus,
+    ContentType,
+    iter_json_array,
+    utc_now,
+    write_json_array,
+)
+
+logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # HelloComp brand voice (shared system instruction)
@@ -36,9 +51,13 @@ class HookMasterResult:
     gpu: str
     target_audience: str
     ab_variants: list[dict[str, str]] = field(default_factory=list)
+    metrics: m.Metrics = field(
+        default_factory=lambda: m.Metrics("hookmaster"), repr=False, compare=False
+    )
 
     def to_content_items(self) -> list[ContentItem]:
         """Convert results into dashboard-compatible ContentItem list."""
+        created_at = utc_now()
         items: list[ContentItem] = []
         for i, hook in enumerate(self.hooks, 1):
             items.append(
@@ -47,6 +66,7 @@ class HookMasterResult:
                     body=hook,
                     content_type=ContentType.TIKTOK_HOOK,
                     status=ContentStatus.DRAFT,
+                    created_at=created_at,
                 )
             )
         items.append(
@@ -55,6 +75,7 @@ class HookMasterResult:
                 body=self.script,
                 content_type=ContentType.VIDEO_SCRIPT,
                 status=ContentStatus.DRAFT,
+                created_at=created_at,
             )
         )
         items.append(
@@ -63,17 +84,41 @@ class HookMasterResult:
                 body=self.seo_description,
                 content_type=ContentType.SEO_META,
                 status=ContentStatus.DRAFT,
+                created_at=created_at,
             )
         )
         return items
 
-    def to_json(self, indent: int = 2) -> str:
-        return json.dumps(
-            [item.to_dict() for item in self.to_content_items()],
-            ensure_ascii=False,
-            indent=indent,
+    def iter_json(self, indent: Optional[int] = 2) -> Iterator[str]:
+        """Encode the ContentItems as a JSON array, item by item."""
+        return iter_json_array(
+            (item.to_dict() for item in self.to_content_items()), indent
         )
 
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        with self.metrics.span(m.SERIALISE):
+            return "".join(self.iter_json(indent))
+
+    def write_json(self, out: TextIO, indent: Optional[int] = 2) -> None:
+        """Stream :meth:`to_json` to *out* without building the whole string."""
+        with self.metrics.span(m.SERIALISE):
+            write_json_array(
+                (item.to_dict() for item in self.to_content_items()), out, indent
+            )
+
+    def to_dict(self) -> dict:
+        """Serialise the full result, including dashboard ContentItems."""
+        with self.metrics.span(m.SERIALISE):
+            return {
+                "gpu": self.gpu,
+                "targetAudience": self.target_audience,
+                "hooks": self.hooks,
+                "script": self.script,
+                "seoDescription": self.seo_description,
+                "abVariants": self.ab_variants,
+                "contentItems": [item.to_dict() for item in self.to_content_items()],
+            }
+
 
 # ---------------------------------------------------------------------------
 # Template-based fallback (no API key required)
@@ -125,43 +170,71 @@ _SEO_TEMPLATE = (
 )
 
 
+# Compiled once; see :mod:`content_automation.templates`.
+_TEMPLATES = templates.REGISTRY.register(
+    "hookmaster",
+    {
+        **{f"hook_{i}": t for i, t in enumerate(_HOOK_TEMPLATES, 1)},
+        "script": _SCRIPT_TEMPLATE,
+        "seo_description": _SEO_TEMPLATE,
+    },
+)
+_AB_TEMPLATES = templates.REGISTRY.register(
+    "hookmaster.ab", {v["style"]: v["template"] for v in _AB_VARIANT_TEMPLATES}
+)
+
+
 def _build_ab_variants(gpu: str, target_audience: str) -> list[dict[str, str]]:
     return [
-        {
-            "style": v["style"],
-            "hook": v["template"].format(gpu=gpu, audience=target_audience),
-        }
-        for v in _AB_VARIANT_TEMPLATES
+        {"style": style, "hook": hook}
+        for style, hook in _AB_TEMPLATES.render(gpu, target_audience).items()
     ]
 
 
-def _generate_from_templates(gpu: str, target_audience: str) -> HookMasterResult:
-    hooks = [t.format(gpu=gpu, audience=target_audience) for t in _HOOK_TEMPLATES]
-    script = _SCRIPT_TEMPLATE.format(gpu=gpu, audience=target_audience)
-    seo = _SEO_TEMPLATE.format(gpu=gpu, audience=target_audience)
+def _result_from_templates(
+    gpu: str, target_audience: str, copy: dict[str, str], variants: dict[str, str]
+) -> HookMasterResult:
     return HookMasterResult(
-        hooks=hooks,
-        script=script,
-        seo_description=seo,
+        hooks=[copy[f"hook_{i}"] for i in range(1, len(_HOOK_TEMPLATES) + 1)],
+        script=copy["script"],
+        seo_description=copy["seo_description"],
         gpu=gpu,
         target_audience=target_audience,
-        ab_variants=_build_ab_variants(gpu, target_audience),
+        ab_variants=[{"style": style, "hook": hook} for style, hook in variants.items()],
     )
 
 
+def _generate_from_templates(gpu: str, target_audience: str) -> HookMasterResult:
+    return _result_from_templates(
+        gpu,
+        target_audience,
+        _TEMPLATES.render(gpu, target_audience),
+        _AB_TEMPLATES.render(gpu, target_audience),
+    )
+
+
+def generate_offline(pairs: Iterable[tuple[str, str]]) -> list[HookMasterResult]:
+    """Template results for many ``(gpu, audience)`` pairs in one pass.
+
+    The offline counterpart of :func:`generate_batch`: no API calls, no
+    threads, results in input order.  Rendering is batched through the
+    compiled templates, so a whole catalogue takes a fraction of a second.
+    """
+    pairs = list(pairs)
+    rows = [(gpu, audience, "") for gpu, audience in pairs]
+    return [
+        _result_from_templates(gpu, audience, copy, variants)
+        for (gpu, audience), copy, variants in zip(
+            pairs, _TEMPLATES.render_batch(rows), _AB_TEMPLATES.render_batch(rows)
+        )
+    ]
+
+
 # ---------------------------------------------------------------------------
 # Google Gemini–powered generation
 # ---------------------------------------------------------------------------
-def _generate_with_gemini(
-    gpu: str, target_audience: str, api_key: str
-) -> HookMasterResult:
-    """Call Google Gemini to generate hooks, script, and SEO text."""
-    from google import genai
-    from google.genai import types
-
-    client = genai.Client(api_key=api_key)
-
-    user_prompt = (
+def _build_prompt(gpu: str, target_audience: str) -> str:
+    return (
         f"GPU: {gpu}\n"
         f"Cílovka: {target_audience}\n\n"
         "Vygeneruj přesně:\n"
@@ -172,19 +245,25 @@ def _generate_with_gemini(
         '{"hooks": ["…","…","…"], "script": "…", "seo_description": "…"}'
     )
 
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=user_prompt,
-        config=types.GenerateContentConfig(
-            system_instruction=SYSTEM_PROMPT,
-            temperature=0.8,
-            max_output_tokens=1024,
-            response_mime_type="application/json",
-        ),
-    )
 
-    raw = response.text or "{}"
-    data = json.loads(raw)
+def _generate_with_gemini(
+    gpu: str, target_audience: str, api_key: str, metrics: m.Metrics
+) -> HookMasterResult:
+    """Call Google Gemini to generate hooks, script, and SEO text."""
+    with metrics.span(m.PROMPT_BUILD):
+        user_prompt = _build_prompt(gpu, target_audience)
+
+    raw = gemini.generate_content(
+        user_prompt,
+        api_key,
+        system_instruction=SYSTEM_PROMPT,
+        temperature=0.8,
+        max_output_tokens=1024,
+        response_mime_type="application/json",
+        metrics=metrics,
+    ) or "{}"
+    with metrics.span(m.JSON_PARSE):
+        data = json.loads(raw)
 
     return HookMasterResult(
         hooks=data.get("hooks", [])[:3],
@@ -193,6 +272,7 @@ def _generate_with_gemini(
         gpu=gpu,
         target_audience=target_audience,
         ab_variants=_build_ab_variants(gpu, target_audience),
+        metrics=metrics,
     )
 
 
@@ -215,14 +295,130 @@ def generate(
     api_key:
         Google Gemini API key.  Falls back to ``GEMINI_API_KEY`` env var.
         When no key is available the generator uses built-in templates.
+
+    The returned result carries a :class:`~content_automation.metrics.Metrics`
+    with the stage timings, cache hits and any API error that caused a
+    template fallback.
     """
     key = api_key or os.environ.get("GEMINI_API_KEY")
+    metrics = m.Metrics("hookmaster")
 
     if key:
         try:
-            return _generate_with_gemini(gpu, target_audience, key)
-        except Exception:
+            return _generate_with_gemini(gpu, target_audience, key, metrics)
+        except Exception as exc:
             # Graceful degradation — fall back to templates on any API error.
-            pass
+            metrics.record_error(exc)
+            logger.warning("Gemini failed for %s / %s, using templates: %s", gpu, target_audience, exc)
+
+    metrics.incr(m.FALLBACKS)
+    with metrics.span(m.FALLBACK):
+        result = _generate_from_templates(gpu, target_audience)
+    result.metrics = metrics
+    return result
+
+
+def generate_stream(
+    gpu: str,
+    target_audience: str,
+    api_key: Optional[str] = None,
+    on_field: Optional[Callable[[str, str], None]] = None,
+) -> HookMasterResult:
+    """Like :func:`generate`, but report each field as soon as it is complete.
+
+    The Gemini response is streamed and parsed incrementally
+    (:mod:`~content_automation.json_stream`); *on_field* is called with
+    ``("hooks", text)`` for every hook and ``("script", text)`` /
+    ``("seo_description", text)`` as each value closes.  When the stream
+    fails partway through, fields already received are kept and only the
+    missing ones are filled from templates (and reported the same way).
+    """
+    key = api_key or os.environ.get("GEMINI_API_KEY")
+    metrics = m.Metrics("hookmaster")
+    streamed = False
+    hooks: list[str] = []
+    fields: dict[str, str] = {}
+
+    def emit(name: str, value: str) -> None:
+        if on_field is not None:
+            on_field(name, value)
+
+    if key:
+        try:
+            with metrics.span(m.PROMPT_BUILD):
+                user_prompt = _build_prompt(gpu, target_audience)
+            chunks = gemini.stream_content(
+                user_prompt,
+                key,
+                system_instruction=SYSTEM_PROMPT,
+                temperature=0.8,
+                max_output_tokens=1024,
+                response_mime_type="application/json",
+                metrics=metrics,
+            )
+            for path, value in iter_values(chunks):
+                if not isinstance(value, str):
+                    continue
+                if len(path) == 2 and path[0] == "hooks" and len(hooks) < 3:
+                    hooks.append(value)
+                    emit("hooks", value)
+                elif path in (("script",), ("seo_description",)):
+                    fields[path[0]] = value
+                    emit(path[0], value)
+            streamed = True
+        except Exception as exc:
+            metrics.record_error(exc)
+            logger.warning("Gemini stream failed for %s / %s, using templates: %s", gpu, target_audience, exc)
 
-    return _generate_from_templates(gpu, target_audience)
+    if not streamed:
+        metrics.incr(m.FALLBACKS)
+        with metrics.span(m.FALLBACK):
+            template = _generate_from_templates(gpu, target_audience)
+        for hook in template.hooks[len(hooks):]:
+            hooks.append(hook)
+            emit("hooks", hook)
+        for name in ("script", "seo_description"):
+            if name not in fields:
+                fields[name] = getattr(template, name)
+                emit(name, fields[name])
+
+    return HookMasterResult(
+        hooks=hooks,
+        script=fields.get("script", ""),
+        seo_description=fields.get("seo_description", ""),
+        gpu=gpu,
+        target_audience=target_audience,
+        ab_variants=_build_ab_variants(gpu, target_audience),
+        metrics=metrics,
+    )
+
+
+def generate_batch(
+    pairs: Iterable[tuple[str, str]],
+    api_key: Optional[str] = None,
+    max_workers: int = 8,
+) -> Iterator[tuple[int, HookMasterResult]]:
+    """Run :func:`generate` over many ``(gpu, audience)`` pairs.
+
+    Parameters
+    ----------
+    pairs:
+        ``(gpu, target_audience)`` tuples; may be a lazy iterator of any
+        length (see :mod:`content_automation.batch` for file and catalogue
+        sources).
+    api_key:
+        Google Gemini API key, as for :func:`generate`.
+    max_workers:
+        Maximum number of generations in flight at once.
+
+    Yields
+    ------
+    tuple[int, HookMasterResult]
+        Input position and result, in completion order.
+    """
+    key = api_key or os.environ.get("GEMINI_API_KEY")
+    yield from run_bounded(
+        lambda pair: generate(pair[0], pair[1], api_key=key),
+        pairs,
+        max_workers=max_workers,
+    )
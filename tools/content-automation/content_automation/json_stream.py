@@ -0,0 +1,171 @@
+"""Incremental JSON parser for streamed Gemini responses.
+
+:class:`JsonStreamParser` accepts a JSON document in arbitrary text chunks
+(as they arrive from ``generate_content_stream``) and reports every scalar
+value the moment its closing quote or delimiter has been seen, together
+with its path in the document::
+
+    parser = JsonStreamParser()
+    parser.feed('{"hooks": ["Prvn')      # → []
+    parser.feed('í", "Druhý"], "scr')    # → [(("hooks", 0), "První"),
+                                         #    (("hooks", 1), "Druhý")]
+
+Only what the generators need is supported: objects, arrays, strings,
+numbers, ``true`` / ``false`` / ``null``.  Malformed input raises
+:class:`ValueError`, like :func:`json.loads`.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Iterable, Iterator, Union
+
+PathItem = Union[str, int]
+Event = tuple[tuple[PathItem, ...], object]
+
+_WHITESPACE = " \t\r\n"
+_SCALAR_END = _WHITESPACE + ",]}"
+
+
+class _Frame:
+    """One open object or array."""
+
+    __slots__ = ("is_object", "key", "index", "expect")
+
+    def __init__(self, is_object: bool) -> None:
+        self.is_object = is_object
+        self.key: PathItem = ""
+        self.index = 0
+        # Objects: "key" | "colon" | "value" | "comma"; arrays: "value" | "comma".
+        self.expect = "key" if is_object else "value"
+
+
+class JsonStreamParser:
+    """Push parser emitting ``(path, value)`` for each completed scalar."""
+
+    def __init__(self) -> None:
+        self._stack: list[_Frame] = []
+        self._string: list[str] | None = None  # Raw chars of the open string.
+        self._escape = False
+        self._scalar: list[str] | None = None  # Open number / literal.
+        self._done = False
+
+    @property
+    def done(self) -> bool:
+        """*True* once the top-level value has been closed."""
+        return self._done
+
+    def _path(self) -> tuple[PathItem, ...]:
+        return tuple(f.key if f.is_object else f.index for f in self._stack)
+
+    def _value_done(self, events: list[Event], value: object, scalar: bool) -> None:
+        if scalar:
+            events.append((self._path(), value))
+        if not self._stack:
+            self._done = True
+            return
+        self._stack[-1].expect = "comma"
+
+    def _finish_scalar(self, events: list[Event]) -> None:
+        text = "".join(self._scalar or ())
+        self._scalar = None
+        try:
+            value = json.loads(text)
+        except ValueError:
+            raise ValueError(f"Invalid JSON literal {text!r}") from None
+        self._value_done(events, value, scalar=True)
+
+    def feed(self, chunk: str) -> list[Event]:
+        """Consume *chunk* and return the scalars it completed, in order."""
+        events: list[Event] = []
+        for ch in chunk:
+            if self._string is not None:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    text = json.loads('"' + "".join(self._string) + '"', strict=False)
+                    self._string = None
+                    frame = self._stack[-1] if self._stack else None
+                    if frame is not None and frame.expect == "key":
+                        frame.key = text
+                        frame.expect = "colon"
+                    else:
+                        self._value_done(events, text, scalar=True)
+                    continue
+                self._string.append(ch)
+                continue
+
+            if self._scalar is not None:
+                if ch not in _SCALAR_END:
+                    self._scalar.append(ch)
+                    continue
+                self._finish_scalar(events)
+
+            if ch in _WHITESPACE:
+                continue
+            if self._done:
+                raise ValueError(f"Unexpected {ch!r} after the JSON document")
+            frame = self._stack[-1] if self._stack else None
+            expect = frame.expect if frame is not None else "value"
+
+            if expect == "key":
+                if ch == '"':
+                    self._string = []
+                elif ch == "}" and frame.key == "":
+                    self._stack.pop()
+                    self._value_done(events, None, scalar=False)
+                else:
+                    raise ValueError(f"Expected an object key, got {ch!r}")
+            elif expect == "colon":
+                if ch != ":":
+                    raise ValueError(f"Expected ':', got {ch!r}")
+                frame.expect = "value"
+            elif expect == "comma":
+                if ch == ",":
+                    if frame.is_object:
+                        frame.expect = "key"
+                    else:
+                        frame.index += 1
+                        frame.expect = "value"
+                elif ch == ("}" if frame.is_object else "]"):
+                    self._stack.pop()
+                    self._value_done(events, None, scalar=False)
+                else:
+                    raise ValueError(f"Expected ',' or a closing bracket, got {ch!r}")
+            else:  # expect == "value"
+                if ch == '"':
+                    self._string = []
+                elif ch == "{":
+                    self._stack.append(_Frame(is_object=True))
+                elif ch == "[":
+                    self._stack.append(_Frame(is_object=False))
+                elif ch == "]" and frame is not None and not frame.is_object and frame.index == 0:
+                    self._stack.pop()
+                    self._value_done(events, None, scalar=False)
+                elif ch in "-0123456789tfn":
+                    self._scalar = [ch]
+                else:
+                    raise ValueError(f"Unexpected {ch!r} in JSON value")
+        return events
+
+    def close(self) -> list[Event]:
+        """Flush a trailing top-level scalar; raise if the document is incomplete."""
+        events: list[Event] = []
+        if self._scalar is not None:
+            self._finish_scalar(events)
+        if not self._done:
+            raise ValueError("Truncated JSON document")
+        return events
+
+
+def iter_values(chunks: Iterable[str]) -> Iterator[Event]:
+    """Parse streamed *chunks*, yielding ``(path, value)`` as scalars complete.
+
+    Raises :class:`ValueError` when the stream ends before the document does.
+    """
+    parser = JsonStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
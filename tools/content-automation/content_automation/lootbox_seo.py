@@ -7,12 +7,23 @@ data-driven authority in the Czech gaming PC market.
 
 from __future__ import annotations
 
-import json
+import hashlib
+import re
 from dataclasses import dataclass
-from typing import Optional
+from pathlib import Path
+from typing import Iterable, Optional, Sequence, Union
 
-from .csv_loader import filter_gaming_pcs, load_products, unique_product_names
-from .models import ContentItem, ContentStatus, ContentType, Product
+from . import metrics as m
+from . import serialise
+from .catalog import ProductCatalog, normalise_gpu
+from .csv_loader import iter_gaming_pcs, iter_products, load_products
+from .families import FamilyLinker, family_ids
+from .models import ContentItem, ContentStatus, ContentType, Product, utc_now
+
+#: Anything the generators accept as a product source: a plain list (scanned
+#: on every call) or an indexed :class:`ProductCatalog` (looked up in time
+#: proportional to the result).
+Products = Union[list[Product], ProductCatalog]
 
 # ---------------------------------------------------------------------------
 # Trending keywords (static seed — extend with Google Trends API later)
@@ -68,40 +79,60 @@ class SEOComparisonTable:
         )
 
 
+def _select_unique(
+    products: Products,
+    gpu_filter: Optional[str] = None,
+    tier_filter: Optional[str] = None,
+) -> list[Product]:
+    """Return the first product of each family matching the filters.
+
+    Colour and variant rows of one machine (see :mod:`families`) count
+    once, so tables and counts reflect distinct products.
+    """
+    if isinstance(products, ProductCatalog):
+        return products.filter(name=gpu_filter, tier=tier_filter, per_family=True)
+
+    # Families are linked over every row, exactly as in the catalogue: a
+    # duplicate name may carry the pairCode that ties two machines together.
+    gpu_lower = gpu_filter.lower() if gpu_filter else None
+    tier_lower = tier_filter.lower() if tier_filter else None
+    seen: set[int] = set()
+    selected: list[Product] = []
+    for p, fid in zip(products, family_ids(products)):
+        if fid in seen:
+            continue
+        if gpu_lower and gpu_lower not in p.name.lower():
+            continue
+        if tier_lower and (p.tier or "").lower() != tier_lower:
+            continue
+        seen.add(fid)
+        selected.append(p)
+    return selected
+
+
 def build_comparison_table(
-    products: list[Product],
+    products: Products,
     gpu_filter: Optional[str] = None,
     tier_filter: Optional[str] = None,
     title: Optional[str] = None,
+    gpu_label: Optional[str] = None,
 ) -> SEOComparisonTable:
     """Build an SEO comparison table from product data.
 
     Parameters
     ----------
     products:
-        Full or pre-filtered product list.
+        Full or pre-filtered product list, or a :class:`ProductCatalog`.
     gpu_filter:
         Show only products containing this GPU string (case-insensitive).
     tier_filter:
         Show only products in this tier (SE, Pro, Max, Extreme …).
     title:
         Custom table title.  Auto-generated when *None*.
+    gpu_label:
+        GPU named in the auto-generated title (defaults to *gpu_filter*).
     """
-    filtered = products
-    if gpu_filter:
-        gpu_lower = gpu_filter.lower()
-        filtered = [p for p in filtered if gpu_lower in p.name.lower()]
-    if tier_filter:
-        tier_lower = tier_filter.lower()
-        filtered = [p for p in filtered if (p.tier or "").lower() == tier_lower]
-
-    # Deduplicate by name
-    seen: set[str] = set()
-    unique: list[Product] = []
-    for p in filtered:
-        if p.name not in seen:
-            seen.add(p.name)
-            unique.append(p)
+    unique = _select_unique(products, gpu_filter, tier_filter)
 
     rows = [
         ComparisonRow(
@@ -113,9 +144,10 @@ def build_comparison_table(
         for p in unique
     ]
 
+    gpu_label = gpu_label or gpu_filter
     auto_title = "Srovnání HelloComp herních PC"
-    if gpu_filter:
-        auto_title += f" — {gpu_filter}"
+    if gpu_label:
+        auto_title += f" — {gpu_label}"
     if tier_filter:
         auto_title += f" ({tier_filter})"
 
@@ -123,35 +155,33 @@ def build_comparison_table(
 
 
 def generate_seo_paragraph(
-    products: list[Product],
+    products: Products,
     gpu_filter: Optional[str] = None,
+    gpu_label: Optional[str] = None,
 ) -> str:
     """Generate an SEO-ready marketing paragraph for a GPU lineup.
 
     Parameters
     ----------
     products:
-        Product catalogue (typically from :func:`csv_loader.load_products`).
+        Product catalogue (typically from :func:`csv_loader.load_products`
+        or a :class:`ProductCatalog`).
     gpu_filter:
         Focus the paragraph on products with this GPU (e.g. ``"5070"``).
+    gpu_label:
+        GPU named in the copy (defaults to *gpu_filter*).
     """
-    filtered = products
-    if gpu_filter:
-        gpu_lower = gpu_filter.lower()
-        filtered = [p for p in filtered if gpu_lower in p.name.lower()]
-
-    names = unique_product_names(filtered)
-    count = len(names)
+    filtered = _select_unique(products, gpu_filter)
+    count = len(filtered)
+    gpu_label = gpu_label or gpu_filter
 
     if count == 0:
-        return f'Pro GPU "{gpu_filter}" aktuálně nemáme žádné sestavy v nabídce.'
-
-    gpu_label = gpu_filter or "herní GPU"
+        return f'Pro GPU "{gpu_label}" aktuálně nemáme žádné sestavy v nabídce.'
     tiers = sorted({p.tier for p in filtered if p.tier})
     tier_text = ", ".join(tiers) if tiers else "různých řadách"
 
     return (
-        f"HelloComp nabízí {count} unikátních konfigurací s {gpu_label} "
+        f"HelloComp nabízí {count} unikátních konfigurací s {gpu_label or 'herní GPU'} "
         f"v řadách {tier_text}. "
         f"Ať hledáš vstupní sestavu nebo prémiový stroj pro kompetitivní "
         f"gaming, HelloComp má řešení na míru. "
@@ -168,33 +198,35 @@ def get_keyword_suggestions() -> list[dict[str, str]]:
 # ---------------------------------------------------------------------------
 # TL;DR generation
 # ---------------------------------------------------------------------------
-def generate_tldr(products: list[Product], gpu_filter: Optional[str] = None) -> str:
+def generate_tldr(
+    products: Products,
+    gpu_filter: Optional[str] = None,
+    gpu_label: Optional[str] = None,
+) -> str:
     """Generate a concise TL;DR summary for a GPU lineup.
 
     Parameters
     ----------
     products:
-        Product catalogue.
+        Product catalogue (list or :class:`ProductCatalog`).
     gpu_filter:
         Focus the TL;DR on products with this GPU (e.g. ``"5070"``).
+    gpu_label:
+        GPU named in the TL;DR (defaults to *gpu_filter*).
     """
-    filtered = products
-    if gpu_filter:
-        gpu_lower = gpu_filter.lower()
-        filtered = [p for p in products if gpu_lower in p.name.lower()]
-
-    count = len({p.name for p in filtered})
-    gpu_label = gpu_filter or "různé GPU"
+    filtered = _select_unique(products, gpu_filter)
+    count = len(filtered)
+    gpu_label = gpu_label or gpu_filter
     tiers = sorted({p.tier for p in filtered if p.tier})
     tier_text = ", ".join(tiers) if tiers else "různé řady"
     platforms = sorted({p.platform for p in filtered if p.platform})
     platform_text = " a ".join(platforms) if platforms else "různé platformy"
 
     if count == 0:
-        return f'TL;DR: Pro GPU "{gpu_filter}" aktuálně nemáme žádné sestavy.'
+        return f'TL;DR: Pro GPU "{gpu_label}" aktuálně nemáme žádné sestavy.'
 
     return (
-        f"TL;DR: HelloComp nabízí {count} konfigurací s {gpu_label} "
+        f"TL;DR: HelloComp nabízí {count} konfigurací s {gpu_label or 'různé GPU'} "
         f"({tier_text}) na platformách {platform_text}. "
         f"Všechny dostupné na hellocomp.cz."
     )
@@ -245,36 +277,116 @@ def generate_full_seo_content(
     gpu_filter: Optional[str] = None,
     tier_filter: Optional[str] = None,
     csv_path=None,
+    catalog: Optional[ProductCatalog] = None,
+    use_snapshot: bool = False,
+    metrics: Optional[m.Metrics] = None,
 ) -> dict:
     """High-level entry point: load CSV → produce table + paragraph + keywords.
 
+    When *catalog* is given (e.g. ``ProductCatalog.from_csv(gaming_only=True)``
+    built once by a long-running caller) it is queried directly and the CSV
+    is not read at all.  With *use_snapshot* the CSV is loaded through its
+    on-disk parsed snapshot (see :func:`csv_loader.load_products`) instead
+    of being streamed and parsed from scratch.  When *metrics* is given,
+    the ``catalog_load`` and ``render`` stages are timed into it.
+
     Returns a dict with keys ``table_md``, ``table_html``, ``paragraph``,
     ``tldr``, ``keywords``, ``topic_cluster_ctas``, and ``content_items``.
     """
-    products = filter_gaming_pcs(load_products(csv_path))
-    table = build_comparison_table(products, gpu_filter=gpu_filter, tier_filter=tier_filter)
-    paragraph = generate_seo_paragraph(products, gpu_filter=gpu_filter)
-    tldr = generate_tldr(products, gpu_filter=gpu_filter)
+    if catalog is not None:
+        products: Products = catalog
+    else:
+        with m.optional_span(metrics, m.CATALOG_LOAD):
+            source = (
+                load_products(csv_path, use_snapshot=True)
+                if use_snapshot
+                else iter_products(csv_path)
+            )
+            products = _stream_matching(iter_gaming_pcs(source), gpu_filter)
+    with m.optional_span(metrics, m.RENDER):
+        return build_seo_content(products, gpu_filter=gpu_filter, tier_filter=tier_filter)
+
+
+def _stream_matching(stream: Iterable[Product], gpu_filter: Optional[str]) -> ProductCatalog:
+    """Rows of *stream* matching *gpu_filter*, with families linked over every row.
+
+    Every row is linked into its family as it streams past, but only the
+    first row of each distinct matching name is kept: rows the filter
+    drops, or repeated names, can still tie two matching machines
+    together.  Memory follows the result and the family key map, not the
+    catalogue.  A repeated name is always in its first row's family and
+    matches the same filters, so dropping it loses nothing.
+    """
+    linker = FamilyLinker()
+    gpu_lower = gpu_filter.lower() if gpu_filter else None
+    kept: list[Product] = []
+    provisional: list[int] = []
+    names: set[str] = set()
+    for p in stream:
+        fid = linker.add(p)
+        if p.name in names or (gpu_lower and gpu_lower not in p.name.lower()):
+            continue
+        names.add(p.name)
+        kept.append(p)
+        provisional.append(fid)
+    return ProductCatalog(kept, families=linker.resolve(provisional))
+
+
+def build_seo_content(
+    products: Products,
+    gpu_filter: Optional[str] = None,
+    tier_filter: Optional[str] = None,
+    item_key: Optional[str] = None,
+    created_at: Optional[str] = None,
+    gpu_label: Optional[str] = None,
+) -> dict:
+    """Produce the table, paragraph, TL;DR and ContentItems for *products*.
+
+    Returns the dict documented on :func:`generate_full_seo_content`.
+
+    Parameters
+    ----------
+    gpu_label:
+        GPU named in titles and copy (defaults to *gpu_filter*).  Pass it
+        instead of *gpu_filter* when *products* are already selected.
+    item_key:
+        When given, ContentItem IDs are derived from it instead of being
+        random, so re-rendering the same page yields the same IDs.
+    created_at:
+        Timestamp for the ContentItems (defaults to now).
+    """
+    stamp = {"created_at": created_at or utc_now()}
+    gpu_label = gpu_label or gpu_filter
+    table = build_comparison_table(
+        products, gpu_filter=gpu_filter, tier_filter=tier_filter, gpu_label=gpu_label
+    )
+    table_md = table.to_markdown()
+    paragraph = generate_seo_paragraph(products, gpu_filter=gpu_filter, gpu_label=gpu_label)
+    tldr = generate_tldr(products, gpu_filter=gpu_filter, gpu_label=gpu_label)
     keywords = get_keyword_suggestions()
     ctas = get_topic_cluster_ctas()
 
     content_items = [
         ContentItem(
             title=table.title,
-            body=table.to_markdown(),
+            body=table_md,
             content_type=ContentType.PRODUCT_DESCRIPTION,
             status=ContentStatus.DRAFT,
+            **_stable_id(item_key, "table"),
+            **stamp,
         ),
         ContentItem(
-            title=f"SEO text — {gpu_filter or 'celá nabídka'}",
+            title=f"SEO text — {gpu_label or 'celá nabídka'}",
             body=paragraph,
             content_type=ContentType.SEO_META,
             status=ContentStatus.DRAFT,
+            **_stable_id(item_key, "text"),
+            **stamp,
         ),
     ]
 
     return {
-        "table_md": table.to_markdown(),
+        "table_md": table_md,
         "table_html": table.to_html(),
         "paragraph": paragraph,
         "tldr": tldr,
@@ -282,3 +394,194 @@ def generate_full_seo_content(
         "topic_cluster_ctas": ctas,
         "content_items": [item.to_dict() for item in content_items],
     }
+
+
+def _stable_id(item_key: Optional[str], kind: str) -> dict[str, str]:
+    if item_key is None:
+        return {}
+    digest = hashlib.sha1(f"{item_key}:{kind}".encode("utf-8")).hexdigest()
+    return {"id": f"cg-{digest[:8]}"}
+
+
+# ---------------------------------------------------------------------------
+# Bulk generation: every GPU × tier in one pass
+# ---------------------------------------------------------------------------
+@dataclass
+class SEOGroup:
+    """GAMER PC families sharing one GPU and tier (one product per family)."""
+
+    gpu: str
+    tier: Optional[str]
+    products: list[Product]
+
+    @property
+    def slug(self) -> str:
+        """File-name-safe identifier, e.g. ``"5070ti-pro"``."""
+        raw = f"{normalise_gpu(self.gpu)}-{self.tier or 'all'}".lower()
+        return re.sub(r"[^a-z0-9]+", "-", raw).strip("-")
+
+
+def group_by_gpu_tier(products: Iterable[Product]) -> list[SEOGroup]:
+    """Group product families by (normalised GPU, tier).
+
+    Families are linked over every row.  A family is listed once in each
+    group its rows fall into — a ``pairCode`` family spanning two GPUs
+    appears on both pages — represented by its first row in that group.
+    Products without a recognisable GPU are skipped.  Groups are ordered by
+    first appearance; products keep catalogue order inside each group.
+    """
+    products = products if isinstance(products, Sequence) else list(products)
+    groups: dict[tuple[str, str], SEOGroup] = {}
+    listed: set[tuple[tuple[str, str], int]] = set()
+    for p, fid in zip(products, family_ids(products)):
+        gpu = p.gpu
+        if not gpu:
+            continue
+        tier = p.tier
+        key = (normalise_gpu(gpu), (tier or "").lower())
+        if (key, fid) in listed:
+            continue
+        listed.add((key, fid))
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = SEOGroup(gpu=gpu, tier=tier, products=[])
+        group.products.append(p)
+    return list(groups.values())
+
+
+def render_group(group: SEOGroup, created_at: Optional[str] = None) -> dict[str, str]:
+    """Render one group's artefacts as ``{file suffix: text}``.
+
+    The Markdown and HTML files mirror the ``lootbox-seo --format
+    markdown|html`` output; the JSON file holds the
+    :func:`build_seo_content` dict with IDs derived from the group slug.
+    The group's products are rendered as they are: they were grouped by
+    normalised GPU, which a GPU substring filter would not match.
+    """
+    data = build_seo_content(
+        group.products,
+        gpu_label=group.gpu,
+        tier_filter=group.tier,
+        item_key=group.slug,
+        created_at=created_at,
+    )
+    return {
+        ".json": serialise.dumps(data),
+        ".md": f"{data['table_md']}\n\n{data['paragraph']}\n",
+        ".html": f"{data['table_html']}\n\n<p>{data['paragraph']}</p>\n",
+    }
+
+
+def _write_group(group: SEOGroup, output_dir: Path, created_at: str) -> dict:
+    """Render *group*, write its files and return its manifest entry."""
+    files = {}
+    for suffix, text in render_group(group, created_at=created_at).items():
+        name = group.slug + suffix
+        (output_dir / name).write_text(text, encoding="utf-8")
+        files[suffix.lstrip(".")] = name
+    return {
+        "gpu": group.gpu,
+        "tier": group.tier,
+        "slug": group.slug,
+        "productCount": len(group.products),
+        "files": files,
+    }
+
+
+# Per-process state for the rendering pool.  The groups are shipped once per
+# worker through the pool initializer; tasks then only carry an index.
+_worker_state: dict = {}
+
+
+def _init_render_worker(groups: list[SEOGroup], output_dir: Path, created_at: str) -> None:
+    _worker_state["groups"] = groups
+    _worker_state["output_dir"] = output_dir
+    _worker_state["created_at"] = created_at
+
+
+def _write_group_at(index: int) -> dict:
+    return _write_group(
+        _worker_state["groups"][index],
+        _worker_state["output_dir"],
+        _worker_state["created_at"],
+    )
+
+
+def generate_all_seo_content(
+    output_dir: Path,
+    csv_path=None,
+    use_snapshot: bool = False,
+    workers: int = 1,
+    created_at: Optional[str] = None,
+    metrics: Optional[m.Metrics] = None,
+) -> dict:
+    """Generate SEO pages for every (GPU, tier) group and write them to disk.
+
+    The catalogue is read and grouped once, so the total cost is linear in
+    catalogue size instead of groups × catalogue.  Each group is written as
+    ``<slug>.json``, ``<slug>.md`` and ``<slug>.html`` under *output_dir*,
+    and a ``manifest.json`` lists every group.
+
+    Parameters
+    ----------
+    output_dir:
+        Target directory (created when missing).
+    csv_path, use_snapshot:
+        Catalogue source, as for :func:`generate_full_seo_content`.
+    workers:
+        Number of processes parsing a large CSV (see
+        :func:`csv_loader.load_products`) and rendering and writing groups.
+        ``1`` does everything in-process; any value produces byte-identical
+        files.
+    created_at:
+        Timestamp stamped on every ContentItem (defaults to now).
+    metrics:
+        Optional collector for the ``catalog_load``, ``render`` and
+        ``serialise`` (manifest) stages and a ``groups`` counter.
+
+    Returns
+    -------
+    dict
+        The manifest that was written.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    created_at = created_at or utc_now()
+
+    with m.optional_span(metrics, m.CATALOG_LOAD):
+        source = (
+            load_products(csv_path, use_snapshot=use_snapshot, workers=workers)
+            if use_snapshot or workers > 1
+            else iter_products(csv_path)
+        )
+        groups = group_by_gpu_tier(iter_gaming_pcs(source))
+
+    workers = min(max(1, workers), len(groups) or 1)
+    with m.optional_span(metrics, m.RENDER):
+        if workers == 1:
+            entries = [_write_group(g, output_dir, created_at) for g in groups]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_render_worker,
+                initargs=(groups, output_dir, created_at),
+            ) as pool:
+                chunksize = max(1, len(groups) // (workers * 4))
+                entries = list(
+                    pool.map(_write_group_at, range(len(groups)), chunksize=chunksize)
+                )
+    if metrics is not None:
+        metrics.incr("groups", len(entries))
+
+    manifest = {
+        "totalGroups": len(entries),
+        "totalProducts": sum(e["productCount"] for e in entries),
+        "groups": entries,
+    }
+    with m.optional_span(metrics, m.SERIALISE):
+        (output_dir / "manifest.json").write_text(
+            serialise.dumps(manifest), encoding="utf-8"
+        )
+    return manifest
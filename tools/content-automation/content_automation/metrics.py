@@ -0,0 +1,223 @@
+"""Per-stage timing and counters shared by all content-automation tools.
+
+A :class:`Metrics` object collects *spans* (timed stages such as prompt
+build, Gemini API latency, JSON parsing, template fallback and
+serialisation) and integer *counters* (API calls, cache hits, fallbacks,
+errors).  Generators attach one to every result object, so a slow
+template run can be told apart from a failed Gemini call, and the CLIs can
+export it with ``--metrics FILE`` as JSON or a Prometheus text file.
+
+Standard span and counter names are defined as module constants; tools
+may record additional ones.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+# Span names
+PROMPT_BUILD = "prompt_build"
+API = "api"
+JSON_PARSE = "json_parse"
+FALLBACK = "fallback"
+SERIALISE = "serialise"
+CATALOG_LOAD = "catalog_load"
+RENDER = "render"
+
+# Counter names
+API_CALLS = "api_calls"
+API_ERRORS = "api_errors"
+CACHE_HITS = "cache_hits"
+CACHE_MISSES = "cache_misses"
+FALLBACKS = "fallbacks"
+RETRIES = "retries"
+THROTTLED = "throttled"
+
+#: Most recent error messages kept per Metrics object.
+MAX_ERRORS = 20
+
+
+class Metrics:
+    """Thread-safe collection of span timings and counters.
+
+    Parameters
+    ----------
+    tool:
+        Name of the tool the metrics belong to (``"hookmaster"`` …); used
+        as a label in the Prometheus export.
+    """
+
+    __slots__ = ("tool", "_spans", "_counters", "_errors", "_lock")
+
+    def __init__(self, tool: str = "content_automation") -> None:
+        self.tool = tool
+        # name -> [count, total_seconds, min_seconds, max_seconds]
+        self._spans: dict[str, list[float]] = {}
+        self._counters: dict[str, int] = {}
+        self._errors: list[str] = []
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def observe(self, name: str, seconds: float) -> None:
+        """Record one *seconds*-long occurrence of span *name*."""
+        with self._lock:
+            stat = self._spans.get(name)
+            if stat is None:
+                self._spans[name] = [1, seconds, seconds, seconds]
+            else:
+                stat[0] += 1
+                stat[1] += seconds
+                stat[2] = min(stat[2], seconds)
+                stat[3] = max(stat[3], seconds)
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as span *name* (also when it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def incr(self, name: str, value: int = 1) -> None:
+        """Increase counter *name* by *value*."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def record_error(self, exc: BaseException) -> None:
+        """Count a failed API call and keep its message."""
+        with self._lock:
+            self._counters[API_ERRORS] = self._counters.get(API_ERRORS, 0) + 1
+            self._errors.append(f"{type(exc).__name__}: {exc}")
+            del self._errors[:-MAX_ERRORS]
+
+    def merge(self, other: "Metrics") -> "Metrics":
+        """Fold *other* into this object (e.g. per-result metrics of a batch)."""
+        spans = other._span_items()
+        with other._lock:
+            counters = dict(other._counters)
+            errors = list(other._errors)
+        with self._lock:
+            for name, s in spans:
+                stat = self._spans.get(name)
+                if stat is None:
+                    self._spans[name] = list(s)
+                else:
+                    stat[0] += s[0]
+                    stat[1] += s[1]
+                    stat[2] = min(stat[2], s[2])
+                    stat[3] = max(stat[3], s[3])
+            for name, value in counters.items():
+                self._counters[name] = self._counters.get(name, 0) + value
+            self._errors.extend(errors)
+            del self._errors[:-MAX_ERRORS]
+        return self
+
+    @classmethod
+    def combine(cls, metrics: Iterable["Metrics"], tool: str = "content_automation") -> "Metrics":
+        """Return a new object holding the sum of *metrics*."""
+        total = cls(tool)
+        for m in metrics:
+            total.merge(m)
+        return total
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def _span_items(self) -> list[tuple[str, tuple[float, ...]]]:
+        with self._lock:
+            return [(name, tuple(stat)) for name, stat in self._spans.items()]
+
+    def counter(self, name: str) -> int:
+        """Return the value of counter *name* (0 when never incremented)."""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def span_count(self, name: str) -> int:
+        """Return how many times span *name* was recorded."""
+        with self._lock:
+            stat = self._spans.get(name)
+            return int(stat[0]) if stat else 0
+
+    @property
+    def errors(self) -> list[str]:
+        """The most recent error messages (oldest first)."""
+        with self._lock:
+            return list(self._errors)
+
+    def to_dict(self) -> dict:
+        """Serialise as ``{"tool", "spans", "counters", "errors"}`` (times in ms)."""
+        spans = {
+            name: {
+                "count": int(count),
+                "totalMs": round(total * 1000, 3),
+                "minMs": round(low * 1000, 3),
+                "maxMs": round(high * 1000, 3),
+            }
+            for name, (count, total, low, high) in self._span_items()
+        }
+        with self._lock:
+            counters = dict(self._counters)
+            errors = list(self._errors)
+        return {"tool": self.tool, "spans": spans, "counters": counters, "errors": errors}
+
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+    def to_prometheus(self, prefix: str = "content_automation") -> str:
+        """Render in the Prometheus text exposition format.
+
+        Spans become a ``<prefix>_stage_seconds`` summary (``_sum`` and
+        ``_count``) labelled by stage; counters become
+        ``<prefix>_<name>_total``.
+        """
+        data = self.to_dict()
+        tool = _escape_label(self.tool)
+        lines = []
+        if data["spans"]:
+            metric = f"{prefix}_stage_seconds"
+            lines.append(f"# HELP {metric} Time spent per generation stage.")
+            lines.append(f"# TYPE {metric} summary")
+            for name, s in sorted(data["spans"].items()):
+                labels = f'tool="{tool}",stage="{_escape_label(name)}"'
+                lines.append(f"{metric}_sum{{{labels}}} {s['totalMs'] / 1000:.6f}")
+                lines.append(f"{metric}_count{{{labels}}} {s['count']}")
+        for name, value in sorted(data["counters"].items()):
+            metric = f"{prefix}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f'{metric}{{tool="{tool}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path) -> None:
+        """Write to *path*: Prometheus text for ``.prom``/``.txt``, else JSON."""
+        path = Path(path)
+        if path.suffix.lower() in (".prom", ".txt"):
+            text = self.to_prometheus()
+        else:
+            text = self.to_json() + "\n"
+        path.write_text(text, encoding="utf-8")
+
+    def __repr__(self) -> str:
+        data = self.to_dict()
+        return f"Metrics(tool={self.tool!r}, spans={sorted(data['spans'])}, counters={data['counters']})"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@contextmanager
+def optional_span(metrics: Optional[Metrics], name: str) -> Iterator[None]:
+    """Like :meth:`Metrics.span`, but a no-op when *metrics* is *None*."""
+    if metrics is None:
+        yield
+    else:
+        with metrics.span(name):
+            yield
@@ -7,11 +7,17 @@ for CSV-sourced inventory data.
 
 from __future__ import annotations
 
-import uuid
+import os
+import re
+import threading
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Optional
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional, TextIO
+
+from . import serialise
 
 
 class ContentType(str, Enum):
@@ -29,19 +35,79 @@ class ContentStatus(str, Enum):
     PUBLISHED = "published"
 
 
-@dataclass
+# ---------------------------------------------------------------------------
+# IDs and timestamps
+# ---------------------------------------------------------------------------
+# Crockford base32 is in ASCII order, so IDs sort in creation order.
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+#: Two base32 digits for every 10-bit value.
+_DIGIT_PAIRS = [a + b for a in _CROCKFORD for b in _CROCKFORD]
+_COUNTER_MASK = (1 << 80) - 1
+
+
+def _encode80(value: int) -> str:
+    """Crockford base32 of an 80-bit integer (16 digits)."""
+    return "".join(_DIGIT_PAIRS[(value >> shift) & 0x3FF] for shift in range(70, -1, -10))
+
+
+class _MonotonicIds:
+    """ULID-style IDs: 48-bit millisecond time + 80-bit counter.
+
+    The counter starts at a random value each millisecond and increments
+    for every further ID in the same millisecond (or when the clock steps
+    back), so IDs are unique and strictly increasing within a process
+    without calling :mod:`uuid` or the OS random source per item.  Only
+    the last two digits change between consecutive IDs; the encoded time
+    and the counter's upper digits are reused until they change.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._prefix = ""
+        self._counter = 0
+
+    def __call__(self) -> str:
+        now_ms = time.time_ns() // 1_000_000
+        with self._lock:
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                # Top bit clear leaves room to increment without overflow.
+                self._counter = counter = int.from_bytes(os.urandom(10), "big") >> 1
+                # The last 10 digits of the 80-bit encoding are ULID's time field.
+                self._prefix = "cg-" + _encode80(now_ms)[6:] + _encode80(counter)[:14]
+            else:
+                self._counter = counter = (self._counter + 1) & _COUNTER_MASK
+                if not counter & 0x3FF:
+                    self._prefix = self._prefix[:13] + _encode80(counter)[:14]
+            return self._prefix + _DIGIT_PAIRS[counter & 0x3FF]
+
+
+#: Return a new ``cg-`` prefixed, time-ordered content ID.
+new_id = _MonotonicIds()
+
+
+def utc_now() -> str:
+    """Current UTC time as an ISO 8601 string (the dashboard's ``createdAt``)."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass(slots=True)
 class ContentItem:
-    """Single content piece — compatible with dashboard ContentItem schema."""
+    """Single content piece — compatible with dashboard ContentItem schema.
+
+    Slotted to keep catalogue-scale runs small.  Generators that create
+    several items at once pass one shared ``created_at`` (see
+    :func:`utc_now`) instead of reading the clock per item.
+    """
 
     title: str
     body: str
     content_type: ContentType
     status: ContentStatus = ContentStatus.DRAFT
     sku: Optional[str] = None
-    id: str = field(default_factory=lambda: f"cg-{uuid.uuid4().hex[:8]}")
-    created_at: str = field(
-        default_factory=lambda: datetime.now(timezone.utc).isoformat()
-    )
+    id: str = field(default_factory=new_id)
+    created_at: str = field(default_factory=utc_now)
 
     def to_dict(self) -> dict:
         return {
@@ -55,49 +121,132 @@ class ContentItem:
         }
 
 
-@dataclass
+# ---------------------------------------------------------------------------
+# Streaming serialisation
+# ---------------------------------------------------------------------------
+def iter_json_array(
+    records: Iterable[dict], indent: Optional[int] = 2, level: int = 0
+) -> Iterator[str]:
+    """Encode *records* as a JSON array, one record at a time.
+
+    ``"".join(iter_json_array(records, indent))`` equals
+    :func:`serialise.dumps(list(records), indent) <serialise.dumps>`, but
+    only one encoded record is held at a time.  *indent* is ``2`` or
+    *None* (compact); *level* is the nesting depth of the array when it
+    is embedded in a larger document.
+    """
+    if indent is None:
+        first = True
+        yield "["
+        for record in records:
+            if not first:
+                yield ","
+            first = False
+            yield serialise.dumps(record, indent=None)
+        yield "]"
+        return
+
+    outer = "\n" + " " * (indent * level)
+    inner = outer + " " * indent
+    first = True
+    for record in records:
+        yield ("[" if first else ",") + inner
+        first = False
+        yield serialise.dumps(record, indent=indent).replace("\n", inner)
+    yield "[]" if first else outer + "]"
+
+
+def write_json_array(
+    records: Iterable[dict], out: TextIO, indent: Optional[int] = 2
+) -> None:
+    """Stream :func:`iter_json_array` to *out*, followed by a newline."""
+    for chunk in iter_json_array(records, indent):
+        out.write(chunk)
+    out.write("\n")
+
+
+# ---------------------------------------------------------------------------
+# Product attribute extraction (patterns compiled once at import time)
+# ---------------------------------------------------------------------------
+_GPU_RE = re.compile(
+    r"(RTX\s*\d{4}\s*(?:Ti\s*)?(?:SUPER)?|"
+    r"RX\s*\d{4}\s*(?:XT(?:X)?)?|"
+    r"\d{4}\s*(?:Ti\s*)?(?:SUPER)?|"
+    r"A\d{3}|B\d{3}|"
+    r"VEGA\s*\d+)",
+    re.IGNORECASE,
+)
+_TIER_RE = re.compile(
+    r"\b(SE\d*|Pro|Max|Extreme|Individual|Ultra\d*)\b",
+    re.IGNORECASE,
+)
+
+
+def extract_attributes(name: str) -> tuple[Optional[str], Optional[str], Optional[str]]:
+    """Extract ``(gpu, tier, platform)`` from a product name.
+
+    Colour and variant rows of the same machine share a name, so a
+    small per-name cache avoids repeating the regex searches across
+    the catalogue.
+    """
+    return _extract_attributes_cached(name)
+
+
+@lru_cache(maxsize=16384)
+def _extract_attributes_cached(
+    name: str,
+) -> tuple[Optional[str], Optional[str], Optional[str]]:
+    gpu_match = _GPU_RE.search(name)
+    tier_match = _TIER_RE.search(name)
+    name_lower = name.lower()
+    if "amd" in name_lower:
+        platform: Optional[str] = "AMD"
+    elif "intel" in name_lower:
+        platform = "Intel"
+    else:
+        platform = None
+    return (
+        gpu_match.group(0).strip() if gpu_match else None,
+        tier_match.group(0) if tier_match else None,
+        platform,
+    )
+
+
+@dataclass(slots=True)
 class Product:
-    """Product record loaded from the HelloComp CSV catalogue."""
+    """Product record loaded from the HelloComp CSV catalogue.
+
+    Derived attributes (:attr:`gpu`, :attr:`tier`, :attr:`platform`) are
+    extracted lazily on first access and memoised together with the name
+    they were computed from, so reassigning :attr:`name` re-derives them.
+    """
 
     code: str
     name: str
     pair_code: Optional[str] = None
     xml_feed_name: Optional[str] = None
+    _derived: Optional[tuple] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def _attributes(self) -> tuple[Optional[str], Optional[str], Optional[str]]:
+        derived = self._derived
+        if derived is None or derived[0] is not self.name:
+            derived = (self.name, *extract_attributes(self.name))
+            self._derived = derived
+        return derived[1:]
 
     @property
     def gpu(self) -> Optional[str]:
         """Extract GPU model from product name (e.g. 'RTX 5080')."""
-        import re
-
-        match = re.search(
-            r"(RTX\s*\d{4}\s*(?:Ti\s*)?(?:SUPER)?|"
-            r"RX\s*\d{4}\s*(?:XT(?:X)?)?|"
-            r"\d{4}\s*(?:Ti\s*)?(?:SUPER)?|"
-            r"A\d{3}|B\d{3}|"
-            r"VEGA\s*\d+)",
-            self.name,
-            re.IGNORECASE,
-        )
-        return match.group(0).strip() if match else None
+        return self._attributes()[0]
 
     @property
     def tier(self) -> Optional[str]:
         """Extract product tier (SE, Pro, Max, Extreme, Individual, Ultra)."""
-        import re
-
-        match = re.search(
-            r"\b(SE\d*|Pro|Max|Extreme|Individual|Ultra\d*)\b",
-            self.name,
-            re.IGNORECASE,
-        )
-        return match.group(0) if match else None
+        return self._attributes()[1]
 
     @property
     def platform(self) -> Optional[str]:
         """Extract platform (AMD or Intel) from product name."""
-        name_lower = self.name.lower()
-        if "amd" in name_lower:
-            return "AMD"
-        if "intel" in name_lower:
-            return "Intel"
-        return None
+        return self._attributes()[2]
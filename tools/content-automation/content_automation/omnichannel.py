@@ -8,11 +8,29 @@ an API key is available; otherwise falls back to deterministic templates.
 from __future__ import annotations
 
 import json
+import logging
 import os
-from dataclasses import dataclass
-from typing import Optional
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, TextIO
 
-from .models import ContentItem, ContentStatus, ContentType
+from . import gemini
+from . import metrics as m
+from . import templates
+from .batch import DEFAULT_AUDIENCES, iter_catalog_gpus, run_bounded, write_ndjson
+from .json_stream import iter_values
+from .models import (
+    ContentItem,
+    ContentStatus,
+    ContentType,
+    iter_json_array,
+    utc_now,
+    write_json_array,
+)
+
+logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
 # HelloComp brand voice (shared system instruction)
@@ -33,37 +51,54 @@ class OmnichannelResult:
     tiktok: str
     instagram: str
     facebook: str
+    metrics: m.Metrics = field(
+        default_factory=lambda: m.Metrics("omnichannel"), repr=False, compare=False
+    )
 
     def to_content_items(self) -> list[ContentItem]:
         """Convert results into dashboard-compatible ContentItem list."""
+        created_at = utc_now()
         return [
             ContentItem(
                 title=f"TikTok post — {self.gpu}",
                 body=self.tiktok,
                 content_type=ContentType.SOCIAL_POST,
                 status=ContentStatus.DRAFT,
+                created_at=created_at,
             ),
             ContentItem(
                 title=f"Instagram post — {self.gpu}",
                 body=self.instagram,
                 content_type=ContentType.SOCIAL_POST,
                 status=ContentStatus.DRAFT,
+                created_at=created_at,
             ),
             ContentItem(
                 title=f"Facebook post — {self.gpu}",
                 body=self.facebook,
                 content_type=ContentType.SOCIAL_POST,
                 status=ContentStatus.DRAFT,
+                created_at=created_at,
             ),
         ]
 
-    def to_json(self, indent: int = 2) -> str:
-        return json.dumps(
-            [item.to_dict() for item in self.to_content_items()],
-            ensure_ascii=False,
-            indent=indent,
+    def iter_json(self, indent: Optional[int] = 2) -> Iterator[str]:
+        """Encode the ContentItems as a JSON array, item by item."""
+        return iter_json_array(
+            (item.to_dict() for item in self.to_content_items()), indent
         )
 
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        with self.metrics.span(m.SERIALISE):
+            return "".join(self.iter_json(indent))
+
+    def write_json(self, out: TextIO, indent: Optional[int] = 2) -> None:
+        """Stream :meth:`to_json` to *out* without building the whole string."""
+        with self.metrics.span(m.SERIALISE):
+            write_json_array(
+                (item.to_dict() for item in self.to_content_items()), out, indent
+            )
+
 
 # ---------------------------------------------------------------------------
 # Template-based fallback (no API key required)
@@ -90,37 +125,38 @@ _FACEBOOK_TEMPLATE = (
 )
 
 
-def _gpu_tag(gpu: str) -> str:
-    """Convert GPU name to a social-media-friendly hashtag (no spaces/special chars)."""
-    return gpu.replace(" ", "").replace("-", "")
+# Compiled once; ``{gpu_tag}`` is :func:`content_automation.templates.gpu_tag`.
+_TEMPLATES = templates.REGISTRY.register(
+    "omnichannel",
+    {
+        "tiktok": _TIKTOK_TEMPLATE,
+        "instagram": _INSTAGRAM_TEMPLATE,
+        "facebook": _FACEBOOK_TEMPLATE,
+    },
+)
 
 
 def _generate_from_templates(gpu: str, target_audience: str) -> OmnichannelResult:
-    tag = _gpu_tag(gpu)
     return OmnichannelResult(
-        gpu=gpu,
-        target_audience=target_audience,
-        tiktok=_TIKTOK_TEMPLATE.format(gpu=gpu, audience=target_audience, gpu_tag=tag),
-        instagram=_INSTAGRAM_TEMPLATE.format(
-            gpu=gpu, audience=target_audience, gpu_tag=tag
-        ),
-        facebook=_FACEBOOK_TEMPLATE.format(gpu=gpu, audience=target_audience),
+        gpu=gpu, target_audience=target_audience, **_TEMPLATES.render(gpu, target_audience)
     )
 
 
+def distribute_offline(pairs: Iterable[tuple[str, str]]) -> list[OmnichannelResult]:
+    """Template results for many ``(gpu, audience)`` pairs in one pass, in input order."""
+    pairs = list(pairs)
+    copies = _TEMPLATES.render_batch((gpu, audience, "") for gpu, audience in pairs)
+    return [
+        OmnichannelResult(gpu=gpu, target_audience=audience, **copy)
+        for (gpu, audience), copy in zip(pairs, copies)
+    ]
+
+
 # ---------------------------------------------------------------------------
 # Google Gemini–powered generation
 # ---------------------------------------------------------------------------
-def _generate_with_gemini(
-    gpu: str, target_audience: str, api_key: str
-) -> OmnichannelResult:
-    """Call Google Gemini to generate platform-specific social posts."""
-    from google import genai
-    from google.genai import types
-
-    client = genai.Client(api_key=api_key)
-
-    user_prompt = (
+def _build_prompt(gpu: str, target_audience: str) -> str:
+    return (
         f"GPU: {gpu}\n"
         f"Cílovka: {target_audience}\n\n"
         "Vygeneruj platformně specifické posty pro:\n"
@@ -131,19 +167,25 @@ def _generate_with_gemini(
         '{"tiktok": "…", "instagram": "…", "facebook": "…"}'
     )
 
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=user_prompt,
-        config=types.GenerateContentConfig(
-            system_instruction=SYSTEM_PROMPT,
-            temperature=0.8,
-            max_output_tokens=1024,
-            response_mime_type="application/json",
-        ),
-    )
 
-    raw = response.text or "{}"
-    data = json.loads(raw)
+def _generate_with_gemini(
+    gpu: str, target_audience: str, api_key: str, metrics: m.Metrics
+) -> OmnichannelResult:
+    """Call Google Gemini to generate platform-specific social posts."""
+    with metrics.span(m.PROMPT_BUILD):
+        user_prompt = _build_prompt(gpu, target_audience)
+
+    raw = gemini.generate_content(
+        user_prompt,
+        api_key,
+        system_instruction=SYSTEM_PROMPT,
+        temperature=0.8,
+        max_output_tokens=1024,
+        response_mime_type="application/json",
+        metrics=metrics,
+    ) or "{}"
+    with metrics.span(m.JSON_PARSE):
+        data = json.loads(raw)
 
     return OmnichannelResult(
         gpu=gpu,
@@ -151,6 +193,7 @@ def _generate_with_gemini(
         tiktok=data.get("tiktok", ""),
         instagram=data.get("instagram", ""),
         facebook=data.get("facebook", ""),
+        metrics=metrics,
     )
 
 
@@ -173,14 +216,223 @@ def distribute(
     api_key:
         Google Gemini API key.  Falls back to ``GEMINI_API_KEY`` env var.
         When no key is available the generator uses built-in templates.
+
+    The returned result carries a :class:`~content_automation.metrics.Metrics`
+    with the stage timings, cache hits and any API error that caused a
+    template fallback.
     """
     key = api_key or os.environ.get("GEMINI_API_KEY")
+    metrics = m.Metrics("omnichannel")
 
     if key:
         try:
-            return _generate_with_gemini(gpu, target_audience, key)
-        except Exception:
+            return _generate_with_gemini(gpu, target_audience, key, metrics)
+        except Exception as exc:
             # Graceful degradation — fall back to templates on any API error.
-            pass
+            metrics.record_error(exc)
+            logger.warning("Gemini failed for %s / %s, using templates: %s", gpu, target_audience, exc)
+
+    metrics.incr(m.FALLBACKS)
+    with metrics.span(m.FALLBACK):
+        result = _generate_from_templates(gpu, target_audience)
+    result.metrics = metrics
+    return result
+
+
+_PLATFORMS = ("tiktok", "instagram", "facebook")
+
+
+def distribute_stream(
+    gpu: str,
+    target_audience: str,
+    api_key: Optional[str] = None,
+    on_field: Optional[Callable[[str, str], None]] = None,
+) -> OmnichannelResult:
+    """Like :func:`distribute`, but report each post as soon as it is complete.
+
+    *on_field* is called with ``(platform, text)`` for ``"tiktok"``,
+    ``"instagram"`` and ``"facebook"`` as each value closes in the
+    streamed response.  When the stream fails partway through, posts
+    already received are kept and only the missing ones come from
+    templates (and are reported the same way).
+    """
+    key = api_key or os.environ.get("GEMINI_API_KEY")
+    metrics = m.Metrics("omnichannel")
+    streamed = False
+    posts: dict[str, str] = {}
+
+    if key:
+        try:
+            with metrics.span(m.PROMPT_BUILD):
+                user_prompt = _build_prompt(gpu, target_audience)
+            chunks = gemini.stream_content(
+                user_prompt,
+                key,
+                system_instruction=SYSTEM_PROMPT,
+                temperature=0.8,
+                max_output_tokens=1024,
+                response_mime_type="application/json",
+                metrics=metrics,
+            )
+            for path, value in iter_values(chunks):
+                if len(path) == 1 and path[0] in _PLATFORMS and isinstance(value, str):
+                    posts[path[0]] = value
+                    if on_field is not None:
+                        on_field(path[0], value)
+            streamed = True
+        except Exception as exc:
+            metrics.record_error(exc)
+            logger.warning("Gemini stream failed for %s / %s, using templates: %s", gpu, target_audience, exc)
+
+    if not streamed:
+        metrics.incr(m.FALLBACKS)
+        with metrics.span(m.FALLBACK):
+            template = _generate_from_templates(gpu, target_audience)
+        for platform in _PLATFORMS:
+            if platform not in posts:
+                posts[platform] = getattr(template, platform)
+                if on_field is not None:
+                    on_field(platform, posts[platform])
+
+    return OmnichannelResult(
+        gpu=gpu,
+        target_audience=target_audience,
+        tiktok=posts.get("tiktok", ""),
+        instagram=posts.get("instagram", ""),
+        facebook=posts.get("facebook", ""),
+        metrics=metrics,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Catalogue-wide distribution
+# ---------------------------------------------------------------------------
+# Pairs rendered per compiled-template batch in offline mode.
+_OFFLINE_CHUNK = 512
+
+
+@dataclass
+class CatalogReport:
+    """Totals of a :func:`distribute_catalog` run."""
+
+    pairs: int
+    items: int
+    seconds: float
+    metrics: m.Metrics = field(
+        default_factory=lambda: m.Metrics("omnichannel"), repr=False, compare=False
+    )
+
+    @property
+    def pairs_per_second(self) -> float:
+        return self.pairs / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "pairs": self.pairs,
+            "items": self.items,
+            "seconds": round(self.seconds, 6),
+            "pairsPerSecond": round(self.pairs_per_second, 1),
+            "itemsPerSecond": round(self.items_per_second, 1),
+            "fallbacks": self.metrics.counter(m.FALLBACKS),
+            "apiErrors": self.metrics.counter(m.API_ERRORS),
+        }
+
+
+def _distribute_offline_chunks(
+    pairs: Iterable[tuple[str, str]], metrics: m.Metrics
+) -> Iterator[OmnichannelResult]:
+    pairs = iter(pairs)
+    while chunk := list(islice(pairs, _OFFLINE_CHUNK)):
+        metrics.incr(m.FALLBACKS, len(chunk))
+        with metrics.span(m.FALLBACK):
+            results = distribute_offline(chunk)
+        yield from results
+
+
+def distribute_catalog(
+    out: TextIO,
+    csv_path: Optional[Path] = None,
+    audiences: Iterable[str] = DEFAULT_AUDIENCES,
+    api_key: Optional[str] = None,
+    max_workers: int = 8,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> CatalogReport:
+    """Write social posts for every GAMER PC GPU × audience to *out* as JSONL.
+
+    Every distinct GPU of the catalogue's GAMER PCs is paired with every
+    persona in *audiences* (see :func:`content_automation.batch.catalog_pairs`).
+    Each pair yields the three dashboard ``ContentItem`` records of
+    :meth:`OmnichannelResult.to_content_items`, one compact JSON object
+    per line, flushed as soon as the pair is done.  Every record carries
+    the pair as ``gpu`` and ``targetAudience`` fields.
+
+    Parameters
+    ----------
+    out:
+        Text stream receiving the JSONL records.
+    csv_path:
+        Product CSV; defaults to the bundled catalogue.
+    audiences:
+        Target personas; each GPU is distributed once per persona.
+    api_key:
+        Google Gemini API key, as for :func:`distribute`.  With a key, up
+        to *max_workers* pairs are generated in parallel and any failed
+        pair falls back to templates.  Without one, the compiled templates
+        render the pairs in batches.
+    max_workers:
+        Maximum number of Gemini generations in flight at once.
+    on_progress:
+        Called as ``on_progress(done, total)`` after each pair is written.
+
+    Returns
+    -------
+    CatalogReport
+        Pair and item counts, wall time, throughput and the merged metrics.
+        Only a bounded window of results is held in memory at any time.
+
+    Raises
+    ------
+    ValueError
+        *max_workers* is less than 1.
+    """
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+    key = api_key or os.environ.get("GEMINI_API_KEY")
+    audiences = tuple(audiences)
+    report = CatalogReport(pairs=0, items=0, seconds=0.0)
+    start = time.perf_counter()
+
+    gpus = list(iter_catalog_gpus(csv_path))
+    total = len(gpus) * len(audiences)
+    pairs = ((gpu, audience) for gpu in gpus for audience in audiences)
+    if key:
+        results = (
+            result
+            for _, result in run_bounded(
+                lambda pair: distribute(pair[0], pair[1], api_key=key),
+                pairs,
+                max_workers=max_workers,
+            )
+        )
+    else:
+        results = _distribute_offline_chunks(pairs, report.metrics)
+
+    def _records() -> Iterator[dict]:
+        for result in results:
+            report.metrics.merge(result.metrics)
+            with report.metrics.span(m.SERIALISE):
+                pair = {"gpu": result.gpu, "targetAudience": result.target_audience}
+                records = [{**pair, **item.to_dict()} for item in result.to_content_items()]
+            yield from records
+            report.pairs += 1
+            report.items += len(records)
+            if on_progress is not None:
+                on_progress(report.pairs, total)
 
-    return _generate_from_templates(gpu, target_audience)
+    write_ndjson(_records(), out)
+    report.seconds = time.perf_counter() - start
+    return report
@@ -0,0 +1,350 @@
+"""Adaptive client-side rate limiting for Gemini calls.
+
+Every Gemini request made through :func:`gemini.generate_content` passes
+through a process-wide :class:`RateLimiter`.  Per model it keeps
+
+* two token buckets — requests per minute (RPM) and tokens per minute
+  (TPM, estimated from the prompt and corrected from the response's usage
+  metadata when available), and
+* an AIMD concurrency limit: every successful call raises the number of
+  calls allowed in flight by ``1 / limit`` (about one per "window"), every
+  quota rejection halves it.
+
+Rejected calls (HTTP 429 and transient 5xx) are retried with full-jitter
+exponential backoff, so bulk runs converge on the highest rate the quota
+allows instead of falling back to template copy.
+
+Budgets default to :data:`DEFAULT_LIMITS` and can be overridden with the
+``GEMINI_RPM`` / ``GEMINI_TPM`` / ``GEMINI_MAX_RETRIES`` environment
+variables or :meth:`RateLimiter.set_limits`.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+
+@dataclass(frozen=True)
+class ModelLimits:
+    """Per-model quota: requests and tokens per minute."""
+
+    rpm: int
+    tpm: int
+
+
+#: Conservative paid-tier budgets; unknown models use :data:`FALLBACK_LIMITS`.
+DEFAULT_LIMITS: dict[str, ModelLimits] = {
+    "gemini-2.5-flash": ModelLimits(rpm=1_000, tpm=1_000_000),
+    "gemini-2.0-flash": ModelLimits(rpm=2_000, tpm=4_000_000),
+}
+FALLBACK_LIMITS = ModelLimits(rpm=300, tpm=500_000)
+
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 30.0
+
+#: HTTP status codes worth retrying (quota + transient server errors).
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+THROTTLE_STATUS = 429
+
+
+def error_status(exc: BaseException) -> Optional[int]:
+    """Best-effort HTTP status of an SDK exception (``google.genai.errors``
+    carries it as ``code``; other clients use ``status_code``)."""
+    for attr in ("code", "status_code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    text = str(exc)
+    if "RESOURCE_EXHAUSTED" in text or "429" in text.split(" ", 1)[0]:
+        return THROTTLE_STATUS
+    return None
+
+
+def estimate_tokens(*texts: Optional[str]) -> int:
+    """Rough token count (≈ 4 characters per token) for TPM budgeting."""
+    return sum(len(t) for t in texts if t) // 4 + 1
+
+
+# ---------------------------------------------------------------------------
+# Primitives
+# ---------------------------------------------------------------------------
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at *per_minute*.
+
+    The bucket starts full with *per_minute* tokens.  :meth:`charge` may
+    push it below zero (e.g. when actual usage exceeds the estimate); later
+    acquisitions then wait until the debt is refilled.
+    """
+
+    def __init__(
+        self,
+        per_minute: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Take *amount* tokens, blocking until available; return seconds waited."""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+    def charge(self, amount: float) -> None:
+        """Adjust the balance by *amount* without waiting (negative refunds)."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - amount)
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on the number of calls in flight.
+
+    Parameters
+    ----------
+    initial, minimum, maximum:
+        Starting, lowest and highest concurrency limit.
+    cooldown:
+        Seconds after a decrease during which further throttles are
+        ignored, so one burst of 429s halves the limit only once.
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        minimum: int = 1,
+        maximum: int = 32,
+        cooldown: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.cooldown = cooldown
+        self._limit = float(max(minimum, min(initial, maximum)))
+        self._in_flight = 0
+        self._clock = clock
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self) -> None:
+        """Additive increase: about +1 per ``limit`` successful calls."""
+        with self._cond:
+            self._limit = min(self.maximum, self._limit + 1.0 / self._limit)
+            self._cond.notify_all()
+
+    def on_throttle(self) -> None:
+        """Multiplicative decrease (at most once per cooldown)."""
+        with self._cond:
+            now = self._clock()
+            if now - self._last_decrease >= self.cooldown:
+                self._limit = max(float(self.minimum), self._limit / 2)
+                self._last_decrease = now
+
+
+class ModelLimiter:
+    """RPM / TPM buckets plus the adaptive concurrency limit of one model."""
+
+    def __init__(
+        self,
+        limits: ModelLimits,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        max_concurrency: int = 32,
+    ) -> None:
+        self.limits = limits
+        self.requests = TokenBucket(limits.rpm, clock=clock, sleep=sleep)
+        self.tokens = TokenBucket(limits.tpm, clock=clock, sleep=sleep)
+        self.concurrency = AdaptiveConcurrency(maximum=max_concurrency, clock=clock)
+
+    @contextmanager
+    def slot(self, estimated_tokens: int) -> Iterator[None]:
+        """Wait for an in-flight slot and RPM/TPM budget, then hold the slot."""
+        self.concurrency.acquire()
+        try:
+            self.requests.acquire(1)
+            self.tokens.acquire(estimated_tokens)
+            yield
+        finally:
+            self.concurrency.release()
+
+
+# ---------------------------------------------------------------------------
+# Process-wide limiter
+# ---------------------------------------------------------------------------
+class RateLimiter:
+    """Shared per-model limiter with jittered exponential-backoff retries.
+
+    Parameters
+    ----------
+    limits:
+        Per-model budgets (defaults to :data:`DEFAULT_LIMITS`, with the
+        ``GEMINI_RPM`` / ``GEMINI_TPM`` env variables applied to all models).
+    max_retries:
+        Retries after the first attempt for retryable errors.
+    base_delay, max_delay:
+        Backoff bounds in seconds; attempt *n* sleeps a uniformly random
+        time in ``[0, min(max_delay, base_delay * 2**n)]``.
+    clock, sleep, rng:
+        Injectable for tests.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[dict[str, ModelLimits]] = None,
+        max_retries: Optional[int] = None,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_concurrency: int = 32,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self._limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self._override = _env_override()
+        if max_retries is None:
+            max_retries = int(os.environ.get("GEMINI_MAX_RETRIES", DEFAULT_MAX_RETRIES))
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_concurrency = max_concurrency
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._models: dict[str, ModelLimiter] = {}
+        self._lock = threading.Lock()
+
+    def limits_for(self, model: str) -> ModelLimits:
+        base = self._limits.get(model, FALLBACK_LIMITS)
+        rpm, tpm = self._override
+        return ModelLimits(rpm=rpm or base.rpm, tpm=tpm or base.tpm)
+
+    def set_limits(self, model: str, rpm: int, tpm: int) -> None:
+        """Set the budget for *model* (resets its buckets)."""
+        with self._lock:
+            self._limits[model] = ModelLimits(rpm=rpm, tpm=tpm)
+            self._models.pop(model, None)
+
+    def for_model(self, model: str) -> ModelLimiter:
+        limiter = self._models.get(model)
+        if limiter is None:
+            with self._lock:
+                limiter = self._models.get(model)
+                if limiter is None:
+                    limiter = ModelLimiter(
+                        self.limits_for(model),
+                        clock=self._clock,
+                        sleep=self._sleep,
+                        max_concurrency=self.max_concurrency,
+                    )
+                    self._models[model] = limiter
+        return limiter
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay before retry number *attempt* (0-based)."""
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def call(
+        self,
+        model: str,
+        fn: Callable[[], object],
+        estimated_tokens: int,
+        on_retry: Optional[Callable[[BaseException, int], None]] = None,
+    ):
+        """Run *fn* within *model*'s budget, retrying quota/transient errors.
+
+        Parameters
+        ----------
+        fn:
+            Zero-argument API call.  If its result has
+            ``usage_metadata.total_token_count`` the TPM bucket is corrected
+            to the actual usage.
+        estimated_tokens:
+            Tokens charged against TPM before the call.
+        on_retry:
+            Called with the exception and the HTTP status before each retry.
+
+        The last error is re-raised when retries are exhausted or the error
+        is not retryable.
+        """
+        limiter = self.for_model(model)
+        attempt = 0
+        while True:
+            with limiter.slot(estimated_tokens):
+                try:
+                    result = fn()
+                except Exception as exc:
+                    status = error_status(exc)
+                    if status == THROTTLE_STATUS:
+                        limiter.concurrency.on_throttle()
+                    if status not in RETRYABLE_STATUS or attempt >= self.max_retries:
+                        raise
+                    error = exc
+                else:
+                    limiter.concurrency.on_success()
+                    usage = getattr(getattr(result, "usage_metadata", None), "total_token_count", None)
+                    if isinstance(usage, int):
+                        limiter.tokens.charge(usage - min(estimated_tokens, limiter.tokens.capacity))
+                    return result
+            if on_retry is not None:
+                on_retry(error, status)
+            self._sleep(self.backoff(attempt))
+            attempt += 1
+
+
+def _env_override() -> tuple[Optional[int], Optional[int]]:
+    def _int(name: str) -> Optional[int]:
+        value = os.environ.get(name)
+        return int(value) if value and value.isdigit() and int(value) > 0 else None
+
+    return _int("GEMINI_RPM"), _int("GEMINI_TPM")
@@ -0,0 +1,271 @@
+"""Fuzzy product lookup for free-form ``--product`` arguments.
+
+:class:`ProductResolver` turns what a marketer types — a product code, a
+partial name, a name without diacritics or with a typo — into a
+:class:`Product`.  Everything is indexed once up front:
+
+* codes, case-insensitively, for an exact O(1) hit;
+* diacritic-folded name and ``xml_feed_name`` tokens → product ids;
+* trigrams of the token *vocabulary* (not of every product), so a fuzzy
+  term is matched against a few thousand distinct tokens at most.
+
+Product ids are assigned in rank order — names with fewer tokens first,
+then catalogue order — so among equally scored candidates the smallest id
+is the best match: posting lists are already sorted best first.  A typical lookup on a
+10k-product catalogue takes well under a millisecond.
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+import unicodedata
+from collections import defaultdict
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+from .models import Product
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+#: Minimum trigram (Dice) similarity for a fuzzy term match.
+FUZZY_MIN = 0.5
+#: Vocabulary tokens kept per fuzzy query term.
+FUZZY_LIMIT = 3
+#: Minimum :meth:`ProductResolver.search` score accepted by :meth:`resolve`.
+RESOLVE_MIN = 0.6
+
+#: Query tokens considered by :meth:`ProductResolver.search`; the rest are ignored.
+MAX_TERMS = 24
+
+# Entries of the rarest posting list probed before intersecting whole sets.
+_PROBE = 64
+# Term combinations walked before the remaining products are scored directly.
+_MAX_COMBOS = 32
+
+
+def fold(text: str) -> str:
+    """Lower-case *text* and strip diacritics (``"Dárkový"`` → ``"darkovy"``)."""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def tokens(text: Optional[str]) -> list[str]:
+    """Folded alphanumeric tokens of *text*, duplicates removed, in order."""
+    if not text:
+        return []
+    return list(dict.fromkeys(_TOKEN_RE.findall(fold(text))))
+
+
+def trigrams(token: str) -> set[str]:
+    """Padded trigrams of *token* (``"gpu"`` → ``{"  g", " gp", "gpu", "pu "}``)."""
+    padded = f"  {token} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class ProductResolver:
+    """Prebuilt lookup index over product codes, names and feed names.
+
+    Parameters
+    ----------
+    products:
+        Product records in catalogue order.
+    """
+
+    __slots__ = (
+        "_products",
+        "_by_code",
+        "_vocab",
+        "_postings",
+        "_posting_sets",
+        "_by_trigram",
+        "_trigram_counts",
+    )
+
+    def __init__(self, products: Iterable[Product]) -> None:
+        entries = []
+        for position, product in enumerate(products):
+            name_tokens = tokens(product.name)
+            entries.append(
+                (len(name_tokens), position, product, name_tokens + tokens(product.xml_feed_name))
+            )
+        entries.sort(key=lambda entry: entry[:2])
+
+        self._products: tuple[Product, ...] = tuple(entry[2] for entry in entries)
+        self._by_code: dict[str, int] = {}
+        self._vocab: dict[str, int] = {}
+        postings: list[list[int]] = []
+        for pid, (_, _, product, product_tokens) in enumerate(entries):
+            if product.code:
+                self._by_code.setdefault(product.code.strip().casefold(), pid)
+            for token in product_tokens:
+                vid = self._vocab.get(token)
+                if vid is None:
+                    vid = self._vocab[token] = len(postings)
+                    postings.append([])
+                if not postings[vid] or postings[vid][-1] != pid:
+                    postings[vid].append(pid)
+        # Ascending ids (= best first) for walking, sets for membership tests.
+        self._postings: tuple[tuple[int, ...], ...] = tuple(tuple(p) for p in postings)
+        self._posting_sets: tuple[frozenset[int], ...] = tuple(frozenset(p) for p in postings)
+
+        self._by_trigram: dict[str, list[int]] = defaultdict(list)
+        self._trigram_counts: list[int] = []
+        for token, vid in self._vocab.items():
+            grams = trigrams(token)
+            self._trigram_counts.append(len(grams))
+            for gram in grams:
+                self._by_trigram[gram].append(vid)
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def by_code(self, code: str) -> Optional[Product]:
+        """Return the product with exactly this *code* (case-insensitive)."""
+        pid = self._by_code.get(code.strip().casefold())
+        return self._products[pid] if pid is not None else None
+
+    def _term_matches(self, term: str) -> list[tuple[float, int]]:
+        """``(weight, vocabulary id)`` of tokens matching *term*, best first."""
+        vid = self._vocab.get(term)
+        if vid is not None:
+            return [(1.0, vid)]
+        # Numbers (GPU models, capacities) must match exactly: "5080" is not "5090".
+        if len(term) < 3 or term.isdigit():
+            return []
+        grams = trigrams(term)
+        shared: dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for candidate in self._by_trigram.get(gram, ()):
+                shared[candidate] += 1
+        counts = self._trigram_counts
+        scored = [
+            (2 * n / (len(grams) + counts[candidate]), candidate)
+            for candidate, n in shared.items()
+        ]
+        best = heapq.nlargest(FUZZY_LIMIT, scored)
+        return [
+            (round(similarity, 3), candidate)
+            for similarity, candidate in best
+            if similarity >= FUZZY_MIN
+        ]
+
+    def search(self, query: str, limit: int = 5) -> list[tuple[float, Product]]:
+        """Return up to *limit* ``(score, product)`` matches for *query*, best first.
+
+        An exact code match scores ``1.0`` and is returned alone.  Otherwise
+        each query token contributes its best token similarity (``1.0`` for
+        an exact token) and the score is their mean.  Products matching every
+        recognised token are preferred; when none does, partial matches are
+        ranked.  Only the first :data:`MAX_TERMS` tokens are used, and long
+        queries cost at most a bounded walk plus one pass over the postings
+        of their matching tokens.
+        """
+        query = query.strip()
+        if not query or limit <= 0:
+            return []
+        pid = self._by_code.get(query.casefold())
+        if pid is not None:
+            return [(1.0, self._products[pid])]
+
+        terms = tokens(query)[:MAX_TERMS]
+        options = [m + [(0.0, None)] for m in map(self._term_matches, terms) if m]
+        if not options:
+            return []
+        # Each combination picks one matching token (or none) per term; its
+        # products are the intersection of the picked posting sets.  Walking
+        # combinations from the highest score down, every product is first
+        # seen at its best score, so we can stop once *limit* are found.
+        combos = self._combinations(options)
+        found: list[tuple[float, Product]] = []
+        seen: set[int] = set()
+        for combo in islice(combos, _MAX_COMBOS):
+            for pid in self._combo_products(combo, limit - len(found), len(seen)):
+                if pid not in seen:
+                    seen.add(pid)
+                    score = round(sum(w for w, _ in combo) / len(terms), 3)
+                    found.append((score, self._products[pid]))
+                    if len(found) == limit:
+                        return found
+        if next(combos, None) is None:
+            return found
+        # Long queries whose words match different products: score the rest
+        # directly.  No unseen product scores above the combinations walked.
+        for score, pid in self._scored(options, len(terms), limit - len(found), seen):
+            found.append((score, self._products[pid]))
+        return found
+
+    @staticmethod
+    def _combinations(options: list[list[tuple[float, Optional[int]]]]) -> Iterator[tuple]:
+        """Yield one option per term, combinations with the highest total weight first.
+
+        Options are sorted best first, so a combination's successors (one
+        index moved one step down) never score higher.  Each combination has
+        a single parent — the one with its last non-zero index decremented —
+        so it is pushed once; only as many are built as the caller consumes.
+        """
+        def total(idx: tuple[int, ...]) -> float:
+            return sum(options[t][i][0] for t, i in enumerate(idx))
+
+        start = (0,) * len(options)
+        heap = [(-total(start), start, 0)]
+        while heap:
+            _, idx, last = heapq.heappop(heap)
+            yield tuple(options[t][i] for t, i in enumerate(idx))
+            for t in range(last, len(idx)):
+                if idx[t] + 1 < len(options[t]):
+                    nxt = idx[:t] + (idx[t] + 1,) + idx[t + 1 :]
+                    heapq.heappush(heap, (-total(nxt), nxt, t))
+
+    def _combo_products(self, combo: tuple, need: int, seen: int) -> Iterable[int]:
+        """Product ids in every posting list picked by *combo*, best first."""
+        sets = self._posting_sets
+        vids = sorted((vid for _, vid in combo if vid is not None), key=lambda v: len(sets[v]))
+        if not vids:
+            return ()
+        postings = self._postings[vids[0]]
+        if len(vids) == 1:
+            return postings
+        others = [sets[v] for v in vids[1:]]
+        # Dense matches show up early in the rarest posting list;
+        # only sparse ones pay for a full set intersection.
+        head = [p for p in postings[:_PROBE] if all(p in o for o in others)]
+        if len(head) >= need + seen or len(postings) <= _PROBE:
+            return head
+        return sorted(sets[vids[0]].intersection(*others))
+
+    def _scored(
+        self, options: list, n_terms: int, limit: int, exclude: set[int]
+    ) -> list[tuple[float, int]]:
+        """Best *limit* ``(score, id)`` outside *exclude*, scored from the postings.
+
+        A product's score is the sum, over terms, of its best matching
+        option — the same score as its best combination.
+        """
+        totals: dict[int, float] = {}
+        for term_options in options:
+            term_best: dict[int, float] = {}
+            for weight, vid in term_options:
+                if vid is None:
+                    continue
+                for pid in self._postings[vid]:
+                    if weight > term_best.get(pid, 0.0):
+                        term_best[pid] = weight
+            for pid, weight in term_best.items():
+                totals[pid] = totals.get(pid, 0.0) + weight
+        for pid in exclude:
+            totals.pop(pid, None)
+        best = heapq.nsmallest(limit, totals, key=lambda pid: (-totals[pid], pid))
+        return [(round(totals[pid] / n_terms, 3), pid) for pid in best]
+
+    def resolve(self, query: str, min_score: float = RESOLVE_MIN) -> Optional[Product]:
+        """Return the best match for *query*, or *None* when nothing scores *min_score*."""
+        found = self.search(query, limit=1)
+        if found and found[0][0] >= min_score:
+            return found[0][1]
+        return None
@@ -0,0 +1,195 @@
+"""Persistent, content-addressed cache for LLM generations.
+
+Responses are stored in a small SQLite database keyed by a SHA-256 hash of
+the model, system instruction, prompt and generation config, so re-running
+``hookmaster "RTX 5080" "hráč Warzone"`` with the same inputs is answered
+locally instead of by a new paid Gemini call.
+
+Entries expire after a TTL and the table is bounded by size with
+least-recently-used eviction.  SQLite's WAL journal and busy timeout make
+the cache safe to share between threads and concurrently running CLI
+processes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 10_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def default_cache_path() -> Path:
+    """Return the cache location (``GEMINI_CACHE_PATH`` or the XDG cache dir)."""
+    override = os.environ.get("GEMINI_CACHE_PATH")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "hellocomp-content-automation" / "gemini-responses.sqlite3"
+
+
+def cache_key(
+    model: str,
+    system_instruction: Optional[str],
+    prompt: str,
+    config: Optional[dict[str, Any]] = None,
+) -> str:
+    """Return the content address for one generation request."""
+    payload = json.dumps(
+        {
+            "model": model,
+            "system_instruction": system_instruction,
+            "prompt": prompt,
+            "config": config or {},
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response cache with TTL and LRU size bound.
+
+    Parameters
+    ----------
+    path:
+        Database file.  Defaults to :func:`default_cache_path`.
+    ttl_seconds:
+        Entries older than this are treated as misses and purged.
+    max_entries:
+        Upper bound on stored entries; the least recently used are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.path = Path(path or default_cache_path())
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Connection handling
+    # ------------------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection (SQLite connections are per thread)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _bump(self, conn: sqlite3.Connection, name: str) -> None:
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for *key*, or *None* on a miss."""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] <= self.ttl_seconds:
+                conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                self._bump(conn, "hits")
+                with self._lock:
+                    self.hits += 1
+                return row[0]
+            if row is not None:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._bump(conn, "misses")
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: str) -> None:
+        """Store *value* under *key*, evicting expired and LRU entries."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            conn.execute(
+                "DELETE FROM responses WHERE created_at < ?",
+                (now - self.ttl_seconds,),
+            )
+            (count,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            excess = count - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                    (excess,),
+                )
+
+    def delete(self, key: str) -> None:
+        """Remove *key* from the cache (no-op when absent)."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Remove every entry and reset the persistent counters."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+            conn.execute("DELETE FROM counters")
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            (count,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return count
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters for this process and across all processes."""
+        with self._connect() as conn:
+            totals = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "totalHits": totals.get("hits", 0),
+            "totalMisses": totals.get("misses", 0),
+            "entries": len(self),
+        }
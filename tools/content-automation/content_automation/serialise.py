@@ -0,0 +1,67 @@
+"""JSON encoding for machine-readable output.
+
+All ``--json`` output, the Loot-Box pages and the NDJSON batch streams go
+through :func:`dumps`.  It uses `orjson <https://github.com/ijl/orjson>`_
+when that package is installed — several times faster than the stdlib
+encoder — and falls back to :mod:`json` otherwise.  Set
+``CONTENT_AUTOMATION_JSON=json`` to force the stdlib encoder.
+
+Two layouts are supported:
+
+* ``indent=2`` — the human-readable default;
+* ``indent=None`` — compact: no whitespace at all (``","`` / ``":"``
+  separators), the smallest output for the dashboard, which only parses it.
+
+Both encoders produce the same layout; they may differ only in how
+floats are spelled (e.g. ``1e+16`` vs ``1e16``), which parses to the same
+value.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Optional
+
+try:  # Optional accelerator.
+    import orjson as _orjson
+except ImportError:  # pragma: no cover — depends on the environment
+    _orjson = None
+
+if os.environ.get("CONTENT_AUTOMATION_JSON", "").lower() == "json":
+    _orjson = None
+
+#: Separators of the compact layout.
+COMPACT_SEPARATORS = (",", ":")
+
+
+def backend() -> str:
+    """Name of the encoder in use: ``"orjson"`` or ``"json"``."""
+    return "orjson" if _orjson is not None else "json"
+
+
+def dumps(obj: Any, indent: Optional[int] = 2) -> str:
+    """Encode *obj* as JSON text (non-ASCII characters kept as is).
+
+    Parameters
+    ----------
+    obj:
+        JSON-compatible data (dicts with string keys, lists, strings,
+        numbers, booleans, *None*; ``str`` enums encode as their value).
+    indent:
+        ``2`` (default) for indented output, *None* for compact output.
+        Other widths are honoured by the stdlib encoder.
+    """
+    if _orjson is not None and indent in (None, 2):
+        try:
+            return _orjson.dumps(
+                obj, option=_orjson.OPT_INDENT_2 if indent == 2 else 0
+            ).decode("utf-8")
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits — let the stdlib handle it.
+    return json.dumps(
+        obj,
+        ensure_ascii=False,
+        indent=indent,
+        separators=COMPACT_SEPARATORS if indent is None else None,
+    )
@@ -0,0 +1,343 @@
+"""Warm resident HTTP server for the content-automation tools.
+
+Every ``hookmaster`` / ``lootbox-seo`` / ``omnichannel`` invocation from the
+dashboard otherwise pays interpreter start-up, the ``google.genai`` import,
+client creation and CSV parsing before doing any work.  The server pays
+those costs once: it keeps the GAMER PC :class:`ProductCatalog`, the
+templates and the shared Gemini client in memory and answers requests over
+localhost HTTP on a thread per connection.
+
+Endpoints (``POST`` with a JSON body) return exactly the JSON the
+corresponding CLI prints with ``--json`` (``--format json`` for Loot-Box):
+
+* ``/hookmaster``       — ``{"gpu", "audience", "apiKey"?}``
+* ``/lootbox-seo``      — ``{"gpu"?, "tier"?, "csv"?}``
+* ``/omnichannel``      — ``{"gpu", "audience", "apiKey"?}``
+* ``/trending-socials`` — ``{"platforms"?, "numTopics"?, "concurrency"?,
+  "batched"?, "product"?, "csv"?, "apiKey"?}``
+
+Every endpoint also accepts ``"compact": true`` (the CLIs' ``--compact``).
+
+``GET /health`` reports readiness and ``GET /metrics`` the aggregated
+:mod:`metrics` of all requests in Prometheus text format.
+
+The CLIs forward their ``--json`` requests to a running server when
+``CONTENT_AUTOMATION_SERVER`` is set (e.g. ``http://127.0.0.1:8765``) and
+fall back to in-process generation when it is unreachable.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from . import gemini, serialise
+from .catalog import ProductCatalog
+from .csv_loader import resolve_csv_path
+from .metrics import SERIALISE, Metrics
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+#: Environment variable the CLIs read to find a running server.
+SERVER_ENV = "CONTENT_AUTOMATION_SERVER"
+
+#: Seconds a CLI waits for the server before generating in-process.
+FORWARD_CONNECT_TIMEOUT = 0.5
+FORWARD_TIMEOUT = 300.0
+
+#: Catalogues kept warm at once; the least recently used one is dropped.
+MAX_CATALOGS = 8
+
+
+class RequestError(ValueError):
+    """Invalid request payload (answered with HTTP 400)."""
+
+
+def _indent(payload: dict) -> Optional[int]:
+    return None if payload.get("compact") else 2
+
+
+def _require(payload: dict, key: str) -> str:
+    value = payload.get(key)
+    if not isinstance(value, str) or not value.strip():
+        raise RequestError(f"missing or empty field {key!r}")
+    return value
+
+
+# ---------------------------------------------------------------------------
+# Warm state
+# ---------------------------------------------------------------------------
+class ContentServer(ThreadingHTTPServer):
+    """HTTP server holding the warm catalogue, Gemini client and metrics.
+
+    Parameters
+    ----------
+    address:
+        ``(host, port)`` to bind; port ``0`` picks a free one.
+    csv_path:
+        Default catalogue CSV (falls back to the repository's
+        ``products (1).csv``).
+    api_key:
+        Gemini API key used when a request does not carry its own.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        address: tuple[str, int] = (DEFAULT_HOST, DEFAULT_PORT),
+        csv_path: Optional[Path] = None,
+        api_key: Optional[str] = None,
+        verbose: bool = False,
+    ) -> None:
+        super().__init__(address, _Handler)
+        self.csv_path = csv_path
+        self.api_key = api_key or os.environ.get("GEMINI_API_KEY")
+        self.verbose = verbose
+        self.metrics = Metrics("server")
+        # (path, gaming_only) → ((size, mtime_ns) of the CSV, catalogue), LRU order.
+        self._catalogs: OrderedDict[
+            tuple[str, bool], tuple[tuple[int, int], ProductCatalog]
+        ] = OrderedDict()
+        self._catalogs_lock = threading.Lock()
+        self.routes: dict[str, Callable[[dict], str]] = {
+            "/hookmaster": self._hookmaster,
+            "/lootbox-seo": self._lootbox,
+            "/omnichannel": self._omnichannel,
+            "/trending-socials": self._trending,
+        }
+
+    def warm_up(self) -> None:
+        """Load the default catalogue and create the Gemini client up front."""
+        self.catalog(None)
+        if self.api_key:
+            try:
+                gemini.get_client(self.api_key)
+            except ImportError:
+                pass  # Template-only server; requests fall back per call.
+
+    def catalog(self, csv: Optional[str], gaming_only: bool = True) -> ProductCatalog:
+        """Return the (cached) GAMER PC — or, with ``gaming_only=False``, full — catalogue for *csv*.
+
+        The CSV is stat'ed on every call; a catalogue whose file changed
+        size or modification time since it was built is rebuilt.  At most
+        :data:`MAX_CATALOGS` catalogues are kept.
+        """
+        path = resolve_csv_path(Path(csv) if csv else self.csv_path)
+        stat = path.stat()
+        signature = (stat.st_size, stat.st_mtime_ns)
+        key = (str(path), gaming_only)
+        with self._catalogs_lock:
+            entry = self._catalogs.get(key)
+            if entry is not None and entry[0] == signature:
+                self._catalogs.move_to_end(key)
+                return entry[1]
+            catalog = ProductCatalog.from_csv(path, gaming_only=gaming_only, use_snapshot=True)
+            self._catalogs[key] = (signature, catalog)
+            self._catalogs.move_to_end(key)
+            while len(self._catalogs) > MAX_CATALOGS:
+                self._catalogs.popitem(last=False)
+        return catalog
+
+    # ------------------------------------------------------------------
+    # Tool handlers — each returns the CLI's --json output
+    # ------------------------------------------------------------------
+    def _hookmaster(self, payload: dict) -> str:
+        from .hookmaster import generate
+
+        result = generate(
+            _require(payload, "gpu"),
+            _require(payload, "audience"),
+            api_key=payload.get("apiKey") or self.api_key,
+        )
+        body = result.to_json(_indent(payload))
+        self.metrics.merge(result.metrics)
+        return body
+
+    def _omnichannel(self, payload: dict) -> str:
+        from .omnichannel import distribute
+
+        result = distribute(
+            _require(payload, "gpu"),
+            _require(payload, "audience"),
+            api_key=payload.get("apiKey") or self.api_key,
+        )
+        body = result.to_json(_indent(payload))
+        self.metrics.merge(result.metrics)
+        return body
+
+    def _lootbox(self, payload: dict) -> str:
+        from .lootbox_seo import generate_full_seo_content
+
+        metrics = Metrics("lootbox_seo")
+        data = generate_full_seo_content(
+            gpu_filter=payload.get("gpu") or None,
+            tier_filter=payload.get("tier") or None,
+            catalog=self.catalog(payload.get("csv")),
+            metrics=metrics,
+        )
+        with metrics.span(SERIALISE):
+            body = serialise.dumps(data, indent=_indent(payload))
+        self.metrics.merge(metrics)
+        return body
+
+    def _trending(self, payload: dict) -> str:
+        from .trending_socials import generate_trending_posts
+
+        platforms = payload.get("platforms")
+        if platforms is not None and not isinstance(platforms, list):
+            raise RequestError("'platforms' must be a list")
+        try:
+            num_topics = int(payload.get("numTopics", 2))
+            concurrency = int(payload.get("concurrency", 8))
+        except (TypeError, ValueError) as exc:
+            raise RequestError(str(exc)) from None
+        product = None
+        if payload.get("product"):
+            query = _require(payload, "product")
+            product = self.catalog(payload.get("csv"), gaming_only=False).resolver().resolve(query)
+            if product is None:
+                raise RequestError(f"unknown product {query!r}")
+        result = generate_trending_posts(
+            api_key=payload.get("apiKey") or self.api_key,
+            platforms=platforms,
+            num_topics=num_topics,
+            max_concurrency=concurrency,
+            batched=bool(payload.get("batched", False)),
+            product=product,
+        )
+        body = result.to_json(_indent(payload))
+        self.metrics.merge(result.metrics)
+        return body
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: ContentServer
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status: int, body: str, content_type: str = "application/json") -> None:
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: int, message: str) -> None:
+        self._send(status, json.dumps({"error": message}, ensure_ascii=False))
+
+    def do_GET(self) -> None:  # noqa: N802 — http.server naming
+        if self.path == "/health":
+            try:
+                products = len(self.server.catalog(None))
+            except Exception as exc:  # Not ready: report it instead of dropping the connection.
+                self._send(
+                    HTTPStatus.SERVICE_UNAVAILABLE,
+                    json.dumps(
+                        {"status": "error", "error": f"{type(exc).__name__}: {exc}"},
+                        ensure_ascii=False,
+                    ),
+                )
+                return
+            self._send(
+                HTTPStatus.OK,
+                json.dumps(
+                    {
+                        "status": "ok",
+                        "catalogProducts": products,
+                        "ai": bool(self.server.api_key),
+                    }
+                ),
+            )
+        elif self.path == "/metrics":
+            self._send(
+                HTTPStatus.OK,
+                self.server.metrics.to_prometheus(),
+                content_type="text/plain; version=0.0.4",
+            )
+        else:
+            self._error(HTTPStatus.NOT_FOUND, f"unknown path {self.path}")
+
+    def do_POST(self) -> None:  # noqa: N802 — http.server naming
+        handler = self.server.routes.get(self.path)
+        if handler is None:
+            self._error(HTTPStatus.NOT_FOUND, f"unknown path {self.path}")
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise RequestError("request body must be a JSON object")
+            body = handler(payload)
+        except (RequestError, ValueError) as exc:
+            self._error(HTTPStatus.BAD_REQUEST, str(exc))
+        except Exception as exc:  # A failing request must not kill the server.
+            self._error(HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(exc).__name__}: {exc}")
+        else:
+            self._send(HTTPStatus.OK, body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    csv_path: Optional[Path] = None,
+    api_key: Optional[str] = None,
+    verbose: bool = False,
+) -> None:
+    """Warm up and serve until interrupted."""
+    server = ContentServer((host, port), csv_path=csv_path, api_key=api_key, verbose=verbose)
+    server.warm_up()
+    print(f"  ✅ content-automation server na http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# ---------------------------------------------------------------------------
+# Client side (used by the CLIs)
+# ---------------------------------------------------------------------------
+def forward(tool: str, payload: dict, url: Optional[str] = None) -> Optional[str]:
+    """Send a request to a running server and return its JSON body.
+
+    Returns *None* when no server is configured, it cannot be reached or it
+    answers with an error, so the caller can generate in-process instead.
+    """
+    url = url or os.environ.get(SERVER_ENV)
+    if not url:
+        return None
+    request = urllib.request.Request(
+        f"{url.rstrip('/')}/{tool}",
+        data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    parts = urllib.parse.urlsplit(url)
+    try:
+        # Fail fast when nothing is listening; generation itself may be slow.
+        socket.create_connection(
+            (parts.hostname or DEFAULT_HOST, parts.port or 80),
+            timeout=FORWARD_CONNECT_TIMEOUT,
+        ).close()
+        with urllib.request.urlopen(request, timeout=FORWARD_TIMEOUT) as response:
+            return response.read().decode("utf-8")
+    except (urllib.error.URLError, OSError, ValueError):
+        return None
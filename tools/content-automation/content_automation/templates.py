@@ -0,0 +1,233 @@
+"""Compiled copy templates for the offline fallbacks.
+
+Every generator falls back to fixed ``str.format`` templates when no
+Gemini key is available.  Formatting them one call at a time re-parses
+each format string on every render.  The fallbacks register their
+templates here instead.  A :class:`TemplateGroup` compiles its templates
+once into plain Python functions built from f-strings:
+
+* :meth:`TemplateGroup.render` returns every template of the group for
+  one ``(gpu, audience, topic)`` row;
+* :meth:`TemplateGroup.render_one` renders a single template;
+* :meth:`TemplateGroup.render_batch` renders a whole list of rows in one
+  call, one loop with no per-row parsing or dispatch.
+
+Templates may use the row fields ``{gpu}``, ``{audience}`` and ``{topic}``
+and the derived fields ``{gpu_tag}`` and ``{topic_slug}``.  Derived fields
+are computed only when a template of the group uses them.  The output is
+exactly what ``str.format`` would produce.
+
+:data:`REGISTRY` holds the groups of the built-in generators.
+:func:`builtin` imports them so all the groups are registered.  With
+:meth:`TemplateRegistry.render_batch`, fallback copy for every SKU of the
+catalogue is a single call.
+"""
+
+from __future__ import annotations
+
+import re
+import string
+from typing import Callable, Iterable, Mapping, Optional, Sequence
+
+#: One input row: ``(gpu, audience, topic)``.
+Row = tuple[str, str, str]
+
+#: Row fields, in row order.
+FIELDS = ("gpu", "audience", "topic")
+
+
+def gpu_tag(gpu: str) -> str:
+    """GPU name as a hashtag (``"RTX 5080"`` → ``"RTX5080"``)."""
+    return gpu.replace(" ", "").replace("-", "")
+
+
+def topic_slug(topic: str) -> str:
+    """Topic keyword as a hashtag (``"GTA 6"`` → ``"gta_6"``)."""
+    return topic.lower().replace(" ", "_")
+
+
+#: Derived fields: ``name → (row field, function)``.
+DERIVED: dict[str, tuple[str, Callable[[str], str]]] = {
+    "gpu_tag": ("gpu", gpu_tag),
+    "topic_slug": ("topic", topic_slug),
+}
+
+_FORMATTER = string.Formatter()
+# Format specs are copied into the generated f-string, so only plain ones are accepted.
+_SPEC_RE = re.compile(r"[\w<>^=+\- ,.#%]*")
+
+
+def _fstring(source: str) -> tuple[str, set[str]]:
+    """Translate a ``str.format`` template into f-string source and its field names."""
+    parts: list[str] = []
+    used: set[str] = set()
+    for literal, name, spec, conversion in _FORMATTER.parse(source):
+        if literal:
+            parts.append(literal.replace("{", "{{").replace("}", "}}"))
+        if name is None:
+            continue
+        if name not in FIELDS and name not in DERIVED:
+            raise ValueError(f"unknown template field {{{name}}} in {source!r}")
+        if not _SPEC_RE.fullmatch(spec or ""):
+            raise ValueError(f"unsupported format spec {spec!r} in {source!r}")
+        used.add(name)
+        parts.append(
+            "{" + name + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "") + "}"
+        )
+    return "f" + repr("".join(parts)), used
+
+
+def _derive_lines(used: Iterable[str], indent: str) -> list[str]:
+    return [f"{indent}{name} = _{name}({DERIVED[name][0]})" for name in DERIVED if name in used]
+
+
+def _compile(code: list[str], filename: str) -> dict:
+    namespace = {f"_{name}": fn for name, (_, fn) in DERIVED.items()}
+    exec(compile("\n".join(code), filename, "exec"), namespace)
+    return namespace
+
+
+def _dict_code(bodies: Mapping[str, tuple[str, set[str]]]) -> tuple[str, set[str]]:
+    """Dict display rendering every body, and the fields it uses."""
+    used: set[str] = set()
+    for _, fields in bodies.values():
+        used |= fields
+    return "{" + ", ".join(f"{key!r}: {expr}" for key, (expr, _) in bodies.items()) + "}", used
+
+
+def _batch_code(bodies: Mapping[str, tuple[str, set[str]]]) -> list[str]:
+    """Source of ``render_batch(rows)`` returning one ``{key: text}`` dict per row."""
+    entries, used = _dict_code(bodies)
+    return [
+        "def render_batch(rows):",
+        "    out = []",
+        "    append = out.append",
+        f"    for {', '.join(FIELDS)} in rows:",
+        *_derive_lines(used, "        "),
+        f"        append({entries})",
+        "    return out",
+    ]
+
+
+class TemplateGroup:
+    """Named templates compiled together.
+
+    Parameters
+    ----------
+    name:
+        Group name, e.g. ``"omnichannel"``.
+    templates:
+        ``name → str.format template``; the order is kept in rendered dicts.
+
+    Raises
+    ------
+    ValueError
+        A template uses an unknown field, a positional or attribute field,
+        or an unsupported format spec.
+    """
+
+    __slots__ = ("name", "sources", "_bodies", "_one", "_render", "_batch")
+
+    def __init__(self, name: str, templates: Mapping[str, str]) -> None:
+        self.name = name
+        self.sources: dict[str, str] = dict(templates)
+        self._bodies = {key: _fstring(source) for key, source in self.sources.items()}
+        filename = f"<templates:{name}>"
+
+        signature = ", ".join(FIELDS)
+        code: list[str] = []
+        for i, (expr, used) in enumerate(self._bodies.values()):
+            code += [f"def t{i}({signature}):", *_derive_lines(used, "    "), f"    return {expr}"]
+        entries, used = _dict_code(self._bodies)
+        code += [f"def render({signature}):", *_derive_lines(used, "    "), f"    return {entries}"]
+        code += _batch_code(self._bodies)
+        namespace = _compile(code, filename)
+        self._one: dict[str, Callable[[str, str, str], str]] = {
+            key: namespace[f"t{i}"] for i, key in enumerate(self._bodies)
+        }
+        self._render = namespace["render"]
+        self._batch = namespace["render_batch"]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._one
+
+    def __len__(self) -> int:
+        return len(self._one)
+
+    def keys(self) -> list[str]:
+        return list(self._one)
+
+    def render_one(self, key: str, gpu: str, audience: str = "", topic: str = "") -> str:
+        """Render template *key* for one row."""
+        return self._one[key](gpu, audience, topic)
+
+    def render(self, gpu: str, audience: str = "", topic: str = "") -> dict[str, str]:
+        """Render every template of the group for one row."""
+        return self._render(gpu, audience, topic)
+
+    def render_batch(self, rows: Iterable[Row]) -> list[dict[str, str]]:
+        """Render every template for each ``(gpu, audience, topic)`` row, in order."""
+        return self._batch(rows)
+
+
+class TemplateRegistry:
+    """Template groups by name, with batch rendering across groups."""
+
+    def __init__(self) -> None:
+        self._groups: dict[str, TemplateGroup] = {}
+        self._combined: dict[tuple[str, ...], Callable] = {}
+
+    def register(self, name: str, templates: Mapping[str, str]) -> TemplateGroup:
+        """Compile *templates* as group *name* and return the group.
+
+        Raises
+        ------
+        ValueError
+            *name* is already registered, or a template is invalid.
+        """
+        if name in self._groups:
+            raise ValueError(f"template group {name!r} is already registered")
+        group = self._groups[name] = TemplateGroup(name, templates)
+        self._combined.clear()
+        return group
+
+    def __getitem__(self, name: str) -> TemplateGroup:
+        return self._groups[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._groups
+
+    def names(self) -> list[str]:
+        return list(self._groups)
+
+    def render_batch(
+        self, rows: Iterable[Row], groups: Optional[Sequence[str]] = None
+    ) -> list[dict[str, str]]:
+        """Render the templates of *groups* (default: all) for every row.
+
+        Keys of the returned dicts are ``"<group>.<template>"``.  The
+        templates of all requested groups are compiled into one function
+        on first use, so each row is handled in a single pass.
+        """
+        names = tuple(groups) if groups is not None else tuple(self._groups)
+        batch = self._combined.get(names)
+        if batch is None:
+            bodies = {
+                f"{name}.{key}": body
+                for name in names
+                for key, body in self._groups[name]._bodies.items()
+            }
+            filename = "<templates:" + "+".join(names) + ">"
+            batch = self._combined[names] = _compile(_batch_code(bodies), filename)["render_batch"]
+        return batch(rows)
+
+
+#: Templates of the built-in generators (see :func:`builtin`).
+REGISTRY = TemplateRegistry()
+
+
+def builtin() -> TemplateRegistry:
+    """Return :data:`REGISTRY` with the groups of every built-in generator loaded."""
+    from . import hookmaster, omnichannel, trending_socials  # noqa: F401 — register groups
+
+    return REGISTRY
@@ -14,14 +14,30 @@ for offline use. Integrates with CSV product data for context.
 from __future__ import annotations
 
 import json
+import logging
 import os
 import re
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Iterator, Optional, TextIO
+
+from . import gemini
+from . import metrics as m
+from . import serialise
+from . import templates
+from .models import (
+    ContentItem,
+    ContentStatus,
+    ContentType,
+    Product,
+    iter_json_array,
+    utc_now,
+)
+
+logger = logging.getLogger(__name__)
 
-from .models import ContentItem, ContentStatus, ContentType, Product
+GEMINI_MODEL = "gemini-2.0-flash"
 
 
 class SocialPlatform(str, Enum):
@@ -75,8 +91,8 @@ class SocialPostResult:
         default_factory=lambda: datetime.utcnow().isoformat()
     )
 
-    def to_content_item(self) -> ContentItem:
-        """Convert to dashboard ContentItem."""
+    def to_content_item(self, created_at: Optional[str] = None) -> ContentItem:
+        """Convert to dashboard ContentItem (stamped *created_at*, default now)."""
         full_body = self.body
         if self.hashtags:
             full_body += "\n\n" + " ".join(self.hashtags)
@@ -88,6 +104,7 @@ class SocialPostResult:
             body=full_body,
             content_type=ContentType.SOCIAL_POST,
             status=ContentStatus.DRAFT,
+            created_at=created_at or utc_now(),
         )
 
     def to_dict(self) -> dict:
@@ -113,18 +130,42 @@ class TrendingSocialsResult:
     posts: list[SocialPostResult]
     trending_topics: list[TrendingTopic]
     product_context: Optional[Product] = None
-    model_used: str = "gemini-2.0-flash"
+    model_used: str = GEMINI_MODEL
     generation_time_ms: int = 0
+    metrics: m.Metrics = field(
+        default_factory=lambda: m.Metrics("trending_socials"), repr=False, compare=False
+    )
 
     def to_content_items(self) -> list[ContentItem]:
         """Convert all posts to ContentItem list."""
-        return [p.to_content_item() for p in self.posts]
+        created_at = utc_now()
+        return [p.to_content_item(created_at) for p in self.posts]
 
-    def to_json(self, indent: int = 2) -> str:
+    def to_json(self, indent: Optional[int] = 2) -> str:
         """Serialize to JSON."""
-        return json.dumps(
+        with self.metrics.span(m.SERIALISE):
+            return "".join(self.iter_json(indent))
+
+    def write_json(self, out: TextIO, indent: Optional[int] = 2) -> None:
+        """Stream :meth:`to_json` to *out* without building the whole string."""
+        with self.metrics.span(m.SERIALISE):
+            for chunk in self.iter_json(indent):
+                out.write(chunk)
+            out.write("\n")
+
+    def iter_json(self, indent: Optional[int] = 2) -> Iterator[str]:
+        """Encode the result piece by piece, one post at a time."""
+        # Everything except the posts is small: encode it in one go and
+        # splice the streamed "posts" array in front of its first key.
+        rest = self._summary_json(indent)
+        head = "{" if indent is None else "{\n" + " " * indent
+        yield head + ('"posts":' if indent is None else '"posts": ')
+        yield from iter_json_array((p.to_dict() for p in self.posts), indent, level=1)
+        yield "," + rest[1:]
+
+    def _summary_json(self, indent: Optional[int]) -> str:
+        return serialise.dumps(
             {
-                "posts": [p.to_dict() for p in self.posts],
                 "trendingTopics": [
                     {
                         "keyword": t.keyword,
@@ -144,7 +185,6 @@ class TrendingSocialsResult:
                 "modelUsed": self.model_used,
                 "generationTimeMs": self.generation_time_ms,
             },
-            ensure_ascii=False,
             indent=indent,
         )
 
@@ -321,6 +361,18 @@ PLATFORM_GUIDELINES = {
         ],
         "cta_style": "Subscribe / Like & Comment",
     },
+    SocialPlatform.FACEBOOK: {
+        "max_length": 400,
+        "emoji_count": "1-3",
+        "hashtags": "1-3",
+        "tone": "casual or professional",
+        "hooks": [
+            "Hledáš…",
+            "Víte, že…",
+            "Tohle musíte vidět…",
+        ],
+        "cta_style": "Zjisti více na hellocomp.cz",
+    },
 }
 
 TONE_TEMPLATES = {
@@ -352,6 +404,148 @@ TONE_TEMPLATES = {
 }
 
 
+# Offline fallback posts, compiled once (see :mod:`content_automation.templates`).
+_FALLBACK_TEMPLATES = templates.REGISTRY.register(
+    "trending_socials",
+    {
+        SocialPlatform.TIKTOK.value: (
+            "POV: Najdeš si HelloComp PC s {gpu} a {topic} se změní. "
+            "240 FPS guaranteed. 🔥💻 Trust the specs. #gamingpc #{topic_slug}"
+        ),
+        SocialPlatform.INSTAGRAM.value: (
+            "Wait till you see what happens when {topic} meets {gpu} performance. "
+            "Benchmark incoming. 👀 Follow for daily gaming tech updates. "
+            "#gamingpc #tech #{topic_slug}"
+        ),
+        SocialPlatform.TWITTER.value: (
+            "Hot take: {gpu} + HelloComp = the {topic} solution nobody "
+            "expected. Numbers don't lie. 📊 #{topic_slug}"
+        ),
+        SocialPlatform.LINKEDIN.value: (
+            "Here's what I learned about {topic} and high-performance PC "
+            "gaming: investment > regret. Thread incoming. #{topic_slug}"
+        ),
+        SocialPlatform.YOUTUBE_SHORTS.value: (
+            "This {gpu} PC handles {topic} smoothly. Watch till the end "
+            "for the FPS benchmarks. 🎮 Sub for more. #{topic_slug}"
+        ),
+        SocialPlatform.FACEBOOK.value: (
+            "{topic} destroying your PC? HelloComp {gpu} rigs handle it "
+            "with ease. Check current deals 👇 #gamingpc"
+        ),
+        "default": "Trending: {topic} — HelloComp PC delivers. {gpu} in stock now. #gaming",
+    },
+)
+
+_FALLBACK_EMOJIS = {
+    SocialPlatform.TIKTOK: ("🔥", "💻", "⚡"),
+    SocialPlatform.INSTAGRAM: ("👀", "🎮", "✨"),
+    SocialPlatform.TWITTER: ("📊", "🚀", "💪"),
+    SocialPlatform.LINKEDIN: ("📈", "💡", "🎯"),
+    SocialPlatform.YOUTUBE_SHORTS: ("🎮", "⚡", "🔥"),
+}
+
+
+# ============================================================================
+# BATCHED RESPONSE SCHEMA
+# ============================================================================
+
+#: Follow-up requests for pairs missing from a batched response.
+BATCH_RETRIES = 1
+
+#: Metrics counter for those follow-up requests.
+PARTIAL_RETRIES = "partial_retries"
+
+
+def batch_response_schema(pairs: list[tuple[SocialPlatform, ContentTone]]) -> dict:
+    """Response schema for a batched request covering *pairs*."""
+    variant = {
+        "type": "object",
+        "properties": {
+            "body": {"type": "string"},
+            "hashtags": {"type": "array", "items": {"type": "string"}},
+            "emojis": {"type": "array", "items": {"type": "string"}},
+            "cta": {"type": "string"},
+        },
+        "required": ["body"],
+    }
+    return {
+        "type": "object",
+        "properties": {
+            "posts": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "platform": {
+                            "type": "string",
+                            "enum": sorted({p.value for p, _ in pairs}),
+                        },
+                        "tone": {
+                            "type": "string",
+                            "enum": sorted({t.value for _, t in pairs}),
+                        },
+                        "variants": {"type": "array", "items": variant},
+                    },
+                    "required": ["platform", "tone", "variants"],
+                },
+            }
+        },
+        "required": ["posts"],
+    }
+
+
+def _string_list(value) -> list[str]:
+    if not isinstance(value, list):
+        return []
+    return [v for v in value if isinstance(v, str) and v]
+
+
+def validate_batch_response(
+    data: Optional[dict],
+    pairs: list[tuple[SocialPlatform, ContentTone]],
+) -> dict[tuple[SocialPlatform, ContentTone], list[dict]]:
+    """Extract the valid variants for *pairs* from a batched response.
+
+    Entries for unrequested pairs, variants without a non-empty ``body``
+    and malformed fields are dropped; over-long bodies are trimmed to the
+    platform's ``max_length``.  Pairs with no valid variant are absent
+    from the result.
+    """
+    wanted = {(p.value, t.value): (p, t) for p, t in pairs}
+    found: dict[tuple[SocialPlatform, ContentTone], list[dict]] = {}
+    posts = data.get("posts") if isinstance(data, dict) else None
+    if not isinstance(posts, list):
+        return found
+
+    for entry in posts:
+        if not isinstance(entry, dict):
+            continue
+        pair = wanted.get((entry.get("platform"), entry.get("tone")))
+        variants = entry.get("variants")
+        if pair is None or not isinstance(variants, list):
+            continue
+        max_length = PLATFORM_GUIDELINES[pair[0]]["max_length"]
+        for variant in variants:
+            if not isinstance(variant, dict):
+                continue
+            body = variant.get("body")
+            if not isinstance(body, str) or not body.strip():
+                continue
+            if len(body) > max_length:
+                body = body[: max_length - 3] + "..."
+            cta = variant.get("cta")
+            found.setdefault(pair, []).append(
+                {
+                    "body": body,
+                    "hashtags": _string_list(variant.get("hashtags")),
+                    "emojis": _string_list(variant.get("emojis")),
+                    "cta": cta if isinstance(cta, str) and cta else None,
+                }
+            )
+    return found
+
+
 # ============================================================================
 # CORE GENERATOR
 # ============================================================================
@@ -360,9 +554,28 @@ TONE_TEMPLATES = {
 class TrendingSocialsGenerator:
     """AI-powered trending social post generator."""
 
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize with optional Gemini API key."""
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_concurrency: int = 1,
+        batched: bool = False,
+    ):
+        """Initialize with optional Gemini API key.
+
+        Parameters
+        ----------
+        api_key : str, optional
+            Google Gemini API key (falls back to GEMINI_API_KEY env var).
+        max_concurrency : int
+            Maximum number of Gemini calls in flight at once (1 = serial).
+        batched : bool
+            Ask Gemini once per topic for every platform × tone instead of
+            once per pair (see :meth:`_generate_topic_batch`).
+        """
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
+        self.max_concurrency = max(1, max_concurrency)
+        self.batched = batched
+        self.batch_retries = BATCH_RETRIES
         self.has_ai = self.api_key is not None
         self.trending_topics = GAMING_TRENDING_TOPICS
 
@@ -420,27 +633,33 @@ Generate now. Be creative, human, and authentic. No fluff."""
 
         return prompt
 
-    def _call_gemini(self, prompt: str) -> Optional[dict]:
-        """Call Google Gemini API with retry logic."""
+    def _call_gemini(
+        self, prompt: str, metrics: Optional[m.Metrics] = None
+    ) -> Optional[dict]:
+        """Call Google Gemini API through the shared client."""
         if not self.has_ai:
             return None
 
         try:
-            import google.generativeai as genai
-
-            genai.configure(api_key=self.api_key)
-            model = genai.GenerativeModel("gemini-2.0-flash")
-            response = model.generate_content(prompt)
+            text = gemini.generate_content(
+                prompt,
+                self.api_key,
+                model=GEMINI_MODEL,
+                response_mime_type="application/json",
+                metrics=metrics,
+            )
 
             # Extract JSON from response
-            text = response.text
-            json_match = re.search(r"\{.*\}", text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
+            with m.optional_span(metrics, m.JSON_PARSE):
+                json_match = re.search(r"\{.*\}", text, re.DOTALL)
+                if json_match:
+                    return json.loads(json_match.group())
             return None
 
         except Exception as e:
-            print(f"⚠️ Gemini API error: {e}")
+            if metrics is not None:
+                metrics.record_error(e)
+            logger.warning("Gemini API error: %s", e)
             return None
 
     def _generate_fallback_post(
@@ -451,55 +670,16 @@ Generate now. Be creative, human, and authentic. No fluff."""
         product: Optional[Product] = None,
     ) -> SocialPostResult:
         """Deterministic template fallback (no API key needed)."""
-        templates = {
-            SocialPlatform.TIKTOK: (
-                "POV: Najdeš si HelloComp PC s {gpu} a {topic} se změní. "
-                "240 FPS guaranteed. 🔥💻 Trust the specs. #gamingpc #{topic_slug}"
-            ),
-            SocialPlatform.INSTAGRAM: (
-                "Wait till you see what happens when {topic} meets {gpu} performance. "
-                "Benchmark incoming. 👀 Follow for daily gaming tech updates. "
-                "#gamingpc #tech #{topic_slug}"
-            ),
-            SocialPlatform.TWITTER: (
-                "Hot take: {gpu} + HelloComp = the {topic} solution nobody "
-                "expected. Numbers don't lie. 📊 #{topic_slug}"
-            ),
-            SocialPlatform.LINKEDIN: (
-                "Here's what I learned about {topic} and high-performance PC "
-                "gaming: investment > regret. Thread incoming. #{topic_slug}"
-            ),
-            SocialPlatform.YOUTUBE_SHORTS: (
-                "This {gpu} PC handles {topic} smoothly. Watch till the end "
-                "for the FPS benchmarks. 🎮 Sub for more. #{topic_slug}"
-            ),
-            SocialPlatform.FACEBOOK: (
-                "{topic} destroying your PC? HelloComp {gpu} rigs handle it "
-                "with ease. Check current deals 👇 #gamingpc"
-            ),
-        }
-
-        gpu = product.gpu if product else "RTX 5090"
-        topic_slug = topic.keyword.lower().replace(" ", "_")
+        gpu = (product.gpu or product.name) if product else "RTX 5090"
+        topic_slug = templates.topic_slug(topic.keyword)
 
-        template = templates.get(
-            platform,
-            "Trending: {topic} — HelloComp PC delivers. {gpu} in stock now. #gaming",
-        )
-        body = template.format(gpu=gpu, topic=topic.keyword, topic_slug=topic_slug)
+        key = platform.value if platform.value in _FALLBACK_TEMPLATES else "default"
+        body = _FALLBACK_TEMPLATES.render_one(key, gpu, topic=topic.keyword)
 
         # Trim if needed
         if len(body) > PLATFORM_GUIDELINES[platform]["max_length"]:
             body = body[: PLATFORM_GUIDELINES[platform]["max_length"] - 3] + "..."
 
-        emoji_map = {
-            SocialPlatform.TIKTOK: ["🔥", "💻", "⚡"],
-            SocialPlatform.INSTAGRAM: ["👀", "🎮", "✨"],
-            SocialPlatform.TWITTER: ["📊", "🚀", "💪"],
-            SocialPlatform.LINKEDIN: ["📈", "💡", "🎯"],
-            SocialPlatform.YOUTUBE_SHORTS: ["🎮", "⚡", "🔥"],
-        }
-
         hashtags = [
             f"#{topic_slug}",
             "#gamingpc",
@@ -513,13 +693,251 @@ Generate now. Be creative, human, and authentic. No fluff."""
             title=f"{platform.value.title()} Post — {topic.keyword}",
             body=body,
             hashtags=hashtags,
-            emojis=emoji_map.get(platform, ["🔥", "💻"]),
+            emojis=list(_FALLBACK_EMOJIS.get(platform, ("🔥", "💻"))),
             cta=PLATFORM_GUIDELINES[platform]["cta_style"],
             tone=tone,
             trending_topic=topic.keyword,
             gpu_mention=gpu,
         )
 
+    def _generate_for_pair(
+        self,
+        platform: SocialPlatform,
+        tone: ContentTone,
+        topic: TrendingTopic,
+        product: Optional[Product] = None,
+        metrics: Optional[m.Metrics] = None,
+    ) -> list[SocialPostResult]:
+        """Generate posts for one platform × tone, falling back to a template."""
+        if metrics is None:
+            metrics = m.Metrics("trending_socials")
+        if self.has_ai:
+            # Try AI generation
+            with metrics.span(m.PROMPT_BUILD):
+                prompt = self._build_gemini_prompt(platform, tone, topic, product)
+            result = self._call_gemini(prompt, metrics)
+
+            if result and "variants" in result:
+                return [
+                    self._make_post(platform, tone, topic, product, variant)
+                    for variant in result["variants"]
+                ]
+
+        # Fallback to template
+        metrics.incr(m.FALLBACKS)
+        with metrics.span(m.FALLBACK):
+            return [self._generate_fallback_post(platform, tone, topic, product)]
+
+    @staticmethod
+    def _make_post(
+        platform: SocialPlatform,
+        tone: ContentTone,
+        topic: TrendingTopic,
+        product: Optional[Product],
+        variant: dict,
+    ) -> SocialPostResult:
+        return SocialPostResult(
+            platform=platform,
+            title=f"{platform.value} {tone.value} Variant",
+            body=variant.get("body", ""),
+            hashtags=variant.get("hashtags", []),
+            emojis=variant.get("emojis", []),
+            cta=variant.get("cta"),
+            tone=tone,
+            trending_topic=topic.keyword,
+            gpu_mention=product.gpu if product else None,
+        )
+
+    # ------------------------------------------------------------------
+    # Batched mode: one request per topic
+    # ------------------------------------------------------------------
+    def _build_batch_prompt(
+        self,
+        topic: TrendingTopic,
+        pairs: list[tuple[SocialPlatform, ContentTone]],
+        product: Optional[Product] = None,
+        num_variants: int = 2,
+    ) -> str:
+        """Build one prompt covering every platform × tone pair of *topic*.
+
+        :data:`BRAND_VOICE` goes into the system instruction and each
+        platform's constraints and each tone's style guide appear once,
+        however many pairs reference them.
+        """
+        platforms = list(dict.fromkeys(p for p, _ in pairs))
+        tones = list(dict.fromkeys(t for _, t in pairs))
+
+        platform_lines = []
+        for platform in platforms:
+            g = PLATFORM_GUIDELINES[platform]
+            platform_lines.append(
+                f"- {platform.value}: max {g['max_length']} chars, emojis {g['emoji_count']}, "
+                f"hashtags {g['hashtags']}, hooks: {', '.join(g['hooks'][:3])}, "
+                f"CTA: {g['cta_style']}"
+            )
+        tone_lines = [
+            f"- {tone.value}: {TONE_TEMPLATES[tone]['intro']} → {TONE_TEMPLATES[tone]['example']}"
+            for tone in tones
+        ]
+        pair_list = ", ".join(f"{p.value}/{t.value}" for p, t in pairs)
+        product_line = (
+            f"PRODUCT CONTEXT: {product.name} (GPU: {product.gpu}, Tier: {product.tier})\n"
+            if product
+            else ""
+        )
+
+        return (
+            f"TASK: For each platform/tone pair below, write {num_variants} social media "
+            "post variants.\n\n"
+            f"TRENDING TOPIC: {topic.keyword}\n"
+            f"Context: {topic.context}\n"
+            f"{product_line}\n"
+            f"PAIRS: {pair_list}\n\n"
+            "PLATFORMS:\n" + "\n".join(platform_lines) + "\n\n"
+            "TONES:\n" + "\n".join(tone_lines) + "\n\n"
+            "Language: Czech (unless the platform defaults to English). "
+            "Return hashtags and emojis as lists.\n\n"
+            "OUTPUT: valid JSON only, one entry per pair:\n"
+            '{"posts": [{"platform": "…", "tone": "…", "variants": '
+            '[{"body": "…", "hashtags": ["…"], "emojis": ["…"], "cta": "…"}]}]}'
+        )
+
+    def _call_gemini_batch(
+        self,
+        prompt: str,
+        pairs: list[tuple[SocialPlatform, ContentTone]],
+        metrics: Optional[m.Metrics] = None,
+    ) -> Optional[dict]:
+        """Run one batched request with a response schema; *None* on failure."""
+        try:
+            text = gemini.generate_content(
+                prompt,
+                self.api_key,
+                model=GEMINI_MODEL,
+                system_instruction=BRAND_VOICE,
+                response_mime_type="application/json",
+                response_schema=batch_response_schema(pairs),
+                metrics=metrics,
+            )
+            with m.optional_span(metrics, m.JSON_PARSE):
+                data = json.loads(text) if text else None
+            return data if isinstance(data, dict) else None
+        except Exception as e:
+            if metrics is not None:
+                metrics.record_error(e)
+            logger.warning("Gemini API error: %s", e)
+            return None
+
+    def _generate_topic_batch(
+        self,
+        topic: TrendingTopic,
+        pairs: list[tuple[SocialPlatform, ContentTone]],
+        product: Optional[Product] = None,
+        metrics: Optional[m.Metrics] = None,
+    ) -> dict[tuple[SocialPlatform, ContentTone], list[SocialPostResult]]:
+        """Generate every pair of *topic* with one request.
+
+        The response is validated against the requested pairs
+        (:func:`validate_batch_response`).  Pairs that are missing or
+        invalid are asked for again in a smaller follow-up request (up to
+        :attr:`batch_retries` times); whatever is still missing then falls
+        back to templates.
+        """
+        if metrics is None:
+            metrics = m.Metrics("trending_socials")
+        results: dict[tuple[SocialPlatform, ContentTone], list[SocialPostResult]] = {}
+        missing = list(dict.fromkeys(pairs))
+
+        for attempt in range(1 + self.batch_retries):
+            if not missing:
+                break
+            if attempt:
+                metrics.incr(PARTIAL_RETRIES)
+            with metrics.span(m.PROMPT_BUILD):
+                prompt = self._build_batch_prompt(topic, missing, product)
+            data = self._call_gemini_batch(prompt, missing, metrics)
+            for pair, variants in validate_batch_response(data, missing).items():
+                results[pair] = [
+                    self._make_post(pair[0], pair[1], topic, product, v) for v in variants
+                ]
+            missing = [pair for pair in missing if pair not in results]
+
+        for platform, tone in missing:
+            metrics.incr(m.FALLBACKS)
+            with metrics.span(m.FALLBACK):
+                results[(platform, tone)] = [
+                    self._generate_fallback_post(platform, tone, topic, product)
+                ]
+        return results
+
+    def _generate_jobs_batched(
+        self,
+        jobs: list[tuple[SocialPlatform, ContentTone, TrendingTopic]],
+        product: Optional[Product] = None,
+        metrics: Optional[m.Metrics] = None,
+    ) -> list[SocialPostResult]:
+        """Group *jobs* by topic, run one batch per topic, keep job order."""
+        groups: dict[str, tuple[TrendingTopic, list]] = {}
+        for platform, tone, topic in jobs:
+            groups.setdefault(topic.keyword, (topic, []))[1].append((platform, tone))
+
+        def run(group: tuple[TrendingTopic, list]) -> dict:
+            topic, pairs = group
+            return self._generate_topic_batch(topic, pairs, product, metrics)
+
+        workers = min(self.max_concurrency, len(groups))
+        if workers <= 1:
+            outputs = [run(g) for g in groups.values()]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="trending-socials"
+            ) as pool:
+                outputs = list(pool.map(run, groups.values()))
+
+        by_topic = dict(zip(groups, outputs))
+        return [
+            post
+            for platform, tone, topic in jobs
+            for post in by_topic[topic.keyword][(platform, tone)]
+        ]
+
+    def _generate_jobs(
+        self,
+        jobs: list[tuple[SocialPlatform, ContentTone, TrendingTopic]],
+        product: Optional[Product] = None,
+        metrics: Optional[m.Metrics] = None,
+    ) -> list[SocialPostResult]:
+        """Run platform × tone × topic jobs, concurrently when AI is enabled.
+
+        Gemini calls are I/O bound, so they are fanned out over a thread
+        pool bounded by :attr:`max_concurrency`.  ``Executor.map`` keeps
+        results in job order, so output is identical to the serial run.
+        In :attr:`batched` mode one request per topic covers all its jobs.
+        """
+        if self.batched and self.has_ai:
+            return self._generate_jobs_batched(jobs, product, metrics)
+        workers = min(self.max_concurrency, len(jobs))
+        if not self.has_ai or workers <= 1:
+            batches = [
+                self._generate_for_pair(platform, tone, topic, product, metrics)
+                for platform, tone, topic in jobs
+            ]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="trending-socials"
+            ) as pool:
+                batches = list(
+                    pool.map(
+                        lambda job: self._generate_for_pair(*job, product, metrics),
+                        jobs,
+                    )
+                )
+        return [post for batch in batches for post in batch]
+
     def generate_for_topic(
         self,
         topic: Optional[TrendingTopic] = None,
@@ -540,42 +958,9 @@ Generate now. Be creative, human, and authentic. No fluff."""
         if tones is None:
             tones = [ContentTone.CASUAL, ContentTone.VIRAL]
 
-        posts: list[SocialPostResult] = []
-
-        for platform in platforms:
-            for tone in tones:
-                if self.has_ai:
-                    # Try AI generation
-                    prompt = self._build_gemini_prompt(
-                        platform, tone, topic, product
-                    )
-                    result = self._call_gemini(prompt)
-
-                    if result and "variants" in result:
-                        for variant in result["variants"]:
-                            posts.append(
-                                SocialPostResult(
-                                    platform=platform,
-                                    title=f"{platform.value} {tone.value} Variant",
-                                    body=variant.get("body", ""),
-                                    hashtags=variant.get("hashtags", []),
-                                    emojis=variant.get("emojis", []),
-                                    cta=variant.get("cta"),
-                                    tone=tone,
-                                    trending_topic=topic.keyword,
-                                    gpu_mention=product.gpu
-                                    if product
-                                    else None,
-                                )
-                            )
-                        continue
-
-                # Fallback to template
-                posts.append(
-                    self._generate_fallback_post(
-                        platform, tone, topic, product
-                    )
-                )
+        jobs = [(platform, tone, topic) for platform in platforms for tone in tones]
+        metrics = m.Metrics("trending_socials")
+        posts = self._generate_jobs(jobs, product, metrics)
 
         end = time.time()
         return TrendingSocialsResult(
@@ -583,6 +968,7 @@ Generate now. Be creative, human, and authentic. No fluff."""
             trending_topics=[topic],
             product_context=product,
             generation_time_ms=int((end - start) * 1000),
+            metrics=metrics,
         )
 
     def generate_all_trending(
@@ -591,21 +977,28 @@ Generate now. Be creative, human, and authentic. No fluff."""
         num_topics: int = 3,
         product: Optional[Product] = None,
     ) -> TrendingSocialsResult:
-        """Generate posts for multiple trending topics."""
+        """Generate posts for multiple trending topics.
+
+        All topic × platform × tone calls share one pool, so with AI enabled
+        the wall time is bounded by the slowest batch of calls rather than
+        the sum over topics.
+        """
         import time
 
         start = time.time()
-        posts: list[SocialPostResult] = []
         topics = self.trending_topics[:num_topics]
+        if platforms is None:
+            platforms = list(SocialPlatform)
+        tones = [ContentTone.CASUAL, ContentTone.VIRAL]
 
-        for topic in topics:
-            result = self.generate_for_topic(
-                topic=topic,
-                platforms=platforms,
-                tones=[ContentTone.CASUAL, ContentTone.VIRAL],
-                product=product,
-            )
-            posts.extend(result.posts)
+        jobs = [
+            (platform, tone, topic)
+            for topic in topics
+            for platform in platforms
+            for tone in tones
+        ]
+        metrics = m.Metrics("trending_socials")
+        posts = self._generate_jobs(jobs, product, metrics)
 
         end = time.time()
         return TrendingSocialsResult(
@@ -613,6 +1006,7 @@ Generate now. Be creative, human, and authentic. No fluff."""
             trending_topics=topics,
             product_context=product,
             generation_time_ms=int((end - start) * 1000),
+            metrics=metrics,
         )
 
 
@@ -625,6 +1019,9 @@ def generate_trending_posts(
     api_key: Optional[str] = None,
     platforms: Optional[list[str]] = None,
     num_topics: int = 2,
+    max_concurrency: int = 1,
+    batched: bool = False,
+    product: Optional[Product] = None,
 ) -> TrendingSocialsResult:
     """Quick one-liner for trending post generation.
 
@@ -636,13 +1033,22 @@ def generate_trending_posts(
         List of platforms (tiktok, instagram, twitter, linkedin, youtube-shorts).
     num_topics : int
         Number of trending topics to generate posts for.
+    max_concurrency : int
+        Maximum number of Gemini calls in flight at once (1 = serial).
+    batched : bool
+        One Gemini request per topic for all platforms and tones.
+    product : Product, optional
+        Product to feature in the posts (see
+        :meth:`ProductCatalog.resolver` for resolving a code or name).
 
     Returns
     -------
     TrendingSocialsResult
         Generated posts, trending topics, and metadata.
     """
-    gen = TrendingSocialsGenerator(api_key=api_key)
+    gen = TrendingSocialsGenerator(
+        api_key=api_key, max_concurrency=max_concurrency, batched=batched
+    )
 
     platform_objs = None
     if platforms:
@@ -651,5 +1057,5 @@ def generate_trending_posts(
         ]
 
     return gen.generate_all_trending(
-        platforms=platform_objs, num_topics=num_topics
+        platforms=platform_objs, num_topics=num_topics, product=product
     )
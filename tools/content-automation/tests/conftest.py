@@ -0,0 +1,95 @@
+"""Shared fixtures for the content-automation tests."""
+
+import sys
+import types
+from typing import Callable
+
+import pytest
+
+from content_automation import gemini
+
+
+class FakeGenAI:
+    """In-process stand-in for the ``google.genai`` SDK.
+
+    Tests set :attr:`responder` to control the response text; every
+    created client and every ``generate_content`` call is recorded.
+    Streaming calls split the text into :attr:`chunk_size` pieces; a
+    responder may instead return a list of chunks, where an exception
+    instance is raised when the stream reaches it.
+    """
+
+    def __init__(self) -> None:
+        self.clients: list = []
+        self.calls: list[dict] = []
+        self.responder: Callable[[dict], object] = lambda call: "{}"
+        self.chunk_size = 8
+
+    def install(self, monkeypatch) -> None:
+        fake = self
+
+        class _Config:
+            def __init__(self, **kwargs):
+                self.__dict__.update(kwargs)
+
+        class _Models:
+            def generate_content(self, model, contents, config):
+                call = {"model": model, "contents": contents, "config": config}
+                fake.calls.append(call)
+                return types.SimpleNamespace(text=fake.responder(call))
+
+            def generate_content_stream(self, model, contents, config):
+                call = {"model": model, "contents": contents, "config": config, "stream": True}
+                fake.calls.append(call)
+                chunks = fake.responder(call)
+                if isinstance(chunks, str):
+                    size = fake.chunk_size
+                    chunks = [chunks[i : i + size] for i in range(0, len(chunks), size)]
+                for chunk in chunks:
+                    if isinstance(chunk, BaseException):
+                        raise chunk
+                    yield types.SimpleNamespace(text=chunk)
+
+        class _Client:
+            def __init__(self, api_key, http_options=None):
+                self.api_key = api_key
+                self.http_options = http_options
+                self.models = _Models()
+                fake.clients.append(self)
+
+        genai_types = types.ModuleType("google.genai.types")
+        genai_types.HttpOptions = _Config
+        genai_types.GenerateContentConfig = _Config
+        genai = types.ModuleType("google.genai")
+        genai.Client = _Client
+        genai.types = genai_types
+        google = types.ModuleType("google")
+        google.genai = genai
+
+        monkeypatch.setitem(sys.modules, "google", google)
+        monkeypatch.setitem(sys.modules, "google.genai", genai)
+        monkeypatch.setitem(sys.modules, "google.genai.types", genai_types)
+
+
+@pytest.fixture
+def fake_genai(monkeypatch):
+    """Install a fake ``google.genai`` SDK and reset the shared client cache."""
+    fake = FakeGenAI()
+    fake.install(monkeypatch)
+    gemini.reset_clients()
+    yield fake
+    gemini.reset_clients()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_response_cache(monkeypatch, tmp_path):
+    """Point the Gemini response cache at a per-test database."""
+    monkeypatch.setenv("GEMINI_CACHE_PATH", str(tmp_path / "gemini-cache.sqlite3"))
+    monkeypatch.delenv("GEMINI_CACHE", raising=False)
+    gemini.set_cache(None)
+    gemini.set_cache_mode(None)
+    gemini.set_rate_limiter(None)
+    yield
+    gemini.set_cache(None)
+    gemini.set_cache_mode(None)
+    gemini.set_rate_limiter(None)
@@ -0,0 +1,109 @@
+"""Tests for content_automation.batch."""
+
+import csv
+import io
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from content_automation.batch import (
+    catalog_pairs,
+    iter_catalog_gpus,
+    read_pairs,
+    run_bounded,
+    write_ndjson,
+)
+
+
+def _write_catalog(rows: list[list[str]], path: Path) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh, delimiter=";")
+        writer.writerow(["code", "pairCode", "name", "xmlFeedName", ""])
+        for row in rows:
+            writer.writerow(row)
+
+
+class TestReadPairs:
+    def test_csv_with_header(self, tmp_path):
+        f = tmp_path / "pairs.csv"
+        f.write_text("gpu,audience\nRTX 5080,hráč Warzone\nRTX 5070 Ti,hráč CS2\n", encoding="utf-8")
+        assert list(read_pairs(f)) == [("RTX 5080", "hráč Warzone"), ("RTX 5070 Ti", "hráč CS2")]
+
+    def test_semicolon_csv_without_header(self, tmp_path):
+        f = tmp_path / "pairs.csv"
+        f.write_text("RTX 5080;streamer\n\nRTX 5060;casual gamer\n", encoding="utf-8")
+        assert list(read_pairs(f)) == [("RTX 5080", "streamer"), ("RTX 5060", "casual gamer")]
+
+    def test_jsonl(self, tmp_path):
+        f = tmp_path / "pairs.jsonl"
+        f.write_text(
+            '{"gpu": "RTX 5080", "audience": "streamer"}\n\n'
+            '{"gpu": "RTX 5090", "targetAudience": "hráč CS2"}\n',
+            encoding="utf-8",
+        )
+        assert list(read_pairs(f)) == [("RTX 5080", "streamer"), ("RTX 5090", "hráč CS2")]
+
+    def test_malformed_row(self, tmp_path):
+        f = tmp_path / "pairs.csv"
+        f.write_text("RTX 5080,streamer\nRTX 5090\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="line 2"):
+            list(read_pairs(f))
+
+
+class TestCatalogPairs:
+    def test_distinct_gpus_times_audiences(self, tmp_path):
+        f = tmp_path / "products.csv"
+        _write_catalog(
+            [
+                ["A", "", "HelloComp AMD GAMER Pro 5070", ""],
+                ["B", "", "HelloComp Intel GAMER Pro 5070", ""],
+                ["C", "", "HelloComp AMD GAMER Extreme 5090", ""],
+                ["D", "", "Motospeed SK62 White", ""],
+            ],
+            f,
+        )
+        assert list(iter_catalog_gpus(f)) == ["5070", "5090"]
+        pairs = list(catalog_pairs(f, audiences=["x", "y"]))
+        assert pairs == [("5070", "x"), ("5070", "y"), ("5090", "x"), ("5090", "y")]
+
+
+class TestRunBounded:
+    def test_all_results_with_indices(self):
+        results = dict(run_bounded(lambda x: x * 2, range(50), max_workers=4))
+        assert results == {i: i * 2 for i in range(50)}
+
+    def test_pulls_bounded_window(self):
+        pulled = 0
+        lock = threading.Lock()
+
+        def source():
+            nonlocal pulled
+            for i in range(1000):
+                with lock:
+                    pulled += 1
+                yield i
+
+        stream = run_bounded(lambda x: x, source(), max_workers=3)
+        next(stream)
+        assert pulled <= 2 * 3 + 1
+        stream.close()
+
+    def test_completion_order(self):
+        def work(x):
+            time.sleep(0.05 if x == 0 else 0)
+            return x
+
+        order = [i for i, _ in run_bounded(work, range(4), max_workers=4)]
+        assert order[-1] == 0
+
+
+class TestWriteNdjson:
+    def test_one_line_per_record(self):
+        out = io.StringIO()
+        assert write_ndjson(({"n": i, "t": "č"} for i in range(3)), out) == 3
+        lines = out.getvalue().splitlines()
+        assert [json.loads(line)["n"] for line in lines] == [0, 1, 2]
+        assert "č" in lines[0]
@@ -0,0 +1,136 @@
+"""Tests for content_automation.catalog."""
+
+import csv
+from pathlib import Path
+
+import pytest
+
+from content_automation import catalog as catalog_module
+from content_automation.catalog import ProductCatalog, normalise_gpu
+from content_automation.lootbox_seo import (
+    build_comparison_table,
+    generate_full_seo_content,
+    generate_seo_paragraph,
+    generate_tldr,
+)
+from content_automation.models import Product
+
+
+def _make_products() -> list[Product]:
+    return [
+        Product(code="A", name="HelloComp AMD GAMER Pro 5070"),
+        Product(code="B", name="HelloComp AMD GAMER Extreme 5070 Ti"),
+        Product(code="C", name="HelloComp Intel GAMER SE8 3050"),
+        Product(code="D", name="HelloComp AMD GAMER Pro 5070"),  # duplicate name
+        Product(code="E", name="HelloComp Intel GAMER Pro RTX 5070 Ti"),
+    ]
+
+
+def _write_csv(rows: list[list[str]], path: Path) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh, delimiter=";")
+        writer.writerow(["code", "pairCode", "name", "xmlFeedName", ""])
+        for row in rows:
+            writer.writerow(row)
+
+
+class TestNormaliseGpu:
+    def test_equivalent_labels(self):
+        assert normalise_gpu("RTX 5070 Ti") == "5070TI"
+        assert normalise_gpu("5070ti") == "5070TI"
+
+    def test_keeps_amd_prefix(self):
+        assert normalise_gpu("RX 9070 XT") == "RX9070XT"
+
+
+class TestProductCatalog:
+    def test_sequence_protocol(self):
+        catalog = ProductCatalog(_make_products())
+        assert len(catalog) == 5
+        assert catalog[0].code == "A"
+        assert [p.code for p in catalog] == ["A", "B", "C", "D", "E"]
+
+    def test_filter_by_gpu(self):
+        catalog = ProductCatalog(_make_products())
+        assert [p.code for p in catalog.filter(gpu="RTX 5070 Ti")] == ["B", "E"]
+
+    def test_filter_by_tier_and_platform(self):
+        catalog = ProductCatalog(_make_products())
+        codes = [p.code for p in catalog.filter(tier="pro", platform="amd")]
+        assert codes == ["A", "D"]
+
+    def test_filter_by_name_matches_substring_semantics(self):
+        products = _make_products()
+        catalog = ProductCatalog(products)
+        for fragment in ["5070", "5070 ti", "70 t", "gamer pro", "intel", "xyz"]:
+            expected = [p.code for p in products if fragment in p.name.lower()]
+            assert [p.code for p in catalog.filter(name=fragment)] == expected
+
+    def test_name_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(catalog_module, "NAME_CACHE_SIZE", 4)
+        catalog = ProductCatalog(_make_products())
+        for i in range(10):
+            catalog.filter(name=f"query {i}")
+        assert len(catalog._name_cache) <= 4
+        assert [p.code for p in catalog.filter(name="intel")] == ["C", "E"]
+
+    def test_unique_views(self):
+        catalog = ProductCatalog(_make_products())
+        assert [p.code for p in catalog.unique_products()] == ["A", "B", "C", "E"]
+        assert [p.code for p in catalog.filter(name="5070", unique=True)] == ["A", "B", "E"]
+        assert len(catalog.unique_names()) == 4
+
+    def test_family_views(self):
+        products = _make_products() + [
+            Product(code="F", name="HelloComp AMD GAMER Pro 5070 White"),
+        ]
+        catalog = ProductCatalog(products)
+        families = catalog.families()
+        assert [[p.code for p in f.products] for f in families] == [
+            ["A", "D", "F"], ["B"], ["C"], ["E"]
+        ]
+        assert catalog.family_of(5) == catalog.family_of(0) == 0
+        assert [p.code for p in catalog.filter(name="5070", per_family=True)] == ["A", "B", "E"]
+        assert [p.code for p in catalog.filter(name="white", per_family=True)] == ["F"]
+
+    def test_given_families(self):
+        products = _make_products()
+        catalog = ProductCatalog(products, families=[0, 0, 1, 0, 0])
+        assert [p.code for p in catalog.filter(name="5070", per_family=True)] == ["A"]
+        with pytest.raises(ValueError):
+            ProductCatalog(products, families=[0])
+
+    def test_from_csv_gaming_only(self, tmp_path):
+        csv_file = tmp_path / "products.csv"
+        _write_csv(
+            [
+                ["A", "", "HelloComp AMD GAMER Pro 5070", ""],
+                ["B", "", "Motospeed SK62 White", ""],
+            ],
+            csv_file,
+        )
+        assert len(ProductCatalog.from_csv(csv_file)) == 2
+        assert len(ProductCatalog.from_csv(csv_file, gaming_only=True)) == 1
+
+
+class TestLootboxWithCatalog:
+    def test_table_matches_list(self):
+        products = _make_products()
+        catalog = ProductCatalog(products)
+        for gpu, tier in [(None, None), ("5070", None), ("5070", "Pro"), (None, "Extreme")]:
+            from_list = build_comparison_table(products, gpu_filter=gpu, tier_filter=tier)
+            from_catalog = build_comparison_table(catalog, gpu_filter=gpu, tier_filter=tier)
+            assert from_list == from_catalog
+
+    def test_paragraph_and_tldr_match_list(self):
+        products = _make_products()
+        catalog = ProductCatalog(products)
+        for gpu in [None, "5070", "9999"]:
+            assert generate_seo_paragraph(catalog, gpu) == generate_seo_paragraph(products, gpu)
+            assert generate_tldr(catalog, gpu) == generate_tldr(products, gpu)
+
+    def test_full_content_uses_catalog(self):
+        catalog = ProductCatalog(_make_products())
+        data = generate_full_seo_content(gpu_filter="5070", catalog=catalog)
+        assert "5070 Ti" in data["table_md"]
+        assert "3050" not in data["table_md"]
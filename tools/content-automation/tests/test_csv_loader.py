@@ -1,12 +1,21 @@
 """Tests for content_automation.csv_loader."""
 
 import csv
+import os
+import pickle
 import tempfile
 from pathlib import Path
 
+import pytest
+
+from content_automation import csv_loader
 from content_automation.csv_loader import (
     filter_gaming_pcs,
+    iter_gaming_pcs,
+    iter_products,
+    iter_unique_products,
     load_products,
+    snapshot_path,
     unique_product_names,
 )
 
@@ -80,3 +89,189 @@ class TestUniqueProductNames:
         products = load_products(csv_file)
         names = unique_product_names(products)
         assert len(names) == 2
+
+
+class TestIterProducts:
+    def test_is_lazy_generator(self, tmp_path):
+        csv_file = tmp_path / "products.csv"
+        _write_csv([["A", "", "HelloComp AMD GAMER Pro 5070", ""]], csv_file)
+        stream = iter_products(csv_file)
+        assert next(stream).code == "A"
+        assert next(stream, None) is None
+
+    def test_matches_load_products(self, tmp_path):
+        csv_file = tmp_path / "products.csv"
+        _write_csv(
+            [
+                ["A", "1", "HelloComp AMD GAMER Pro 5070", "Feed A"],
+                ["B", "", "Motospeed SK62 White", ""],
+                ["", "", "Missing code", ""],
+            ],
+            csv_file,
+        )
+        assert list(iter_products(csv_file)) == load_products(csv_file)
+
+    def test_streaming_pipeline(self, tmp_path):
+        csv_file = tmp_path / "products.csv"
+        _write_csv(
+            [
+                ["A1", "", "HelloComp AMD GAMER Pro 5070", ""],
+                ["A2", "", "HelloComp AMD GAMER Pro 5070", ""],
+                ["B1", "", "Motospeed SK62 White", ""],
+                ["C1", "", "HelloComp Intel GAMER SE8 3050", ""],
+            ],
+            csv_file,
+        )
+        codes = [p.code for p in iter_unique_products(iter_gaming_pcs(iter_products(csv_file)))]
+        assert codes == ["A1", "C1"]
+
+
+class TestSnapshot:
+    def _csv(self, tmp_path):
+        csv_file = tmp_path / "products.csv"
+        _write_csv(
+            [
+                ["A1", "7", "HelloComp AMD GAMER Pro 5070", "Feed A"],
+                ["A2", "7", "HelloComp AMD GAMER Pro 5070", ""],
+                ["B1", "", "Motospeed SK62 White", ""],
+            ],
+            csv_file,
+        )
+        return csv_file
+
+    def test_writes_snapshot_next_to_source(self, tmp_path):
+        csv_file = self._csv(tmp_path)
+        products = load_products(csv_file, use_snapshot=True)
+        assert snapshot_path(csv_file).exists()
+        assert products == load_products(csv_file)
+
+    def test_disabled_by_default(self, tmp_path):
+        csv_file = self._csv(tmp_path)
+        load_products(csv_file)
+        assert not snapshot_path(csv_file).exists()
+
+    def test_reads_snapshot_with_derived_attributes(self, tmp_path, monkeypatch):
+        csv_file = self._csv(tmp_path)
+        load_products(csv_file, use_snapshot=True)
+
+        def _no_parse(*args, **kwargs):
+            raise AssertionError("CSV should not be re-parsed")
+
+        monkeypatch.setattr(csv_loader, "iter_products", _no_parse)
+        products = load_products(csv_file, use_snapshot=True)
+        assert [p.code for p in products] == ["A1", "A2", "B1"]
+        assert products[0].xml_feed_name == "Feed A"
+        assert products[1].xml_feed_name is None
+        assert products[0]._derived == ("HelloComp AMD GAMER Pro 5070", "5070", "Pro", "AMD")
+
+    def test_changed_source_invalidates(self, tmp_path):
+        csv_file = self._csv(tmp_path)
+        load_products(csv_file, use_snapshot=True)
+        _write_csv([["Z9", "", "HelloComp Intel GAMER SE8 3050", ""]], csv_file)
+        products = load_products(csv_file, use_snapshot=True)
+        assert [p.code for p in products] == ["Z9"]
+
+    def test_touched_but_unchanged_source_reuses_snapshot(self, tmp_path, monkeypatch):
+        csv_file = self._csv(tmp_path)
+        load_products(csv_file, use_snapshot=True)
+        stat = csv_file.stat()
+        os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        monkeypatch.setattr(csv_loader, "iter_products", None)
+        assert len(load_products(csv_file, use_snapshot=True)) == 3
+
+    def test_corrupt_snapshot_is_rebuilt(self, tmp_path):
+        csv_file = self._csv(tmp_path)
+        snapshot_path(csv_file).write_bytes(b"not a pickle")
+        assert len(load_products(csv_file, use_snapshot=True)) == 3
+        assert len(load_products(csv_file, use_snapshot=True)) == 3
+
+    @pytest.mark.parametrize(
+        "rows",
+        [
+            [("A1", "7")],
+            [("A1", None, 5070, None, None, None, None)],
+            5,
+            [None],
+        ],
+        ids=["short-row", "wrong-type", "not-a-list", "not-a-row"],
+    )
+    def test_malformed_rows_fall_back_to_the_csv(self, tmp_path, rows):
+        csv_file = self._csv(tmp_path)
+        expected = load_products(csv_file, use_snapshot=True)
+        with open(snapshot_path(csv_file), "rb") as fh:
+            header = pickle.load(fh)
+        with open(snapshot_path(csv_file), "wb") as fh:
+            pickle.dump(header, fh)
+            pickle.dump(rows, fh)
+        assert load_products(csv_file, use_snapshot=True) == expected
+        # The damaged snapshot was replaced by a good one.
+        assert load_products(csv_file, use_snapshot=True) == expected
+
+
+class TestParallelLoad:
+    ROWS = [
+        ["A", "1", "HelloComp AMD GAMER Pro 5070", "Feed A"],
+        ["B", "", 'Monitor 27" ;\nsecond line', ""],
+        ["", "", "Missing code", ""],
+        ["C"],
+        ["D", "2", 'HelloComp Intel GAMER "SE8" 3050', ""],
+    ]
+
+    def _force_parallel(self, monkeypatch):
+        monkeypatch.setattr(csv_loader, "PARALLEL_MIN_BYTES", 0)
+        monkeypatch.setattr(csv_loader, "MIN_CHUNK_BYTES", 1)
+
+    def test_matches_serial_parse(self, tmp_path, monkeypatch):
+        self._force_parallel(monkeypatch)
+        csv_file = tmp_path / "products.csv"
+        _write_csv(self.ROWS * 50, csv_file)
+        expected = load_products(csv_file)
+        assert load_products(csv_file, workers=2) == expected
+        assert len(expected) == 150
+
+    def test_quoted_rows_still_parse_in_parallel(self, tmp_path, monkeypatch):
+        self._force_parallel(monkeypatch)
+        csv_file = tmp_path / "products.csv"
+        _write_csv(self.ROWS * 50, csv_file)
+        assert csv_loader._load_parallel(csv_file, 2) == load_products(csv_file)
+
+    def test_stray_quote_in_unquoted_field_falls_back(self, tmp_path, monkeypatch):
+        # csv treats the inch mark as a literal, which flips the quote parity
+        # that record_spans splits on.
+        self._force_parallel(monkeypatch)
+        csv_file = tmp_path / "products.csv"
+        csv_file.write_text(
+            'code;pairCode;name;xmlFeedName;\nA;;Monitor 27" wide;\nB;;"multi\nline";\n'
+            + "C;;HelloComp GAMER Pro 5070;\n" * 20,
+            encoding="utf-8",
+        )
+        # Tiny chunks: the parity rule ends the first one right after "multi.
+        _, spans = csv_loader.record_spans(csv_file.read_bytes(), 1)
+        assert len(spans) > 1
+        expected = load_products(csv_file)
+        assert expected[1].name == "multi\nline"
+        assert load_products(csv_file, workers=64) == expected
+
+    def test_stray_quote_in_header_falls_back(self, tmp_path, monkeypatch):
+        self._force_parallel(monkeypatch)
+        csv_file = tmp_path / "products.csv"
+        csv_file.write_text(
+            'code;pair"Code;name;\nA;;"x\ny";\nD;;Fan 12" RGB;\n'
+            + "B;;HelloComp GAMER SE 3050;\n" * 20,
+            encoding="utf-8",
+        )
+        header_end, spans = csv_loader.record_spans(csv_file.read_bytes(), 1)
+        assert header_end > len("code;pair\"Code;name;\n") and len(spans) > 1
+        assert load_products(csv_file, workers=64) == load_products(csv_file)
+
+    def test_spans_respect_quoted_newlines(self):
+        data = b'h1;h2\na;"x\ny"\nb;"q""\n"""\nc;d'
+        header_end, spans = csv_loader.record_spans(data, 1)
+        assert data[:header_end] == b"h1;h2\n"
+        assert [data[s:e] for s, e in spans] == [b'a;"x\ny"\n', b'b;"q""\n"""\n', b"c;d"]
+
+    def test_small_file_stays_serial(self, tmp_path, monkeypatch):
+        csv_file = tmp_path / "products.csv"
+        _write_csv(self.ROWS, csv_file)
+        monkeypatch.setattr(csv_loader, "_parse_span", None)  # would fail if used
+        assert load_products(csv_file, workers=4) == load_products(csv_file)
@@ -0,0 +1,84 @@
+"""Tests for content_automation.families."""
+
+from content_automation.families import (
+    FamilyLinker,
+    family_ids,
+    family_representatives,
+    group_families,
+    variant_stem,
+)
+from content_automation.models import Product
+
+
+def _make_products() -> list[Product]:
+    return [
+        Product(code="1", name="HelloComp AMD GAMER Max 4080"),
+        Product(code="2", name="darkFlash A290 (White)"),
+        Product(code="3", name="HelloComp AMD GAMER Max 4080 White"),
+        Product(code="4", name="darkFlash A290 (Black)"),
+        Product(code="5", name="Motospeed SK62 White", xml_feed_name="Motospeed SK62 Red bílá"),
+        Product(code="6", name="Motospeed SK62 Red"),
+        Product(code="7", name="HelloComp AMD GAMER Pro 4070", pair_code="P1"),
+        Product(code="8", name="HelloComp AMD GAMER Pro 4070 Bundle", pair_code="P1"),
+        # Copy-pasted feed names must not link unrelated products.
+        Product(code="9", name="Lenovo Legion 5 Pro", xml_feed_name="Lenovo Legion 5 82JQ"),
+        Product(code="10", name="ASUS Vivobook S15", xml_feed_name="Lenovo Legion 5 82JQ"),
+    ]
+
+
+def _code_sets(families) -> set[frozenset[str]]:
+    return {frozenset(p.code for p in f.products) for f in families}
+
+
+class TestVariantStem:
+    def test_drops_colours_and_diacritics(self):
+        assert variant_stem("darkFlash A290 (White)") == "darkflash a290"
+        assert variant_stem("Motospeed SK62 Red bílá") == "motospeed sk62"
+        assert variant_stem(None) == ""
+
+    def test_keeps_model_tokens(self):
+        assert variant_stem("HelloComp AMD GAMER Pro 5070 Ti") == "hellocomp amd gamer pro 5070 ti"
+
+
+class TestFamilies:
+    def test_family_ids(self):
+        assert family_ids(_make_products()) == [0, 1, 0, 1, 2, 2, 3, 3, 4, 5]
+
+    def test_order_independent(self):
+        products = _make_products()
+        forward = group_families(products)
+        backward = group_families(list(reversed(products)))
+        assert _code_sets(forward) == _code_sets(backward)
+
+    def test_late_link_merges_families(self):
+        products = [
+            Product(code="a", name="Mouse X", pair_code="P"),
+            Product(code="b", name="Mouse Y"),
+            Product(code="c", name="Mouse Y (Black)", pair_code="P"),
+        ]
+        assert family_ids(products) == [0, 0, 0]
+
+    def test_linker_resolves_a_selection(self):
+        products = [
+            Product(code="a", name="Mouse X", pair_code="P"),
+            Product(code="b", name="Mouse Y"),
+            Product(code="z", name="Keyboard Z"),
+            Product(code="c", name="Mouse Y (Black)", pair_code="P"),
+        ]
+        linker = FamilyLinker()
+        provisional = [linker.add(p) for p in products]
+        # "c" links "a" and "b" after both were seen; it need not be kept.
+        assert linker.resolve([provisional[2], provisional[1], provisional[0]]) == [0, 1, 1]
+
+    def test_views(self):
+        families = group_families(_make_products())
+        assert len(families) == 6
+        assert families[0].name == "HelloComp AMD GAMER Max 4080"
+        assert families[0].variant_names() == [
+            "HelloComp AMD GAMER Max 4080",
+            "HelloComp AMD GAMER Max 4080 White",
+        ]
+        assert families[1].key == "darkflash a290"
+        assert [p.code for p in family_representatives(_make_products())] == [
+            "1", "2", "5", "7", "9", "10"
+        ]
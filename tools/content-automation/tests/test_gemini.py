@@ -0,0 +1,115 @@
+"""Tests for content_automation.gemini (fake SDK — no network access)."""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from content_automation import gemini
+from content_automation.hookmaster import generate
+from content_automation.omnichannel import distribute
+from content_automation.trending_socials import (
+    ContentTone,
+    SocialPlatform,
+    TrendingSocialsGenerator,
+)
+
+
+class TestSharedClient:
+    def test_client_created_once_per_key(self, fake_genai):
+        assert gemini.get_client("k1") is gemini.get_client("k1")
+        assert gemini.get_client("k2") is not gemini.get_client("k1")
+        assert len(fake_genai.clients) == 2
+
+    def test_client_shared_across_threads(self, fake_genai):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            clients = list(pool.map(lambda _: gemini.get_client("k"), range(32)))
+        assert len({id(c) for c in clients}) == 1
+        assert len(fake_genai.clients) == 1
+
+    def test_generate_content_passes_config(self, fake_genai):
+        fake_genai.responder = lambda call: "hello"
+        text = gemini.generate_content(
+            "prompt", "k", system_instruction="sys", temperature=0.5
+        )
+        assert text == "hello"
+        call = fake_genai.calls[0]
+        assert call["model"] == gemini.DEFAULT_MODEL
+        assert call["config"].system_instruction == "sys"
+        assert call["config"].temperature == 0.5
+        assert not hasattr(call["config"], "max_output_tokens")
+
+
+class TestGeneratorsUseSharedClient:
+    def test_batch_reuses_one_client(self, fake_genai):
+        def respond(call):
+            if "seo_description" in call["contents"]:
+                return json.dumps({"hooks": ["a", "b", "c"], "script": "s", "seo_description": "d"})
+            if '"tiktok"' in call["contents"]:
+                return json.dumps({"tiktok": "t", "instagram": "i", "facebook": "f"})
+            return json.dumps({"variants": [{"body": "v", "hashtags": [], "emojis": []}]})
+
+        fake_genai.responder = respond
+        for _ in range(3):
+            assert generate("RTX 5080", "hráč Warzone", api_key="k").hooks == ["a", "b", "c"]
+            assert distribute("RTX 5080", "hráč Warzone", api_key="k").tiktok == "t"
+        gen = TrendingSocialsGenerator(api_key="k")
+        result = gen.generate_for_topic(
+            platforms=[SocialPlatform.TIKTOK], tones=[ContentTone.CASUAL]
+        )
+        assert result.posts[0].body == "v"
+        assert len(fake_genai.clients) == 1
+        # Repeated hookmaster/omnichannel inputs are served from the cache.
+        assert len(fake_genai.calls) == 3
+
+
+class TestResponseCaching:
+    def test_repeated_call_hits_cache(self, fake_genai):
+        fake_genai.responder = lambda call: '{"ok": true}'
+        for _ in range(3):
+            text = gemini.generate_content(
+                "prompt", "k", response_mime_type="application/json"
+            )
+            assert text == '{"ok": true}'
+        assert len(fake_genai.calls) == 1
+        stats = gemini.get_cache().stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+
+    def test_config_is_part_of_key(self, fake_genai):
+        fake_genai.responder = lambda call: "text"
+        gemini.generate_content("prompt", "k", temperature=0.1)
+        gemini.generate_content("prompt", "k", temperature=0.9)
+        gemini.generate_content("prompt", "k", system_instruction="other")
+        assert len(fake_genai.calls) == 3
+
+    def test_refresh_bypasses_lookup_but_stores(self, fake_genai):
+        answers = iter(["first", "second"])
+        fake_genai.responder = lambda call: next(answers)
+        assert gemini.generate_content("prompt", "k") == "first"
+        assert gemini.generate_content("prompt", "k", cache_mode="refresh") == "second"
+        assert gemini.generate_content("prompt", "k") == "second"
+        assert len(fake_genai.calls) == 2
+
+    def test_off_mode(self, fake_genai):
+        gemini.set_cache_mode("off")
+        fake_genai.responder = lambda call: "text"
+        gemini.generate_content("prompt", "k")
+        gemini.generate_content("prompt", "k")
+        assert len(fake_genai.calls) == 2
+
+    def test_invalid_json_not_cached(self, fake_genai):
+        fake_genai.responder = lambda call: "not json"
+        gemini.generate_content("prompt", "k", response_mime_type="application/json")
+        gemini.generate_content("prompt", "k", response_mime_type="application/json")
+        assert len(fake_genai.calls) == 2
+
+
+class TestStreaming:
+    def test_stream_yields_chunks_and_caches(self, fake_genai):
+        fake_genai.responder = lambda call: '{"ok": true}'
+        fake_genai.chunk_size = 3
+        chunks = list(gemini.stream_content("p", "k", response_mime_type="application/json"))
+        assert len(chunks) == 4 and "".join(chunks) == '{"ok": true}'
+        assert list(gemini.stream_content("p", "k", response_mime_type="application/json")) == [
+            '{"ok": true}'
+        ]
+        assert len(fake_genai.calls) == 1
@@ -0,0 +1,185 @@
+"""Tests for scripts/heureka-to-json.py (loaded from the repository root)."""
+
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import pytest
+
+_SCRIPT = Path(__file__).resolve().parents[3] / "scripts" / "heureka-to-json.py"
+
+_CATEGORIES = [
+    "Heureka.cz | Elektronika | Počítače a notebooky | Stolní počítače",
+    "Heureka.cz | Elektronika | Počítače a notebooky | Komponenty | Grafické karty",
+    "Heureka.cz | Elektronika | Počítače a notebooky | Monitory",
+    "Heureka.cz | Elektronika | Sluchátka",
+]
+
+
+@pytest.fixture(scope="module")
+def heureka():
+    spec = importlib.util.spec_from_file_location("heureka_to_json", _SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _item(item_id: str, price: int, category: str, name: str = "") -> str:
+    name = name or f"HelloComp GAMER {item_id}"
+    return (
+        f"<SHOPITEM><ITEM_ID>{item_id}</ITEM_ID>"
+        f"<PRODUCTNAME>{escape(name)}</PRODUCTNAME>"
+        f"<URL>https://www.hellocomp.cz/p/{item_id}/</URL>"
+        f"<PRICE_VAT>{price}</PRICE_VAT>"
+        f"<CATEGORYTEXT>{escape(category)}</CATEGORYTEXT>"
+        "<DELIVERY_DATE>0</DELIVERY_DATE>"
+        "<PARAM><PARAM_NAME>Model grafické karty</PARAM_NAME><VAL>NVIDIA RTX 5070</VAL></PARAM>"
+        "</SHOPITEM>\n"
+    )
+
+
+def _write_feed(path: Path, items: list[str]) -> str:
+    path.write_text(
+        '<?xml version="1.0" encoding="utf-8"?>\n<SHOP>\n' + "".join(items) + "</SHOP>\n",
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def _feed_items(prices: dict[int, int] | None = None, count: int = 12) -> list[str]:
+    prices = prices or {}
+    return [
+        _item(str(i), prices.get(i, 1000 + 500 * i), _CATEGORIES[i % len(_CATEGORIES)])
+        for i in range(count)
+    ]
+
+
+def _read(path: str) -> str:
+    with open(path, encoding="utf-8") as fh:
+        return fh.read()
+
+
+def _convert(heureka, input_path: str, output_path: str, compact: bool = False) -> str:
+    heureka.convert(input_path, output_path, compact)
+    return _read(output_path)
+
+
+class TestIncremental:
+    def test_unchanged_feed_skips_write(self, heureka, tmp_path):
+        feed = _write_feed(tmp_path / "a.xml", _feed_items())
+        out = str(tmp_path / "out" / "products.json")
+        first = heureka.convert_incremental(feed, out)
+        assert first["added"] == 12 and first["written"]
+        second = heureka.convert_incremental(feed, out)
+        assert second["unchanged"] == 12 and not second["written"]
+        assert _read(out) == _convert(heureka, feed, str(tmp_path / "fresh.json"))
+
+    def test_changed_item_is_rebuilt(self, heureka, tmp_path):
+        out = str(tmp_path / "products.json")
+        heureka.convert_incremental(_write_feed(tmp_path / "a.xml", _feed_items()), out)
+        feed_b = _write_feed(tmp_path / "b.xml", _feed_items({7: 99999}))
+        summary = heureka.convert_incremental(feed_b, out)
+        assert summary["changed"] == 1
+        assert _read(out) == _convert(heureka, feed_b, str(tmp_path / "fresh.json"))
+
+    def test_full_run_in_between_invalidates_positions(self, heureka, tmp_path):
+        feed_a = _write_feed(tmp_path / "a.xml", _feed_items())
+        feed_b = _write_feed(tmp_path / "b.xml", _feed_items({7: 99999}))
+        out = str(tmp_path / "products.json")
+        heureka.convert_incremental(feed_a, out)
+        heureka.convert(feed_b, out)
+        assert not os.path.exists(heureka.fingerprints_path(out))
+        heureka.convert_incremental(feed_a, out)
+        assert _read(out) == _convert(heureka, feed_a, str(tmp_path / "fresh.json"))
+
+    def test_stale_sidecar_position_is_not_reused(self, heureka, tmp_path):
+        feed_a = _write_feed(tmp_path / "a.xml", _feed_items())
+        feed_b = _write_feed(tmp_path / "b.xml", _feed_items({7: 99999}))
+        out = str(tmp_path / "products.json")
+        heureka.convert_incremental(feed_a, out)
+        sidecar = _read(heureka.fingerprints_path(out))
+        # The output is replaced behind the sidecar's back (e.g. restored from elsewhere).
+        heureka.convert(feed_b, out)
+        Path(heureka.fingerprints_path(out)).write_text(sidecar, encoding="utf-8")
+        heureka.convert_incremental(feed_a, out)
+        assert _read(out) == _convert(heureka, feed_a, str(tmp_path / "fresh.json"))
+
+
+class TestStreaming:
+    @pytest.mark.parametrize("compact", [False, True])
+    @pytest.mark.parametrize(
+        "items",
+        [
+            pytest.param([], id="empty"),
+            pytest.param(_feed_items(), id="buckets"),
+            pytest.param(
+                # Price ties inside a bucket keep feed order, repeated IDs included.
+                _feed_items({3: 5000, 5: 5000, 7: 5000})
+                + [_item("3", 5000, _CATEGORIES[3], "Repeat 3"), _item("1", 99, _CATEGORIES[1])],
+                id="duplicate-ids",
+            ),
+        ],
+    )
+    def test_matches_convert_byte_for_byte(self, heureka, tmp_path, items, compact):
+        feed = _write_feed(tmp_path / "feed.xml", items)
+        streamed = str(tmp_path / "streamed" / "products.json")
+        heureka.convert_streaming(feed, streamed, compact)
+        expected = _convert(heureka, feed, str(tmp_path / "full.json"), compact)
+        with open(streamed, "rb") as fh:
+            assert fh.read() == expected.encode("utf-8")
+
+
+class TestCompact:
+    _DOC = {
+        "meta": {"source": "heureka", "total": 2},
+        "products": [
+            {"name": "Sluchátka „Pro“ — bílá", "price": 1299.9, "tags": ["a\"b", "\\"]},
+            {"name": "Monitor 27\"", "price": 5000.0, "specs": {}, "ids": []},
+        ],
+    }
+
+    def test_indented_output_uses_one_space(self, heureka):
+        assert heureka.dump_json(self._DOC) == json.dumps(self._DOC, ensure_ascii=False, indent=1)
+
+    def test_orjson_and_stdlib_agree(self, heureka, monkeypatch):
+        pytest.importorskip("orjson")
+        assert heureka.orjson is not None
+        fast = heureka.dump_json(self._DOC, compact=True)
+        monkeypatch.setattr(heureka, "orjson", None)
+        assert heureka.dump_json(self._DOC, compact=True) == fast
+        assert fast == json.dumps(self._DOC, ensure_ascii=False, separators=(",", ":"))
+
+    def test_cli_compact_output(self, heureka, tmp_path):
+        feed = _write_feed(tmp_path / "feed.xml", _feed_items())
+        indented = json.loads(_convert(heureka, feed, str(tmp_path / "indented.json")))
+        out = tmp_path / "compact.json"
+        subprocess.run(
+            [sys.executable, str(_SCRIPT), feed, str(out), "--compact"],
+            check=True,
+            capture_output=True,
+        )
+        text = out.read_text(encoding="utf-8")
+        assert json.loads(text) == indented
+        assert text == json.dumps(indented, ensure_ascii=False, separators=(",", ":"))
+
+    def test_indented_write_is_streamed(self, heureka, tmp_path):
+        # The indented document must not be built as one string before writing.
+        products = [
+            {"id": str(i), "name": f"HelloComp GAMER {i}", "price": 1000.0 + i,
+             "category": {"slug": "pc"}, "specs": {"gpu": "RTX 5070", "ram": "32 GB"}}
+            for i in range(2000)
+        ]
+        out = str(tmp_path / "products.json")
+        tracemalloc.start()
+        try:
+            heureka.write_output(out, products, {"pc": len(products)})
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert peak < os.path.getsize(out) / 2
+
@@ -1,6 +1,12 @@
-"""Tests for content_automation.hookmaster (template mode — no API key)."""
+"""Tests for content_automation.hookmaster (templates, and streaming via the fake SDK)."""
 
-from content_automation.hookmaster import HookMasterResult, generate
+import json
+
+from content_automation.hookmaster import HookMasterResult, generate, generate_stream
+
+_AI_HOOKMASTER = json.dumps(
+    {"hooks": ["h1", "h2", "h3"], "script": "s", "seo_description": "d"}
+)
 
 
 class TestGenerate:
@@ -55,3 +61,63 @@ class TestGenerate:
         result = generate("RTX 5070 Ti", "hráč CS2")
         for variant in result.ab_variants:
             assert "RTX 5070 Ti" in variant["hook"]
+
+
+class TestGenerateBatch:
+    def test_covers_all_pairs(self):
+        from content_automation.hookmaster import generate_batch
+
+        pairs = [("RTX 5080", "hráč Warzone"), ("RTX 5070 Ti", "hráč CS2"), ("RTX 5060", "streamer")]
+        results = dict(generate_batch(iter(pairs), max_workers=2))
+        assert sorted(results) == [0, 1, 2]
+        for index, (gpu, audience) in enumerate(pairs):
+            assert results[index].gpu == gpu
+            assert results[index].target_audience == audience
+
+    def test_to_dict_includes_content_items(self):
+        result = generate("RTX 5080", "hráč Warzone")
+        data = result.to_dict()
+        assert data["gpu"] == "RTX 5080"
+        assert len(data["contentItems"]) == 5
+        assert len(data["abVariants"]) == 3
+
+
+class TestGenerateStream:
+    def test_fields_reported_while_streaming(self, fake_genai):
+        text = _AI_HOOKMASTER
+        produced = []
+
+        def chunks():
+            for i in range(0, len(text), 8):
+                produced.append(i)
+                yield text[i : i + 8]
+
+        seen = []
+        fake_genai.responder = lambda call: chunks()
+        result = generate_stream(
+            "RTX 5080", "hráč CS2", api_key="k",
+            on_field=lambda name, value: seen.append((name, value, len(produced))),
+        )
+        assert seen[0][2] < len(produced)  # first hook printed before the stream ended
+        assert [(n, v) for n, v, _ in seen] == [
+            ("hooks", "h1"), ("hooks", "h2"), ("hooks", "h3"),
+            ("script", "s"), ("seo_description", "d"),
+        ]
+        assert fake_genai.calls[0]["stream"] is True
+        assert result.hooks == ["h1", "h2", "h3"]
+        assert result.metrics.counter("fallbacks") == 0
+
+    def test_failure_midway_keeps_received_fields(self, fake_genai):
+        text = _AI_HOOKMASTER
+        cut = text.index("h2") + 4  # "h1" and "h2" complete, then the stream dies
+        fake_genai.responder = lambda call: [text[:cut], RuntimeError("connection reset")]
+        seen = []
+        result = generate_stream(
+            "RTX 5080", "hráč CS2", api_key="k", on_field=lambda n, v: seen.append(n)
+        )
+        assert result.hooks[:2] == ["h1", "h2"]
+        assert len(result.hooks) == 3 and "RTX 5080" in result.hooks[2]
+        assert "RTX 5080" in result.script
+        assert seen == ["hooks", "hooks", "hooks", "script", "seo_description"]
+        assert result.metrics.counter("fallbacks") == 1
+        assert "connection reset" in result.metrics.errors[0]
@@ -0,0 +1,57 @@
+"""Tests for content_automation.json_stream."""
+
+import json
+
+import pytest
+
+from content_automation.json_stream import JsonStreamParser, iter_values
+
+
+DOC = {
+    "hooks": ['Řekni "ahoj"', "druhý\\n", ""],
+    "script": "[0:00] řádek\n[0:03] další",
+    "n": -1.5e3,
+    "flags": [True, False, None],
+    "empty": {},
+    "nested": {"a": [1, [2, {"b": "c"}]]},
+}
+
+EXPECTED = [
+    (("hooks", 0), 'Řekni "ahoj"'),
+    (("hooks", 1), "druhý\\n"),
+    (("hooks", 2), ""),
+    (("script",), "[0:00] řádek\n[0:03] další"),
+    (("n",), -1500.0),
+    (("flags", 0), True),
+    (("flags", 1), False),
+    (("flags", 2), None),
+    (("nested", "a", 0), 1),
+    (("nested", "a", 1, 0), 2),
+    (("nested", "a", 1, 1, "b"), "c"),
+]
+
+
+class TestJsonStreamParser:
+    @pytest.mark.parametrize("size", [1, 2, 7, 1000])
+    def test_any_chunking_gives_same_events(self, size):
+        text = json.dumps(DOC, ensure_ascii=False, indent=2)
+        chunks = [text[i : i + size] for i in range(0, len(text), size)]
+        assert list(iter_values(chunks)) == EXPECTED
+
+    def test_values_reported_as_soon_as_closed(self):
+        parser = JsonStreamParser()
+        assert parser.feed('{"hooks": ["Prvn') == []
+        assert parser.feed('í", "Dru') == [(("hooks", 0), "První")]
+        assert parser.feed('hý"], "n": 4') == [(("hooks", 1), "Druhý")]
+        assert parser.feed("2}") == [(("n",), 42)]
+        assert parser.done
+
+    def test_raw_newline_in_string_is_accepted(self):
+        assert list(iter_values(['{"s": "a\nb"}'])) == [(("s",), "a\nb")]
+
+    @pytest.mark.parametrize(
+        "text", ['{"a": "x', '{"a" 1}', "[1,]", '{"a": 1,}', '{"a": 1}x', '{"a": tru}']
+    )
+    def test_malformed_or_truncated(self, text):
+        with pytest.raises(ValueError):
+            list(iter_values([text]))
@@ -1,15 +1,19 @@
 """Tests for content_automation.lootbox_seo."""
 
 import csv
+import json
 from pathlib import Path
 
+from content_automation.catalog import ProductCatalog
 from content_automation.lootbox_seo import (
     build_comparison_table,
+    generate_all_seo_content,
     generate_full_seo_content,
     generate_seo_paragraph,
     generate_tldr,
     get_keyword_suggestions,
     get_topic_cluster_ctas,
+    group_by_gpu_tier,
 )
 from content_automation.models import Product
 
@@ -23,6 +27,15 @@ def _make_products() -> list[Product]:
     ]
 
 
+def _paired_products() -> list[Product]:
+    # B repeats A's name and carries the pairCode that ties C to the family.
+    return [
+        Product(code="A", name="HelloComp AMD GAMER Pro 5070"),
+        Product(code="B", name="HelloComp AMD GAMER Pro 5070", pair_code="9"),
+        Product(code="C", name="HelloComp AMD GAMER Pro 5070 Ti", pair_code="9"),
+    ]
+
+
 def _write_csv(rows: list[list[str]], path: Path) -> None:
     with open(path, "w", newline="", encoding="utf-8") as fh:
         writer = csv.writer(fh, delimiter=";")
@@ -38,6 +51,30 @@ class TestBuildComparisonTable:
         assert len(table.rows) == 3  # deduped
         assert "HelloComp" in table.title
 
+    def test_colour_variants_form_one_row(self):
+        products = _make_products() + [
+            Product(code="E", name="HelloComp AMD GAMER Pro 5070 White"),
+        ]
+        for source in (products, ProductCatalog(products)):
+            table = build_comparison_table(source, gpu_filter="5070")
+            assert [r.product_name for r in table.rows] == [
+                "HelloComp AMD GAMER Pro 5070",
+                "HelloComp AMD GAMER Extreme 5070 Ti",
+            ]
+        # A filter only the variant matches still finds the family.
+        table = build_comparison_table(products, gpu_filter="white")
+        assert [r.product_name for r in table.rows] == ["HelloComp AMD GAMER Pro 5070 White"]
+
+    def test_list_and_catalog_agree_on_families(self):
+        products = _paired_products()
+        for gpu_filter in (None, "5070", "ti"):
+            from_list = build_comparison_table(products, gpu_filter=gpu_filter)
+            from_catalog = build_comparison_table(ProductCatalog(products), gpu_filter=gpu_filter)
+            assert from_list.rows == from_catalog.rows
+        assert [r.product_name for r in build_comparison_table(products).rows] == [
+            "HelloComp AMD GAMER Pro 5070"
+        ]
+
     def test_gpu_filter(self):
         products = _make_products()
         table = build_comparison_table(products, gpu_filter="5070")
@@ -146,3 +183,132 @@ class TestGenerateFullSEOContent:
         assert len(data["content_items"]) == 2
         assert "HelloComp" in data["tldr"]
         assert isinstance(data["topic_cluster_ctas"], list)
+
+    def test_csv_and_catalog_agree_on_families(self, tmp_path):
+        csv_file = tmp_path / "products.csv"
+        _write_csv([[p.code, p.pair_code or "", p.name, ""] for p in _paired_products()], csv_file)
+        catalog = ProductCatalog.from_csv(csv_file, gaming_only=True)
+        for gpu_filter in ("5070", "5070 ti"):
+            streamed = generate_full_seo_content(gpu_filter=gpu_filter, csv_path=csv_file)
+            indexed = generate_full_seo_content(gpu_filter=gpu_filter, catalog=catalog)
+            for key in ("table_md", "paragraph", "tldr"):
+                assert streamed[key] == indexed[key]
+        assert "1 unikátních konfigurací" in streamed["paragraph"]
+
+    def test_rows_outside_the_filter_still_link_families(self, tmp_path):
+        csv_file = tmp_path / "products.csv"
+        _write_csv(
+            [
+                ["A", "", "HelloComp AMD GAMER Pro 5070", ""],
+                ["C", "9", "HelloComp AMD GAMER Pro 5070 Ti", ""],
+                # Not a 5070, but its pairCode and feed name tie A and C together.
+                ["Z", "9", "HelloComp AMD GAMER Extreme 4090", "HelloComp AMD GAMER Pro 5070"],
+            ],
+            csv_file,
+        )
+        catalog = ProductCatalog.from_csv(csv_file, gaming_only=True)
+        streamed = generate_full_seo_content(gpu_filter="5070", csv_path=csv_file)
+        indexed = generate_full_seo_content(gpu_filter="5070", catalog=catalog)
+        assert streamed["table_md"] == indexed["table_md"]
+        assert "1 unikátních konfigurací" in streamed["paragraph"]
+
+
+class TestGroupByGpuTier:
+    def test_groups_distinct_products(self):
+        groups = group_by_gpu_tier(_make_products())
+        keys = [(g.gpu, g.tier, len(g.products)) for g in groups]
+        assert keys == [("5070", "Pro", 1), ("5070 Ti", "Extreme", 1), ("3050", "SE8", 1)]
+        assert [g.slug for g in groups] == ["5070-pro", "5070ti-extreme", "3050-se8"]
+
+    def test_counts_families(self):
+        products = _make_products() + [
+            Product(code="E", name="HelloComp AMD GAMER Pro 5070 White"),
+        ]
+        assert [len(g.products) for g in group_by_gpu_tier(products)] == [1, 1, 1]
+
+    def test_family_spanning_two_gpus_is_on_both_pages(self):
+        products = _paired_products() + [
+            Product(code="D", name="HelloComp AMD GAMER Pro 5080 White", pair_code="9"),
+            Product(code="E", name="HelloComp AMD GAMER Pro 5080", pair_code="9"),
+        ]
+        groups = group_by_gpu_tier(products)
+        assert [(g.gpu, [p.code for p in g.products]) for g in groups] == [
+            ("5070", ["A"]),
+            ("5070 Ti", ["C"]),
+            ("5080", ["D"]),
+        ]
+
+    def test_skips_products_without_gpu(self):
+        groups = group_by_gpu_tier([Product(code="X", name="HelloComp GAMER voucher")])
+        assert groups == []
+
+
+class TestGenerateAllSEOContent:
+    def test_writes_pages_and_manifest(self, tmp_path):
+        csv_file = tmp_path / "products.csv"
+        _write_csv(
+            [
+                ["A", "", "HelloComp AMD GAMER Pro 5070", ""],
+                ["B", "", "HelloComp Intel GAMER Pro 5070", ""],
+                ["C", "", "HelloComp AMD GAMER Extreme 5070 Ti", ""],
+                ["D", "", "Motospeed SK62", ""],
+            ],
+            csv_file,
+        )
+        out = tmp_path / "seo"
+        manifest = generate_all_seo_content(out, csv_path=csv_file)
+        assert manifest["totalGroups"] == 2
+        assert manifest["totalProducts"] == 3
+        assert json.loads((out / "manifest.json").read_text(encoding="utf-8")) == manifest
+
+        entry = manifest["groups"][0]
+        assert entry["slug"] == "5070-pro"
+        assert entry["productCount"] == 2
+        data = json.loads((out / entry["files"]["json"]).read_text(encoding="utf-8"))
+        assert "HelloComp Intel GAMER Pro 5070" in data["table_md"]
+        assert "5070 Ti" not in data["table_md"]
+        assert "2 unikátních konfigurací" in data["paragraph"]
+        assert (out / "5070-pro.md").read_text(encoding="utf-8").startswith("## ")
+        assert "<table>" in (out / "5070-pro.html").read_text(encoding="utf-8")
+
+    def test_pages_list_every_product_of_the_group(self, tmp_path):
+        csv_file = tmp_path / "products.csv"
+        _write_csv(
+            [
+                ["A", "", "HelloComp AMD GAMER Pro RTX 5070", ""],
+                ["B", "", "HelloComp Intel GAMER Pro 5070", ""],
+                ["C", "", "HelloComp AMD GAMER Extreme 5070Ti", ""],
+                ["D", "", "HelloComp Intel GAMER Extreme 5070 Ti", ""],
+            ],
+            csv_file,
+        )
+        out = tmp_path / "seo"
+        manifest = generate_all_seo_content(out, csv_path=csv_file)
+        assert [(e["slug"], e["productCount"]) for e in manifest["groups"]] == [
+            ("5070-pro", 2),
+            ("5070ti-extreme", 2),
+        ]
+        for entry in manifest["groups"]:
+            data = json.loads((out / entry["files"]["json"]).read_text(encoding="utf-8"))
+            rows = data["table_md"].splitlines()[4:]
+            assert len(rows) == entry["productCount"]
+            assert "2 unikátních konfigurací" in data["paragraph"]
+
+    def test_parallel_output_is_byte_identical(self, tmp_path):
+        csv_file = tmp_path / "products.csv"
+        _write_csv(
+            [[f"P{i}", "", f"HelloComp AMD GAMER {tier} {gpu}", ""]
+             for i, (tier, gpu) in enumerate(
+                 (t, g) for t in ("SE", "Pro", "Max", "Extreme") for g in ("5060", "5070", "5080")
+             )],
+            csv_file,
+        )
+        stamp = "2026-01-01T00:00:00+00:00"
+        serial, parallel = tmp_path / "serial", tmp_path / "parallel"
+        generate_all_seo_content(serial, csv_path=csv_file, created_at=stamp)
+        generate_all_seo_content(parallel, csv_path=csv_file, created_at=stamp, workers=3)
+        names = sorted(f.name for f in serial.iterdir())
+        assert len(names) == 12 * 3 + 1
+        assert names == sorted(f.name for f in parallel.iterdir())
+        for name in names:
+            assert (serial / name).read_bytes() == (parallel / name).read_bytes()
@@ -0,0 +1,125 @@
+"""Tests for content_automation.metrics and its use by the generators."""
+
+import json
+
+import pytest
+
+from content_automation import metrics as m
+from content_automation.cli import hookmaster_main, lootbox_main
+from content_automation.hookmaster import generate
+from content_automation.omnichannel import distribute
+from content_automation.trending_socials import (
+    ContentTone,
+    SocialPlatform,
+    TrendingSocialsGenerator,
+)
+
+HOOKS_JSON = json.dumps({"hooks": ["a", "b", "c"], "script": "s", "seo_description": "d"})
+
+
+class TestMetrics:
+    def test_span_and_counter(self):
+        metrics = m.Metrics("test")
+        with metrics.span(m.API):
+            pass
+        with metrics.span(m.API):
+            pass
+        metrics.incr(m.API_CALLS, 2)
+        data = metrics.to_dict()
+        assert data["spans"]["api"]["count"] == 2
+        assert data["spans"]["api"]["totalMs"] >= 0
+        assert data["counters"] == {"api_calls": 2}
+
+    def test_span_recorded_when_block_raises(self):
+        metrics = m.Metrics()
+        with pytest.raises(ValueError):
+            with metrics.span(m.JSON_PARSE):
+                raise ValueError("boom")
+        assert metrics.span_count(m.JSON_PARSE) == 1
+
+    def test_merge(self):
+        a, b = m.Metrics("t"), m.Metrics("t")
+        a.observe(m.API, 0.1)
+        b.observe(m.API, 0.3)
+        b.incr(m.FALLBACKS)
+        b.record_error(RuntimeError("quota"))
+        total = m.Metrics.combine([a, b], tool="t").to_dict()
+        assert total["spans"]["api"] == {"count": 2, "totalMs": 400.0, "minMs": 100.0, "maxMs": 300.0}
+        assert total["counters"] == {"fallbacks": 1, "api_errors": 1}
+        assert total["errors"] == ["RuntimeError: quota"]
+
+    def test_prometheus_export(self):
+        metrics = m.Metrics("hookmaster")
+        metrics.observe(m.API, 0.25)
+        metrics.incr(m.CACHE_HITS)
+        text = metrics.to_prometheus()
+        assert "# TYPE content_automation_stage_seconds summary" in text
+        assert 'content_automation_stage_seconds_sum{tool="hookmaster",stage="api"} 0.250000' in text
+        assert 'content_automation_stage_seconds_count{tool="hookmaster",stage="api"} 1' in text
+        assert 'content_automation_cache_hits_total{tool="hookmaster"} 1' in text
+
+    def test_write_picks_format_from_suffix(self, tmp_path):
+        metrics = m.Metrics("t")
+        metrics.incr(m.API_CALLS)
+        metrics.write(tmp_path / "m.json")
+        metrics.write(tmp_path / "m.prom")
+        assert json.loads((tmp_path / "m.json").read_text())["counters"] == {"api_calls": 1}
+        assert "content_automation_api_calls_total" in (tmp_path / "m.prom").read_text()
+
+
+class TestGeneratorMetrics:
+    def test_template_run_counts_fallback(self, monkeypatch):
+        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+        result = generate("RTX 5080", "hráč Warzone")
+        assert result.metrics.counter(m.FALLBACKS) == 1
+        assert result.metrics.counter(m.API_CALLS) == 0
+        result.to_json()
+        assert result.metrics.span_count(m.SERIALISE) == 1
+
+    def test_api_run_records_stages(self, fake_genai):
+        fake_genai.responder = lambda call: HOOKS_JSON
+        result = generate("RTX 5080", "hráč Warzone", api_key="k")
+        data = result.metrics.to_dict()
+        assert {"prompt_build", "api", "json_parse"} <= set(data["spans"])
+        assert data["counters"] == {"cache_misses": 1, "api_calls": 1}
+
+        cached = generate("RTX 5080", "hráč Warzone", api_key="k")
+        assert cached.metrics.counter(m.CACHE_HITS) == 1
+        assert cached.metrics.counter(m.API_CALLS) == 0
+
+    def test_api_error_is_recorded(self, fake_genai):
+        def fail(call):
+            raise RuntimeError("quota exceeded")
+
+        fake_genai.responder = fail
+        result = distribute("RTX 5080", "hráč Warzone", api_key="k")
+        assert "HelloComp" in result.tiktok  # template fallback
+        assert result.metrics.counter(m.API_ERRORS) == 1
+        assert result.metrics.counter(m.FALLBACKS) == 1
+        assert result.metrics.errors == ["RuntimeError: quota exceeded"]
+
+    def test_trending_fallbacks_counted_per_job(self, fake_genai):
+        fake_genai.responder = lambda call: "not json"
+        gen = TrendingSocialsGenerator(api_key="k", max_concurrency=4)
+        result = gen.generate_for_topic(
+            platforms=[SocialPlatform.TIKTOK, SocialPlatform.TWITTER],
+            tones=[ContentTone.CASUAL],
+        )
+        assert result.metrics.counter(m.API_CALLS) == 2
+        assert result.metrics.counter(m.FALLBACKS) == 2
+        assert result.metrics.span_count(m.PROMPT_BUILD) == 2
+
+
+class TestCliExport:
+    def test_hookmaster_writes_prometheus(self, monkeypatch, tmp_path, capsys):
+        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+        out = tmp_path / "hookmaster.prom"
+        hookmaster_main(["RTX 5080", "hráč Warzone", "--json", "--metrics", str(out)])
+        json.loads(capsys.readouterr().out)
+        assert 'content_automation_fallbacks_total{tool="hookmaster"} 1' in out.read_text()
+
+    def test_lootbox_writes_json(self, tmp_path, capsys):
+        out = tmp_path / "lootbox.json"
+        lootbox_main(["--gpu", "5070", "--format", "json", "--no-snapshot", "--metrics", str(out)])
+        data = json.loads(out.read_text())
+        assert {"catalog_load", "render", "serialise"} <= set(data["spans"])
@@ -1,10 +1,19 @@
 """Tests for content_automation.models."""
 
+import io
+import json
+
+import pytest
+
+from content_automation import serialise
 from content_automation.models import (
     ContentItem,
     ContentStatus,
     ContentType,
     Product,
+    iter_json_array,
+    new_id,
+    write_json_array,
 )
 
 
@@ -50,6 +59,41 @@ class TestContentItem:
         assert d["sku"] == "SKU-001"
 
 
+    def test_is_slotted(self):
+        item = ContentItem(title="T", body="B", content_type=ContentType.SEO_META)
+        assert not hasattr(item, "__dict__")
+
+
+class TestIds:
+    def test_format(self):
+        item_id = new_id()
+        assert item_id.startswith("cg-") and len(item_id) == 29
+        assert set(item_id[3:]) <= set("0123456789ABCDEFGHJKMNPQRSTVWXYZ")
+
+    def test_unique_and_time_ordered(self):
+        ids = [new_id() for _ in range(5000)]
+        assert len(set(ids)) == len(ids)
+        assert ids == sorted(ids)
+
+
+class TestJsonArray:
+    RECORDS = [
+        ContentItem(title="Hook", body="řádek\n\"dva\"", content_type=ContentType.TIKTOK_HOOK).to_dict(),
+        {"nested": {"list": [1, {"a": None}], "empty": []}},
+    ]
+
+    @pytest.mark.parametrize("indent", [None, 0, 2, 4])
+    @pytest.mark.parametrize("records", [RECORDS, [], [{}]])
+    def test_matches_json_dumps(self, indent, records):
+        expected = serialise.dumps(records, indent=indent)
+        assert "".join(iter_json_array(iter(records), indent)) == expected
+
+    def test_write_streams_to_file(self):
+        out = io.StringIO()
+        write_json_array(iter(self.RECORDS), out)
+        assert json.loads(out.getvalue()) == self.RECORDS
+
+
 class TestProduct:
     def test_gpu_extraction(self):
         p = Product(code="X", name="HelloComp AMD GAMER Pro 5070 Ti")
@@ -78,3 +122,29 @@ class TestProduct:
     def test_platform_none(self):
         p = Product(code="X", name="Koorui GN06 27")
         assert p.platform is None
+
+    def test_uses_slots(self):
+        p = Product(code="X", name="HelloComp AMD GAMER Pro 5070")
+        assert not hasattr(p, "__dict__")
+
+    def test_derived_attributes_memoised(self):
+        p = Product(code="X", name="HelloComp AMD GAMER Pro 5070")
+        assert p.gpu == "5070"
+        assert p._derived is not None
+        cached = p._derived
+        assert p.tier == "Pro"
+        assert p._derived is cached
+
+    def test_renaming_rederives_attributes(self):
+        p = Product(code="X", name="HelloComp AMD GAMER Pro 5070")
+        assert p.platform == "AMD"
+        p.name = "HelloComp Intel GAMER Extreme 5090"
+        assert p.platform == "Intel"
+        assert p.tier == "Extreme"
+        assert p.gpu == "5090"
+
+    def test_equality_ignores_memo(self):
+        a = Product(code="X", name="HelloComp AMD GAMER Pro 5070")
+        b = Product(code="X", name="HelloComp AMD GAMER Pro 5070")
+        _ = a.gpu
+        assert a == b
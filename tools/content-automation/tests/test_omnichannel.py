@@ -1,7 +1,19 @@
-"""Tests for content_automation.omnichannel (template mode — no API key)."""
+"""Tests for content_automation.omnichannel (templates, and streaming via the fake SDK)."""
 
+import csv
+import io
+import json
+
+import pytest
+
+from content_automation.cli import omnichannel_main
 from content_automation.models import ContentType
-from content_automation.omnichannel import OmnichannelResult, distribute
+from content_automation.omnichannel import (
+    OmnichannelResult,
+    distribute,
+    distribute_catalog,
+    distribute_stream,
+)
 
 
 class TestDistribute:
@@ -40,11 +52,101 @@ class TestDistribute:
         assert any("Facebook" in t for t in titles)
 
     def test_to_json_is_valid(self):
-        import json
-
         result = distribute("RTX 5080", "hráč Warzone")
         parsed = json.loads(result.to_json())
         assert isinstance(parsed, list)
         assert len(parsed) == 3
         for item in parsed:
             assert item["type"] == "social-post"
+
+
+@pytest.fixture
+def catalogue_csv(tmp_path):
+    path = tmp_path / "products.csv"
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh, delimiter=";")
+        writer.writerow(["code", "pairCode", "name", "xmlFeedName", ""])
+        writer.writerow(["A", "", "HelloComp AMD GAMER Pro 5070", ""])
+        writer.writerow(["B", "", "HelloComp Intel GAMER Pro 5070 White", ""])
+        writer.writerow(["C", "", "HelloComp AMD GAMER Extreme 5090", ""])
+        writer.writerow(["D", "", "Motospeed SK62 White", ""])
+    return path
+
+
+
+class TestDistributeStream:
+    def test_truncated_stream_falls_back_per_platform(self, fake_genai):
+        fake_genai.responder = lambda call: '{"tiktok": "AI tiktok", "instagram": "AI in'
+        seen = []
+        result = distribute_stream(
+            "RTX 5080", "hráč CS2", api_key="k", on_field=lambda p, t: seen.append(p)
+        )
+        assert result.tiktok == "AI tiktok"
+        assert "RTX 5080" in result.instagram and "RTX 5080" in result.facebook
+        assert seen == ["tiktok", "instagram", "facebook"]
+
+class TestDistributeCatalog:
+    def test_offline_writes_three_items_per_pair(self, catalogue_csv):
+        out = io.StringIO()
+        progress = []
+        report = distribute_catalog(
+            out,
+            catalogue_csv,
+            audiences=["hráč CS2", "casual gamer"],
+            on_progress=lambda done, total: progress.append((done, total)),
+        )
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert len(records) == report.items == 12
+        assert report.pairs == 4
+        assert progress == [(1, 4), (2, 4), (3, 4), (4, 4)]
+        assert {r["type"] for r in records} == {"social-post"}
+        assert records[0]["title"] == "TikTok post — 5070"
+        assert "hráč CS2" in records[1]["body"]
+        assert [(r["gpu"], r["targetAudience"]) for r in records[::3]] == [
+            ("5070", "hráč CS2"),
+            ("5070", "casual gamer"),
+            ("5090", "hráč CS2"),
+            ("5090", "casual gamer"),
+        ]
+        assert report.metrics.counter("fallbacks") == 4
+        assert report.to_dict()["itemsPerSecond"] > 0
+
+    def test_ai_pairs_run_in_parallel_with_fallback(self, catalogue_csv, fake_genai):
+        def respond(call):
+            if "GPU: 5090" in call["contents"]:
+                return "not json"
+            return json.dumps({"tiktok": "t", "instagram": "i", "facebook": "f"})
+
+        fake_genai.responder = respond
+        out = io.StringIO()
+        report = distribute_catalog(out, catalogue_csv, audiences=["x"], api_key="k", max_workers=2)
+        bodies = {
+            r["title"]: r["body"] for r in map(json.loads, out.getvalue().splitlines())
+        }
+        assert bodies["TikTok post — 5070"] == "t"
+        assert "HelloComp" in bodies["TikTok post — 5090"]
+        assert report.pairs == 2
+        assert report.metrics.counter("fallbacks") == 1
+        assert report.metrics.counter("api_errors") == 1
+
+    def test_cli_writes_jsonl_and_reports(self, catalogue_csv, tmp_path, capsys):
+        target = tmp_path / "social.jsonl"
+        omnichannel_main(
+            ["--from-catalog", "--csv", str(catalogue_csv), "--audience", "x", "-o", str(target)]
+        )
+        lines = target.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 6
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "2 dvojic, 6 položek" in captured.err
+
+    def test_cli_requires_pair_or_catalog(self):
+        with pytest.raises(SystemExit):
+            omnichannel_main([])
+
+    def test_workers_must_be_positive(self, catalogue_csv, capsys):
+        with pytest.raises(SystemExit):
+            omnichannel_main(["--from-catalog", "--csv", str(catalogue_csv), "--workers", "0"])
+        assert "--workers" in capsys.readouterr().err
+        with pytest.raises(ValueError, match="max_workers"):
+            distribute_catalog(io.StringIO(), catalogue_csv, max_workers=0)
@@ -0,0 +1,157 @@
+"""Tests for content_automation.rate_limit (virtual clock — no real waiting)."""
+
+import random
+import types
+
+import pytest
+
+from content_automation import gemini
+from content_automation import metrics as m
+from content_automation.hookmaster import generate
+from content_automation.rate_limit import (
+    AdaptiveConcurrency,
+    ModelLimits,
+    RateLimiter,
+    TokenBucket,
+    error_status,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class QuotaError(Exception):
+    def __init__(self, code: int):
+        super().__init__(f"{code} RESOURCE_EXHAUSTED")
+        self.code = code
+
+
+def _limiter(clock: FakeClock, **kwargs) -> RateLimiter:
+    return RateLimiter(
+        limits={"m": ModelLimits(rpm=60, tpm=6000)},
+        clock=clock,
+        sleep=clock.sleep,
+        rng=random.Random(0),
+        **kwargs,
+    )
+
+
+class TestTokenBucket:
+    def test_waits_for_refill(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock=clock, sleep=clock.sleep)  # 1 token / s
+        for _ in range(60):
+            assert bucket.acquire() == 0
+        assert bucket.acquire() == pytest.approx(1.0)
+        assert clock.now == pytest.approx(1.0)
+
+    def test_charge_creates_debt(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock=clock, sleep=clock.sleep)
+        bucket.charge(90)  # 30 tokens over budget
+        assert bucket.acquire(1) == pytest.approx(31.0)
+
+
+class TestAdaptiveConcurrency:
+    def test_additive_increase_multiplicative_decrease(self):
+        clock = FakeClock()
+        aimd = AdaptiveConcurrency(initial=4, maximum=16, clock=clock)
+        for _ in range(5):  # ~one window of successes
+            aimd.on_success()
+        assert aimd.limit == 5
+        aimd.on_throttle()
+        assert aimd.limit == 2
+        aimd.on_throttle()  # same burst — within cooldown
+        assert aimd.limit == 2
+        clock.now += 5
+        aimd.on_throttle()
+        assert aimd.limit == 1
+
+
+class TestRetries:
+    def test_retries_throttled_calls_with_jittered_backoff(self):
+        clock = FakeClock()
+        limiter = _limiter(clock, max_retries=3)
+        outcomes = [QuotaError(429), QuotaError(503), "ok"]
+
+        def call():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        retried = []
+        assert limiter.call("m", call, 10, on_retry=lambda e, s: retried.append(s)) == "ok"
+        assert retried == [429, 503]
+        assert 0 <= clock.sleeps[0] <= 1.0 and 0 <= clock.sleeps[1] <= 2.0
+        assert limiter.for_model("m").concurrency.limit == 4  # halved from 8 by the 429
+
+    def test_gives_up_after_max_retries(self):
+        clock = FakeClock()
+        limiter = _limiter(clock, max_retries=2)
+        calls = []
+
+        def call():
+            calls.append(1)
+            raise QuotaError(429)
+
+        with pytest.raises(QuotaError):
+            limiter.call("m", call, 10)
+        assert len(calls) == 3
+
+    def test_non_retryable_error_raises_immediately(self):
+        limiter = _limiter(FakeClock())
+        calls = []
+
+        def call():
+            calls.append(1)
+            raise ValueError("bad request")
+
+        with pytest.raises(ValueError):
+            limiter.call("m", call, 10)
+        assert len(calls) == 1
+
+    def test_usage_metadata_corrects_tpm(self):
+        clock = FakeClock()
+        limiter = _limiter(clock)
+        response = types.SimpleNamespace(usage_metadata=types.SimpleNamespace(total_token_count=600))
+        limiter.call("m", lambda: response, 100)
+        assert limiter.for_model("m").tokens.available == pytest.approx(5400)
+
+    def test_error_status(self):
+        assert error_status(QuotaError(429)) == 429
+        assert error_status(RuntimeError("429 RESOURCE_EXHAUSTED quota")) == 429
+        assert error_status(RuntimeError("boom")) is None
+
+
+class TestGeminiIntegration:
+    def test_throttled_call_is_retried_not_templated(self, fake_genai):
+        clock = FakeClock()
+        gemini.set_rate_limiter(_limiter(clock))
+        attempts = []
+
+        def respond(call):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise QuotaError(429)
+            return '{"hooks": ["a", "b", "c"], "script": "s", "seo_description": "d"}'
+
+        fake_genai.responder = respond
+        try:
+            result = generate("RTX 5080", "hráč Warzone", api_key="k")
+        finally:
+            gemini.set_rate_limiter(None)
+        assert result.hooks == ["a", "b", "c"]
+        assert result.metrics.counter(m.RETRIES) == 1
+        assert result.metrics.counter(m.THROTTLED) == 1
+        assert result.metrics.counter(m.FALLBACKS) == 0
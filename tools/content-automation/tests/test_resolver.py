@@ -0,0 +1,116 @@
+"""Tests for content_automation.resolver."""
+
+import time
+
+from content_automation import resolver as resolver_module
+from content_automation.catalog import ProductCatalog
+from content_automation.models import Product
+from content_automation.resolver import ProductResolver, fold, tokens
+
+
+def _make_products() -> list[Product]:
+    return [
+        Product(code="PC-5080", name="HelloComp AMD GAMER Extreme RTX 5080 White"),
+        Product(code="PC-5090", name="HelloComp Intel GAMER Ultra RTX 5090"),
+        Product(code="PC-5080B", name="HelloComp AMD GAMER Extreme RTX 5080"),
+        Product(code="VOUCHER", name="Dárkový poukaz 1000 Kč"),
+        Product(code="MON-27", name="Monitor 27", xml_feed_name="Koorui GN06 27\" 165Hz"),
+    ]
+
+
+class TestTokens:
+    def test_fold_strips_diacritics(self):
+        assert fold("Dárkový poukaz Kč") == "darkovy poukaz kc"
+
+    def test_tokens_are_unique_and_ordered(self):
+        assert tokens('RTX 5070 Ti, "rtx" 5070') == ["rtx", "5070", "ti"]
+        assert tokens(None) == []
+
+
+class TestResolver:
+    def setup_method(self):
+        self.resolver = ProductResolver(_make_products())
+
+    def test_exact_code_case_insensitive(self):
+        assert self.resolver.by_code(" pc-5090 ").name.endswith("5090")
+        assert self.resolver.resolve("voucher").code == "VOUCHER"
+
+    def test_token_search_prefers_closest_name(self):
+        # Both 5080 PCs match every token; the one without "White" is closer.
+        assert self.resolver.resolve("amd extreme 5080").code == "PC-5080B"
+
+    def test_diacritic_folded_search(self):
+        assert self.resolver.resolve("darkovy poukaz").code == "VOUCHER"
+        assert self.resolver.resolve("DÁRKOVÝ").code == "VOUCHER"
+
+    def test_fuzzy_match_on_typo(self):
+        score, product = self.resolver.search("extrme 5080")[0]
+        assert product.code == "PC-5080B"
+        assert 0.6 < score < 1.0
+
+    def test_numbers_are_never_fuzzy(self):
+        assert all(p.code != "PC-5090" for _, p in self.resolver.search("5080"))
+        assert self.resolver.resolve("5070") is None
+
+    def test_matches_xml_feed_name(self):
+        assert self.resolver.resolve("koorui 165hz").code == "MON-27"
+
+    def test_partial_match_scores_below_one(self):
+        results = self.resolver.search("intel 5080")
+        assert results and all(score < 1.0 for score, _ in results)
+
+    def test_unknown_query(self):
+        assert self.resolver.search("") == []
+        assert self.resolver.resolve("zzzz qqqq") is None
+
+    def test_catalog_caches_resolver(self):
+        catalog = ProductCatalog(_make_products())
+        assert catalog.resolver() is catalog.resolver()
+        assert len(catalog.resolver()) == 5
+
+    def test_lookup_is_fast_on_large_catalogue(self):
+        tiers = ["SE", "Pro", "Max", "Extreme", "Ultra"]
+        gpus = ["4060", "5060", "5070", "5070 Ti", "5080", "5090"]
+        products = [
+            Product(
+                code=f"{i:06d}",
+                name=f"HelloComp {'AMD' if i % 2 else 'Intel'} GAMER "
+                f"{tiers[i % 5]} RTX {gpus[i % 6]} #{i % 97}",
+            )
+            for i in range(12_000)
+        ]
+        resolver = ProductResolver(products)
+        queries = ["000123", "intel gamer pro 5070 ti", "extrme 5080", "hellocomp amd"]
+        start = time.perf_counter()
+        for _ in range(50):
+            for query in queries:
+                assert resolver.search(query)
+        per_lookup = (time.perf_counter() - start) / (50 * len(queries))
+        assert per_lookup < 0.005  # generous bound for slow CI; typically well under 1 ms
+
+    def test_long_queries_stay_bounded(self):
+        products = [
+            Product(code=f"{i:05d}", name=f"HelloComp GAMER word{i % 40} part{i % 31} extra{i % 17}")
+            for i in range(5_000)
+        ]
+        resolver = ProductResolver(products)
+        # Every word matches a different product: 20 terms with several
+        # options each used to mean millions of sorted combinations.
+        query = " ".join(f"wordd{i} partt{i}" for i in range(10))
+        start = time.perf_counter()
+        assert resolver.search(query)
+        assert time.perf_counter() - start < 0.5
+
+    def test_direct_scoring_matches_combination_walk(self, monkeypatch):
+        products = _make_products() + [
+            Product(code=f"X{i}", name=f"HelloComp AMD GAMER Pro RTX 50{60 + i % 4}0 set{i}")
+            for i in range(30)
+        ]
+        resolver = ProductResolver(products)
+        queries = ["amd extreme 5080 white", "helocomp gamr pro 5070 set3", "intel ultra 5090 koorui"]
+        expected = {q: resolver.search(q, limit=8) for q in queries}
+        # With no combination budget everything is scored from the postings.
+        monkeypatch.setattr(resolver_module, "_MAX_COMBOS", 0)
+        for query in queries:
+            assert [s for s, _ in resolver.search(query, limit=8)] == [s for s, _ in expected[query]]
+            assert resolver.search(query, limit=1) == expected[query][:1]
@@ -0,0 +1,74 @@
+"""Tests for content_automation.response_cache."""
+
+import multiprocessing
+import time
+
+from content_automation.response_cache import ResponseCache, cache_key
+
+
+def _hammer(path: str, worker: int) -> None:
+    cache = ResponseCache(path)
+    for i in range(50):
+        cache.put(f"w{worker}-{i}", "x" * 100)
+        cache.get(f"w{(worker + 1) % 4}-{i}")
+
+
+class TestCacheKey:
+    def test_stable_and_sensitive(self):
+        base = cache_key("m", "sys", "prompt", {"temperature": 0.8})
+        assert base == cache_key("m", "sys", "prompt", {"temperature": 0.8})
+        assert base != cache_key("m2", "sys", "prompt", {"temperature": 0.8})
+        assert base != cache_key("m", None, "prompt", {"temperature": 0.8})
+        assert base != cache_key("m", "sys", "prompt!", {"temperature": 0.8})
+        assert base != cache_key("m", "sys", "prompt", {"temperature": 0.2})
+
+
+class TestResponseCache:
+    def test_get_put(self, tmp_path):
+        cache = ResponseCache(tmp_path / "c.sqlite3")
+        assert cache.get("k") is None
+        cache.put("k", "value")
+        assert cache.get("k") == "value"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_ttl_expiry(self, tmp_path):
+        cache = ResponseCache(tmp_path / "c.sqlite3", ttl_seconds=0.05)
+        cache.put("k", "value")
+        time.sleep(0.1)
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self, tmp_path):
+        cache = ResponseCache(tmp_path / "c.sqlite3", max_entries=2)
+        cache.put("a", "1")
+        time.sleep(0.01)
+        cache.put("b", "2")
+        time.sleep(0.01)
+        cache.get("a")  # "b" is now least recently used
+        time.sleep(0.01)
+        cache.put("c", "3")
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get("c") == "3"
+
+    def test_counters_persist_across_instances(self, tmp_path):
+        path = tmp_path / "c.sqlite3"
+        ResponseCache(path).put("k", "v")
+        ResponseCache(path).get("k")
+        stats = ResponseCache(path).stats()
+        assert stats["totalHits"] == 1
+        assert stats["hits"] == 0
+
+    def test_concurrent_processes(self, tmp_path):
+        path = str(tmp_path / "c.sqlite3")
+        ResponseCache(path)
+        ctx = multiprocessing.get_context("spawn")
+        procs = [ctx.Process(target=_hammer, args=(path, w)) for w in range(4)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join(timeout=60)
+        assert all(proc.exitcode == 0 for proc in procs)
+        assert len(ResponseCache(path)) == 200
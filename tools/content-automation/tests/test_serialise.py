@@ -0,0 +1,39 @@
+"""Tests for content_automation.serialise."""
+
+import json
+
+import pytest
+
+from content_automation import serialise
+
+DATA = {
+    "title": "Hook — RTX 5080 🔥",
+    "body": 'řádek 1\nřádek "2"',
+    "items": [1, 2.5, True, None, {"nested": []}, {}],
+    "status": "draft",
+}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(serialise, "_orjson", None)
+    elif serialise._orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+class TestDumps:
+    def test_backend_name(self, encoder):
+        assert serialise.backend() == encoder
+
+    def test_indented_layout_matches_stdlib(self, encoder):
+        assert serialise.dumps(DATA) == json.dumps(DATA, ensure_ascii=False, indent=2)
+
+    def test_compact_layout(self, encoder):
+        text = serialise.dumps(DATA, indent=None)
+        assert text == json.dumps(DATA, ensure_ascii=False, separators=(",", ":"))
+        assert json.loads(text) == DATA
+
+    def test_big_integers_fall_back_to_stdlib(self, encoder):
+        assert serialise.dumps({"n": 2**70}, indent=None) == '{"n":%d}' % 2**70
@@ -0,0 +1,171 @@
+"""Tests for content_automation.server (localhost only, no Gemini access)."""
+
+import csv
+import json
+import os
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from content_automation import server
+from content_automation.cli import hookmaster_main, lootbox_main
+from content_automation.lootbox_seo import generate_full_seo_content
+
+
+@pytest.fixture
+def catalogue_csv(tmp_path):
+    path = tmp_path / "products.csv"
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh, delimiter=";")
+        writer.writerow(["code", "pairCode", "name", "xmlFeedName", ""])
+        writer.writerow(["A", "", "HelloComp AMD GAMER Pro 5070", ""])
+        writer.writerow(["B", "", "HelloComp AMD GAMER Extreme 5070 Ti", ""])
+        writer.writerow(["C", "", "HelloComp Intel GAMER SE8 3050", ""])
+        writer.writerow(["D", "", "Motospeed SK62", ""])
+    return path
+
+
+@pytest.fixture
+def running_server(monkeypatch, catalogue_csv):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    srv = server.ContentServer(("127.0.0.1", 0), csv_path=catalogue_csv)
+    srv.warm_up()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{srv.server_address[1]}"
+    yield srv, url
+    srv.shutdown()
+    srv.server_close()
+
+
+def _post(url: str, payload: dict):
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return json.loads(response.read())
+
+
+class TestServer:
+    def test_health(self, running_server):
+        _, url = running_server
+        with urllib.request.urlopen(f"{url}/health", timeout=10) as response:
+            data = json.loads(response.read())
+        assert data == {"status": "ok", "catalogProducts": 3, "ai": False}
+
+    def test_health_reports_missing_catalogue(self, running_server, catalogue_csv):
+        _, url = running_server
+        catalogue_csv.unlink()
+        with pytest.raises(urllib.error.HTTPError) as info:
+            urllib.request.urlopen(f"{url}/health", timeout=10)
+        assert info.value.code == 503
+        data = json.loads(info.value.read())
+        assert data["status"] == "error"
+        assert "FileNotFoundError" in data["error"]
+
+    def test_hookmaster_matches_cli_json(self, running_server):
+        _, url = running_server
+        items = _post(f"{url}/hookmaster", {"gpu": "RTX 5080", "audience": "hráč Warzone"})
+        assert len(items) == 5
+        assert items[0]["type"] == "tiktok-hook"
+
+    def test_lootbox_matches_in_process(self, running_server, catalogue_csv):
+        _, url = running_server
+        data = _post(f"{url}/lootbox-seo", {"gpu": "5070"})
+        expected = generate_full_seo_content(gpu_filter="5070", csv_path=catalogue_csv)
+        for key in ("table_md", "table_html", "paragraph", "tldr"):
+            assert data[key] == expected[key]
+
+    def test_trending_resolves_product(self, running_server):
+        _, url = running_server
+        payload = {"platforms": ["tiktok"], "numTopics": 1, "product": "motospeed"}
+        data = _post(f"{url}/trending-socials", payload)
+        assert data["productContext"] == "Motospeed SK62"
+        with pytest.raises(urllib.error.HTTPError) as info:
+            _post(f"{url}/trending-socials", {**payload, "product": "zzzz"})
+        assert info.value.code == 400
+
+    def test_bad_request(self, running_server):
+        _, url = running_server
+        with pytest.raises(urllib.error.HTTPError) as info:
+            _post(f"{url}/omnichannel", {"gpu": "RTX 5080"})
+        assert info.value.code == 400
+
+    def test_concurrent_requests(self, running_server):
+        srv, url = running_server
+        payload = {"gpu": "RTX 5080", "audience": "hráč CS2"}
+        threads = [
+            threading.Thread(target=_post, args=(f"{url}/omnichannel", payload))
+            for _ in range(16)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert srv.metrics.counter("fallbacks") == 16
+
+
+class TestCatalogCache:
+    def test_rebuilds_when_csv_changes(self, catalogue_csv):
+        srv = server.ContentServer(("127.0.0.1", 0), csv_path=catalogue_csv)
+        try:
+            first = srv.catalog(None)
+            assert srv.catalog(str(catalogue_csv)) is first
+            with open(catalogue_csv, "a", newline="", encoding="utf-8") as fh:
+                csv.writer(fh, delimiter=";").writerow(
+                    ["E", "", "HelloComp AMD GAMER Ultra 5090", ""]
+                )
+            stat = catalogue_csv.stat()
+            os.utime(catalogue_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            rebuilt = srv.catalog(None)
+            assert rebuilt is not first
+            assert [p.code for p in rebuilt.filter(gpu="5090")] == ["E"]
+        finally:
+            srv.server_close()
+
+    def test_cache_is_bounded(self, monkeypatch, tmp_path, catalogue_csv):
+        monkeypatch.setattr(server, "MAX_CATALOGS", 2)
+        srv = server.ContentServer(("127.0.0.1", 0), csv_path=catalogue_csv)
+        try:
+            paths = []
+            for i in range(4):
+                path = tmp_path / f"copy{i}.csv"
+                path.write_bytes(catalogue_csv.read_bytes())
+                paths.append(str(path))
+                srv.catalog(str(path))
+            assert [key[0] for key in srv._catalogs] == paths[-2:]
+        finally:
+            srv.server_close()
+
+
+class TestForwarding:
+    def test_cli_forwards_to_running_server(self, running_server, monkeypatch, capsys):
+        srv, url = running_server
+        monkeypatch.setenv(server.SERVER_ENV, url)
+        hookmaster_main(["RTX 5080", "hráč Warzone", "--json"])
+        assert len(json.loads(capsys.readouterr().out)) == 5
+        assert srv.metrics.counter("fallbacks") == 1
+
+    def test_lootbox_cli_forwards(self, running_server, monkeypatch, capsys, catalogue_csv):
+        srv, url = running_server
+        monkeypatch.setenv(server.SERVER_ENV, url)
+        lootbox_main(["--gpu", "5070", "--format", "json", "--csv", str(catalogue_csv)])
+        assert "5070" in json.loads(capsys.readouterr().out)["table_md"]
+        assert srv.metrics.span_count("render") == 1
+
+    def test_compact_forwarded_output(self, running_server, monkeypatch, capsys):
+        _, url = running_server
+        monkeypatch.setenv(server.SERVER_ENV, url)
+        hookmaster_main(["RTX 5080", "hráč Warzone", "--json", "--compact"])
+        out = capsys.readouterr().out.strip()
+        assert "\n" not in out and '", "' not in out
+        assert len(json.loads(out)) == 5
+
+    def test_falls_back_when_server_is_down(self, monkeypatch, capsys):
+        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+        monkeypatch.setenv(server.SERVER_ENV, "http://127.0.0.1:9")
+        assert server.forward("hookmaster", {"gpu": "x", "audience": "y"}) is None
+        hookmaster_main(["RTX 5080", "hráč Warzone", "--json"])
+        assert len(json.loads(capsys.readouterr().out)) == 5
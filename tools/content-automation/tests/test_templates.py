@@ -0,0 +1,96 @@
+"""Tests for content_automation.templates."""
+
+import pytest
+
+from content_automation import hookmaster, omnichannel, templates
+from content_automation.templates import TemplateGroup, TemplateRegistry
+
+ROWS = [
+    ("RTX 5070 Ti", "hráč Warzone", "GTA 6"),
+    ("RX 9070-XT", "{streamer}", "Battlefield 6 Beta"),
+    ("", "", ""),
+]
+
+
+def _format(source: str, gpu: str, audience: str, topic: str) -> str:
+    return source.format(
+        gpu=gpu,
+        audience=audience,
+        topic=topic,
+        gpu_tag=templates.gpu_tag(gpu),
+        topic_slug=templates.topic_slug(topic),
+    )
+
+
+class TestTemplateGroup:
+    def test_matches_str_format(self):
+        sources = {
+            "plain": "HelloComp s {gpu} pro {audience}",
+            "braces": "{{literal}} {gpu!r:>12} #{gpu_tag} #{topic_slug}\n'\"\\",
+            "empty": "",
+        }
+        group = TemplateGroup("test", sources)
+        for row in ROWS:
+            expected = {key: _format(src, *row) for key, src in sources.items()}
+            assert group.render(*row) == expected
+            assert group.render_one("braces", *row) == expected["braces"]
+        assert group.render_batch(ROWS) == [
+            {key: _format(src, *row) for key, src in sources.items()} for row in ROWS
+        ]
+
+    def test_batch_accepts_iterators_and_empty_input(self):
+        group = TemplateGroup("test", {"a": "{gpu}"})
+        assert group.render_batch(iter(ROWS[:2])) == [{"a": "RTX 5070 Ti"}, {"a": "RX 9070-XT"}]
+        assert group.render_batch([]) == []
+
+    @pytest.mark.parametrize("source", ["{price}", "{}", "{0}", "{gpu.name}", "{gpu:{audience}}"])
+    def test_rejects_unsupported_fields(self, source):
+        with pytest.raises(ValueError):
+            TemplateGroup("bad", {"t": source})
+
+
+class TestRegistry:
+    def test_duplicate_group_is_rejected(self):
+        registry = TemplateRegistry()
+        registry.register("a", {"t": "{gpu}"})
+        with pytest.raises(ValueError, match="already registered"):
+            registry.register("a", {"t": "{gpu}"})
+
+    def test_render_batch_combines_groups(self):
+        registry = TemplateRegistry()
+        registry.register("a", {"x": "{gpu}"})
+        registry.register("b", {"y": "{topic_slug}"})
+        assert registry.render_batch(ROWS[:1]) == [{"a.x": "RTX 5070 Ti", "b.y": "gta_6"}]
+        assert registry.render_batch(ROWS[:1], groups=["b"]) == [{"b.y": "gta_6"}]
+        # Registering a group recompiles the combined renderer.
+        registry.register("c", {"z": "{audience}"})
+        assert registry.render_batch(ROWS[:1])[0]["c.z"] == "hráč Warzone"
+
+    def test_builtin_covers_every_generator(self):
+        registry = templates.builtin()
+        assert {"hookmaster", "hookmaster.ab", "omnichannel", "trending_socials"} <= set(
+            registry.names()
+        )
+        rendered = registry.render_batch(ROWS)
+        assert len(rendered) == len(ROWS)
+        assert rendered[0]["omnichannel.tiktok"].endswith("#RTX5070Ti #hernipc")
+        assert "#gta_6" in rendered[0]["trending_socials.tiktok"]
+
+
+class TestOfflineBatches:
+    def test_hookmaster_matches_single_generation(self):
+        pairs = [(gpu, audience) for gpu, audience, _ in ROWS]
+        results = hookmaster.generate_offline(pairs)
+        for (gpu, audience), result in zip(pairs, results):
+            expected = hookmaster._generate_from_templates(gpu, audience)
+            assert result == expected
+            assert result.hooks == [
+                t.format(gpu=gpu, audience=audience) for t in hookmaster._HOOK_TEMPLATES
+            ]
+            assert result.ab_variants[0]["style"] == "aggressive-myth-bust"
+
+    def test_omnichannel_matches_str_format(self):
+        pairs = [(gpu, audience) for gpu, audience, _ in ROWS]
+        for (gpu, audience), result in zip(pairs, omnichannel.distribute_offline(pairs)):
+            assert result.instagram == _format(omnichannel._INSTAGRAM_TEMPLATE, gpu, audience, "")
+            assert result == omnichannel._generate_from_templates(gpu, audience)
@@ -0,0 +1,213 @@
+"""Tests for content_automation.trending_socials (no network access)."""
+
+import json
+import threading
+import time
+
+import pytest
+
+from content_automation import serialise
+from content_automation.cli import trending_socials_main
+from content_automation.models import Product
+from content_automation.trending_socials import (
+    PARTIAL_RETRIES,
+    ContentTone,
+    SocialPlatform,
+    TrendingSocialsGenerator,
+    generate_trending_posts,
+    validate_batch_response,
+)
+
+
+def _fake_gemini(delay: float = 0.0, fail_for: str = ""):
+    """Build a stand-in for ``_call_gemini`` that echoes the prompt's platform."""
+    lock = threading.Lock()
+    state = {"in_flight": 0, "peak": 0}
+
+    def call(prompt: str, metrics=None):
+        with lock:
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+        try:
+            time.sleep(delay)
+            if fail_for and f"for {fail_for}." in prompt:
+                return None
+            platform = prompt.split("variants for ")[1].split(".")[0]
+            return {"variants": [{"body": f"AI {platform}", "hashtags": [], "emojis": []}]}
+        finally:
+            with lock:
+                state["in_flight"] -= 1
+
+    return call, state
+
+
+class TestTemplateMode:
+    def test_generates_without_api_key(self, monkeypatch):
+        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+        result = generate_trending_posts(platforms=["tiktok", "twitter"], num_topics=2)
+        # 2 topics × 2 platforms × 2 tones
+        assert len(result.posts) == 8
+        assert all("RTX 5090" in (p.gpu_mention or "") for p in result.posts)
+
+
+    def test_product_feeds_generator(self, monkeypatch):
+        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+        product = Product(code="PC-1", name="HelloComp AMD GAMER Pro RTX 5070 Ti")
+        result = generate_trending_posts(platforms=["tiktok"], num_topics=1, product=product)
+        assert result.product_context is product
+        assert all(p.gpu_mention == "RTX 5070 Ti" for p in result.posts)
+        assert json.loads(result.to_json())["productContext"] == product.name
+
+    def test_streamed_json_matches_dumps(self, monkeypatch):
+        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+        result = generate_trending_posts(platforms=["tiktok", "twitter"], num_topics=2)
+        for indent in (None, 2):
+            data = json.loads(result.to_json(indent))
+            assert list(data) == [
+                "posts", "trendingTopics", "productContext", "modelUsed", "generationTimeMs"
+            ]
+            assert result.to_json(indent) == serialise.dumps(data, indent=indent)
+        items = result.to_content_items()
+        assert len({item.created_at for item in items}) == 1
+
+
+class TestConcurrentFanOut:
+    def test_order_matches_serial(self, monkeypatch):
+        platforms = [SocialPlatform.TIKTOK, SocialPlatform.TWITTER, SocialPlatform.LINKEDIN]
+
+        serial = TrendingSocialsGenerator(api_key="test", max_concurrency=1)
+        call, _ = _fake_gemini()
+        monkeypatch.setattr(serial, "_call_gemini", call)
+        expected = serial.generate_all_trending(platforms=platforms, num_topics=3)
+
+        parallel = TrendingSocialsGenerator(api_key="test", max_concurrency=8)
+        call, _ = _fake_gemini(delay=0.01)
+        monkeypatch.setattr(parallel, "_call_gemini", call)
+        actual = parallel.generate_all_trending(platforms=platforms, num_topics=3)
+
+        key = lambda p: (p.platform, p.tone, p.trending_topic, p.body)  # noqa: E731
+        assert [key(p) for p in actual.posts] == [key(p) for p in expected.posts]
+
+    def test_respects_concurrency_limit(self, monkeypatch):
+        gen = TrendingSocialsGenerator(api_key="test", max_concurrency=3)
+        call, state = _fake_gemini(delay=0.02)
+        monkeypatch.setattr(gen, "_call_gemini", call)
+        result = gen.generate_all_trending(num_topics=2)
+        assert len(result.posts) == 2 * len(SocialPlatform) * 2
+        assert 1 < state["peak"] <= 3
+
+    def test_per_call_fallback(self, monkeypatch):
+        gen = TrendingSocialsGenerator(api_key="test", max_concurrency=4)
+        call, _ = _fake_gemini(fail_for="twitter")
+        monkeypatch.setattr(gen, "_call_gemini", call)
+        result = gen.generate_for_topic(
+            platforms=[SocialPlatform.TIKTOK, SocialPlatform.TWITTER],
+            tones=[ContentTone.CASUAL],
+        )
+        assert result.posts[0].body == "AI tiktok"
+        assert result.posts[1].platform == SocialPlatform.TWITTER
+        assert "HelloComp" in result.posts[1].body
+
+
+class TestBatchedMode:
+    PLATFORMS = [SocialPlatform.TIKTOK, SocialPlatform.TWITTER]
+
+    @staticmethod
+    def _respond(skip=()):
+        def respond(call):
+            prompt = call["contents"]
+            pairs = prompt.split("PAIRS: ")[1].split("\n")[0].split(", ")
+            posts = [
+                {
+                    "platform": pair.split("/")[0],
+                    "tone": pair.split("/")[1],
+                    "variants": [{"body": f"AI {pair}", "hashtags": ["#x", 3], "emojis": "🔥"}],
+                }
+                for pair in pairs
+                if pair not in skip
+            ]
+            return json.dumps({"posts": posts})
+
+        return respond
+
+    def test_one_request_per_topic(self, fake_genai):
+        fake_genai.responder = self._respond()
+        gen = TrendingSocialsGenerator(api_key="k", max_concurrency=4, batched=True)
+        result = gen.generate_all_trending(platforms=self.PLATFORMS, num_topics=2)
+
+        assert len(fake_genai.calls) == 2
+        assert fake_genai.calls[0]["config"].response_schema["required"] == ["posts"]
+        assert len(result.posts) == 2 * 2 * 2
+        first = result.posts[0]
+        assert first.body == f"AI tiktok/{first.tone.value}"
+        assert first.hashtags == ["#x"] and first.emojis == []
+        assert [(p.trending_topic, p.platform, p.tone) for p in result.posts] == [
+            (t.keyword, pl, tone)
+            for t in result.trending_topics
+            for pl in self.PLATFORMS
+            for tone in (ContentTone.CASUAL, ContentTone.VIRAL)
+        ]
+
+    def test_retries_only_missing_pairs(self, fake_genai):
+        responses = [self._respond(skip={"twitter/casual"}), self._respond()]
+        fake_genai.responder = lambda call: responses.pop(0)(call)
+        gen = TrendingSocialsGenerator(api_key="k", batched=True)
+        result = gen.generate_for_topic(
+            platforms=self.PLATFORMS, tones=[ContentTone.CASUAL, ContentTone.VIRAL]
+        )
+
+        assert len(fake_genai.calls) == 2
+        assert "PAIRS: twitter/casual\n" in fake_genai.calls[1]["contents"]
+        assert all(p.body.startswith("AI ") for p in result.posts)
+        assert result.metrics.counter(PARTIAL_RETRIES) == 1
+
+    def test_still_missing_pairs_fall_back_to_templates(self, fake_genai):
+        fake_genai.responder = self._respond(skip={"twitter/casual"})
+        gen = TrendingSocialsGenerator(api_key="k", batched=True)
+        result = gen.generate_for_topic(platforms=self.PLATFORMS, tones=[ContentTone.CASUAL])
+
+        assert len(fake_genai.calls) == 2
+        assert result.posts[0].body == "AI tiktok/casual"
+        assert "HelloComp" in result.posts[1].body
+        assert result.metrics.counter("fallbacks") == 1
+
+    def test_validate_drops_unrequested_and_empty(self):
+        data = {
+            "posts": [
+                {"platform": "tiktok", "tone": "casual", "variants": [{"body": ""}, {"body": "x" * 500}]},
+                {"platform": "linkedin", "tone": "casual", "variants": [{"body": "nope"}]},
+            ]
+        }
+        found = validate_batch_response(data, [(SocialPlatform.TIKTOK, ContentTone.CASUAL)])
+        assert list(found) == [(SocialPlatform.TIKTOK, ContentTone.CASUAL)]
+        assert len(found[(SocialPlatform.TIKTOK, ContentTone.CASUAL)][0]["body"]) == 150
+
+
+class TestProductFlag:
+    def _csv(self, tmp_path):
+        path = tmp_path / "products.csv"
+        path.write_text(
+            "code;pairCode;name;xmlFeedName;\n"
+            "PC-1;;HelloComp AMD GAMER Extreme RTX 5080;;\n"
+            "PC-2;;Dárkový poukaz 1000 Kč;;\n",
+            encoding="utf-8",
+        )
+        return path
+
+    def test_resolves_fuzzy_product(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+        csv_path = self._csv(tmp_path)
+        trending_socials_main([
+            "--platforms", "tiktok", "--num-topics", "1", "--json",
+            "--product", "extrme 5080", "--csv", str(csv_path),
+        ])
+        data = json.loads(capsys.readouterr().out)
+        assert data["productContext"] == "HelloComp AMD GAMER Extreme RTX 5080"
+        assert "RTX 5080" in data["posts"][0]["body"]
+
+    def test_unknown_product_is_an_error(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+        csv_path = self._csv(tmp_path)
+        with pytest.raises(SystemExit):
+            trending_socials_main(["--product", "zzzz", "--csv", str(csv_path)])
+        assert "zzzz" in capsys.readouterr().err